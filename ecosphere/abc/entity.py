@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod, abstractstaticmethod
 
 from ecosphere.abc.position import Position
-from ecosphere.utils import generate_id
+from ecosphere.utils import generate_id, generate_key
 from ecosphere.world.biome import Biome
 
 
@@ -13,6 +13,7 @@ class Entity(ABC):
 
     def __init__(self, position: Position, representation: str, dynamic: bool):
         self.id = generate_id(self.__class__.__name__)
+        self.key = generate_key()
         self.position = position
         self._representation = representation
         self.dynamic = dynamic
@@ -1,6 +1,7 @@
-import random
 from dataclasses import dataclass
 
+from ecosphere.common.rng import rng
+
 
 @dataclass
 class Position:
@@ -17,9 +18,10 @@ class Position:
     def get_random_position_in_radius(
         cls, position: "Position", radius: int
     ) -> "Position":
+        stream = rng.stream("positions")
         return cls(
-            position.x + random.randint(-radius, radius),
-            position.y + random.randint(-radius, radius),
+            position.x + stream.randint(-radius, radius),
+            position.y + stream.randint(-radius, radius),
         )
 
     def distance_to(self, other: "Position") -> float:
@@ -2,4 +2,6 @@ from .environment_context import EnvironmentContext  # noqa: F401
 from .event_bus import bus  # noqa: F401
 from .onetime_caller import OneTimeCaller  # noqa: F401
 from .property import StatusProperty  # noqa: F401
+from .rng import rng  # noqa: F401
 from .singleton import SingletonMeta  # noqa: F401
+from .trace import TraceEvent, tracer  # noqa: F401
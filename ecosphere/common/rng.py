@@ -0,0 +1,59 @@
+import random
+import zlib
+from typing import Dict, Optional
+
+import numpy as np
+
+from ecosphere.common.singleton import SingletonMeta
+
+
+class RandomStreams(metaclass=SingletonMeta):
+    """
+    Named random number streams of the simulation, all derived from one seed.
+
+    Every subsystem draws from its own stream, so adding draws to one subsystem
+    doesn't shift the numbers another one gets. Scalar draws should use `stream`,
+    a `random.Random`, which is faster for single values; bulk draws should use
+    `generator`, a numpy Generator. Streams are created on first use, so `seed`
+    must be called before the simulation is built to make a run reproducible.
+
+    Attributes:
+        seed: int the streams are derived from, drawn from the OS when not given
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None):
+        """
+        Derive every stream from the given seed again, dropping the existing ones.
+        """
+        self.value = seed if seed is not None else int(np.random.SeedSequence().entropy)
+
+        self._streams: Dict[str, random.Random] = {}
+        self._generators: Dict[str, np.random.Generator] = {}
+
+    def _sequence(self, name: str) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.value, spawn_key=(zlib.crc32(name.encode()),)
+        )
+
+    def stream(self, name: str) -> random.Random:
+        stream = self._streams.get(name)
+        if stream is None:
+            state = self._sequence(name).generate_state(4, dtype=np.uint64)
+            stream = self._streams[name] = random.Random(
+                int.from_bytes(state.tobytes(), "little")
+            )
+        return stream
+
+    def generator(self, name: str) -> np.random.Generator:
+        generator = self._generators.get(name)
+        if generator is None:
+            generator = self._generators[name] = np.random.Generator(
+                np.random.PCG64(self._sequence(name))
+            )
+        return generator
+
+
+rng = RandomStreams()
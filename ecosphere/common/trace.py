@@ -0,0 +1,241 @@
+import atexit
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Set
+
+from ecosphere.common.singleton import SingletonMeta
+
+if TYPE_CHECKING:
+    from ecosphere.abc.entity import Entity
+
+
+class TraceEvent:
+    """
+    Event types recorded by the tracer, with the meaning of their numeric fields.
+    Plain ints rather than an IntEnum, which is several times slower to store.
+    """
+
+    UPDATE = 1  # health, hunger, thirst, energy, mating urge
+    STATE = 2  # state code
+    FOOD_FOUND = 3  # food x, food y, hunger
+    EAT = 4  # nutrition, hunger
+    WATER_FOUND = 5  # water x, water y, thirst
+    DRINK = 6  # thirst
+    WANDER = 7  # target x, target y
+    REPRODUCE = 8  # offspring x, offspring y, mate key
+
+
+EVENT_NAMES = {
+    value: name for name, value in vars(TraceEvent).items() if isinstance(value, int)
+}
+
+# time, event, entity key, x, y and five event specific fields
+RECORD = struct.Struct("<10d")
+
+_pack = RECORD.pack_into
+_unpack_key = struct.Struct("<d").unpack_from
+KEY_OFFSET = 16  # bytes before the entity key in a record
+_clock = time.perf_counter
+
+
+class Tracer(metaclass=SingletonMeta):
+    """
+    Structured tracing of the simulation into a preallocated ring buffer.
+
+    Every event is a fixed size record of numbers, so recording one costs a few
+    stores into an array. Hot paths should check `enabled` before calling `emit`,
+    which keeps tracing free when it is off. Once the buffer is full the oldest
+    records are overwritten. Records left in the buffer are flushed when the
+    process exits or a thread dies of an exception, so a crash doesn't lose them.
+
+    Attributes:
+        capacity: int representing the number of records kept in the buffer
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.enabled = False
+        self.path = "ecosphere-trace.csv"
+
+        self._buffer: Optional[bytearray] = None
+        self._next = 0
+        self._written = 0
+        self._start = 0.0
+
+        self._sampling = False
+        self._species: Optional[Set[str]] = None
+        self._entities: Optional[Set[int]] = None
+        self._every = 1
+
+        # Labels of the entities with records in the buffer, with their record count,
+        # so they go once the last record of their entity is overwritten.
+        self._labels: Dict[int, str] = {}
+        self._records: Dict[int, int] = {}
+        self._hooked = False
+
+    def _install_hooks(self):
+        if self._hooked:
+            return
+        self._hooked = True
+
+        atexit.register(self._flush_left)
+        previous = threading.excepthook
+
+        def excepthook(args):
+            self._flush_left()
+            previous(args)
+
+        threading.excepthook = excepthook
+
+    def _flush_left(self):
+        if self.enabled and len(self):
+            self.flush()
+
+    def enable(
+        self,
+        path: Optional[str] = None,
+        *,
+        capacity: Optional[int] = None,
+        species: Optional[Iterable[str]] = None,
+        entities: Optional[Iterable[int]] = None,
+        every: int = 1,
+    ):
+        """
+        Allocate the buffer and start recording events.
+
+        Attributes:
+            path: file the records are flushed to
+            capacity: number of records kept in the buffer
+            species: only record entities of these class names
+            entities: only record entities with these keys
+            every: only record one in `every` entities (by key)
+        """
+        if path is not None:
+            self.path = path
+        if capacity is not None:
+            self.capacity = capacity
+
+        self._buffer = bytearray(RECORD.size * self.capacity)
+        self._next = 0
+        self._written = 0
+        self._start = time.perf_counter()
+        self._labels = {}
+        self._records = {}
+
+        self._species = set(species) if species else None
+        self._entities = set(entities) if entities else None
+        self._every = max(1, every)
+        self._sampling = bool(self._species or self._entities or self._every > 1)
+
+        self.enabled = True
+        self._install_hooks()
+
+    def disable(self):
+        self.enabled = False
+
+    def emit(
+        self,
+        event: int,
+        entity: "Entity",
+        a: float = 0.0,
+        b: float = 0.0,
+        c: float = 0.0,
+        d: float = 0.0,
+        e: float = 0.0,
+    ):
+        """
+        Record an event of the given entity, unless the entity is not sampled.
+        """
+        if self._sampling and not self.is_sampled(entity):
+            return
+
+        index = self._next
+        if self._written >= self.capacity:
+            self._forget(
+                int(_unpack_key(self._buffer, index * RECORD.size + KEY_OFFSET)[0])
+            )
+
+        key = entity.key
+        records = self._records.get(key)
+        if records is None:
+            self._labels[key] = entity.id
+            self._records[key] = 1
+        else:
+            self._records[key] = records + 1
+
+        position = entity.position
+        _pack(
+            self._buffer,
+            index * RECORD.size,
+            _clock() - self._start,
+            event,
+            key,
+            position.x,
+            position.y,
+            a,
+            b,
+            c,
+            d,
+            e,
+        )
+
+        index += 1
+        self._next = 0 if index == self.capacity else index
+        self._written += 1
+
+    def _forget(self, key: int):
+        """
+        Account for an overwritten record of the entity, dropping its label with
+        its last record.
+        """
+        records = self._records[key] - 1
+        if records:
+            self._records[key] = records
+        else:
+            del self._records[key]
+            del self._labels[key]
+
+    def is_sampled(self, entity: "Entity") -> bool:
+        if entity.key % self._every:
+            return False
+        if self._species and type(entity).__name__ not in self._species:
+            return False
+        if self._entities and entity.key not in self._entities:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    def flush(self, path: Optional[str] = None) -> int:
+        """
+        Write the recorded events to a CSV file, oldest first, and empty the buffer.
+        Returns the number of records written.
+        """
+        if self._buffer is None:
+            return 0
+
+        count = len(self)
+        first = (self._next - count) % self.capacity
+
+        with open(path or self.path, "w") as file:
+            file.write("time,event,entity,x,y,a,b,c,d,e\n")
+            for n in range(count):
+                offset = ((first + n) % self.capacity) * RECORD.size
+                record = RECORD.unpack_from(self._buffer, offset)
+                key = int(record[2])
+                fields = ",".join(f"{value:g}" for value in record[3:])
+                file.write(
+                    f"{record[0]:.6f},{EVENT_NAMES[int(record[1])]},"
+                    f"{self._labels.get(key, key)},{fields}\n"
+                )
+
+        self._written = 0
+        self._next = 0
+        self._labels = {}
+        self._records = {}
+        return count
+
+
+tracer = Tracer()
@@ -1,9 +1,8 @@
+import os
 from dataclasses import dataclass
 from typing import Literal
 
-from ecosphere.entities.animal import Crab, Fish, Fox
-from ecosphere.entities.food_spawner import Berries, Mushrooms, Seaweeds, Wheats
-from ecosphere.entities.plant import Flower, Tree
+from ecosphere.entities.catalog import SpeciesCatalog
 
 Biome = Literal[
     "WATER",
@@ -25,84 +24,117 @@ class BiomeSpawnRate:
     MOUNTAINS: float = 0.0
 
 
+SPECIES_FILE = os.path.join(os.path.dirname(__file__), "data", "species.json")
+
+# Species, diets, properties and spawn rates, compiled into lookup tables.
+SPECIES = SpeciesCatalog.load(SPECIES_FILE)
+
+
 @dataclass
-class EntityBiomeSpawnRates:
-    entity_name: str
-    spawn_rates: BiomeSpawnRate
-
-
-ENTITY_BIOME_SPAWN_RATES = [
-    EntityBiomeSpawnRates(
-        entity_name="Tree",
-        spawn_rates=BiomeSpawnRate(
-            PLAINS=0.10,
-            FOREST=0.8,
-            DESERT=0.15,
+class VegetationRule:
+    plant_name: str
+    spread_rates: BiomeSpawnRate  # chance per grown neighbour and step to seed a cell
+    death_rates: BiomeSpawnRate  # chance per step to die
+    max_age: int  # steps a plant lives at most
+
+
+VEGETATION_RULES = [
+    VegetationRule(
+        plant_name="Tree",
+        spread_rates=BiomeSpawnRate(
+            PLAINS=0.004,
+            FOREST=0.02,
+            DESERT=0.002,
         ),
-    ),
-    EntityBiomeSpawnRates(
-        entity_name="Flower",
-        spawn_rates=BiomeSpawnRate(
-            PLAINS=0.75,
-            FOREST=0.1,
+        death_rates=BiomeSpawnRate(
+            PLAINS=0.004,
+            FOREST=0.002,
+            DESERT=0.004,
         ),
+        max_age=2000,
     ),
-    EntityBiomeSpawnRates(
-        entity_name="Crab",
-        spawn_rates=BiomeSpawnRate(
-            DESERT=0.4,
+    VegetationRule(
+        plant_name="Flower",
+        spread_rates=BiomeSpawnRate(
+            PLAINS=0.03,
+            FOREST=0.01,
         ),
-    ),
-    EntityBiomeSpawnRates(
-        entity_name="Fox",
-        spawn_rates=BiomeSpawnRate(
-            FOREST=0.6,
-        ),
-    ),
-    EntityBiomeSpawnRates(
-        entity_name="Fish",
-        spawn_rates=BiomeSpawnRate(
-            WATER=0.8,
+        death_rates=BiomeSpawnRate(
+            PLAINS=0.02,
+            FOREST=0.03,
         ),
+        max_age=200,
     ),
 ]
 
+ENTITIES = SPECIES.entities
+SPAWNERS = SPECIES.spawners
+FOOD = SPECIES.food
 
-@dataclass
-class FoodBiomeSpawnRates:
-    food_name: str
-    spawn_rates: BiomeSpawnRate
+MINUTE_LENGTH = 1  # seconds
 
+TICKS_PER_MINUTE = 4  # simulation clock ticks per simulation minute
 
-FOOD_BIOME_SPAWN_RATES = [
-    FoodBiomeSpawnRates(
-        food_name="Berries",
-        spawn_rates=BiomeSpawnRate(PLAINS=0.05, FOREST=0.85),
-    ),
-    FoodBiomeSpawnRates(
-        food_name="Mushrooms",
-        spawn_rates=BiomeSpawnRate(
-            FOREST=0.7,
-        ),
-    ),
-    FoodBiomeSpawnRates(
-        food_name="Seaweeds",
-        spawn_rates=BiomeSpawnRate(
-            WATER=0.85,
-        ),
-    ),
-    FoodBiomeSpawnRates(
-        food_name="Wheats",
-        spawn_rates=BiomeSpawnRate(
-            PLAINS=0.6,
-        ),
-    ),
-]
+FRAME_INTERVAL = 0.1  # seconds between frames
 
+FAST_FRAME_INTERVAL = 0.5  # seconds between frames from FAST_SPEED on
 
-ENTITIES = [Tree, Flower, Crab, Fox, Fish]
-SPAWNERS = [Berries, Mushrooms, Seaweeds, Wheats]
+FAST_SPEED = 10  # speed multiplier from which fewer frames are drawn
 
-MINUTE_LENGTH = 1  # seconds
+REAP_DEAD_AFTER = 10  # minutes between removals of dead animals
+
+MEMORY_BUDGET = 2 << 30  # resident bytes above which the overworld is trimmed
+
+MEMORY_CHECK_EVERY = 10  # minutes between checks of the memory budget
+
+MEMORY_LOW_WATER = 0.9  # share of the memory budget a trim brings the process under
+
+MEMORY_SAMPLE_INTERVAL = 1.0  # least seconds between memory reports shown
+
+FOOD_STALE_AFTER = 240  # minutes food lies before a trim may remove it
+
+STREAM_FPS = 10  # highest frame rate published to stream clients
+
+STREAM_BACKLOG = 1 << 20  # unsent bytes after which a stream client is skipped
+
+SHARED_INTERVAL = 0.1  # least seconds between updates of the shared memory world
+
+PAN_STEP = 8  # cells the viewport moves per arrow key press
+
+CHUNK_SIZE = 64  # cells per side of a biome map chunk
+
+BIOME_MEMORY_BUDGET = 64 << 20  # bytes of biome chunks kept before evicting
+
+VEGETATION_STEP = 10  # simulation minutes between vegetation updates
+
+VEGETATION_MATURE = 3  # steps before a plant is grown and spreads
+
+VEGETATION_CROWDED = 3  # plants around a cell above which nothing sprouts in it
+
+SCENT_DIFFUSION = 0.8  # share of a cell's scent replaced by its neighbours' per tick
+
+SCENT_DECAY = 0.99  # share of the scent left after every tick
+
+SCENT_THRESHOLD = 1e-4  # scent below which animals can't smell a source
+
+LOD_MARGIN = 32  # cells around the viewport simulated in full detail
+
+LOD_FACTOR = 10  # update interval multiplier of animals outside the active region
+
+LOD_AGGREGATE_AFTER = 60  # minutes a region stays inactive before it is aggregated
+
+LOD_BIRTH_RATE = 0.002  # births per animal per minute in aggregated regions
+
+LOD_DEATH_RATE = 0.001  # deaths per animal per minute in aggregated regions
+
+STRESS_SIZES = [  # stressed worlds, from 10**2 to 10**6 animals with the densities
+    (100, 50),
+    (200, 100),
+    (400, 200),
+    (800, 400),
+    (2000, 1000),
+]
+
+STRESS_DENSITIES = [0.02, 0.1, 0.5]  # animals per cell of the stressed worlds
 
-REFRESH_STATIC_AFTER = 1  # iterations = MINUTE_LENGTH * REFRESH_STATIC_AFTER
+STRESS_TICKS = 40  # clock ticks timed at every stress point
@@ -1,14 +1,22 @@
-import logging
 import math
-import random
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Type
+from typing import TYPE_CHECKING, List, Optional, Type
+
+import numpy as np
 
 from ecosphere.abc.entity import Entity
 from ecosphere.abc.position import Position
-from ecosphere.common import EnvironmentContext, StatusProperty, bus
-from ecosphere.entities.food import Berry, Food, Mushroom, Seaweed, Wheat
+from ecosphere.common import (
+    EnvironmentContext,
+    StatusProperty,
+    TraceEvent,
+    bus,
+    rng,
+    tracer,
+)
+from ecosphere.entities.food import Food
 from ecosphere.states import (
+    STATES,
     DeadState,
     ForagingState,
     IdleState,
@@ -32,10 +40,45 @@ class PerceivedEnvironment:
 
 
 def get_rand_prop(min_value: int = 50) -> float:
-    _rand_val = random.uniform(min_value, 100)
+    _rand_val = rng.stream("animals").uniform(min_value, 100)
     return min(min_value, _rand_val)
 
 
+def _steps_below(value: float, rate: float, bound: float, steps: int) -> int:
+    """
+    Count the steps, out of `steps`, after which a need growing by `rate` per step
+    is still below the bound.
+    """
+    if value + rate >= bound:
+        return 0
+    if rate <= 0:
+        return steps
+    return min(steps, math.ceil((bound - value) / rate) - 1)
+
+
+def _steps_at_most(value: float, rate: float, bound: float, steps: int) -> int:
+    """
+    Same as `_steps_below`, but counting the steps ending exactly on the bound too.
+    """
+    if value + rate > bound:
+        return 0
+    if rate <= 0:
+        return steps
+    return min(steps, math.floor((bound - value) / rate))
+
+
+def _steps_above(value: float, rate: float, bound: float, steps: int) -> int:
+    """
+    Count the steps, out of `steps`, after which a need falling by `rate` per step
+    is still above the bound.
+    """
+    if value - rate <= bound:
+        return 0
+    if rate <= 0:
+        return steps
+    return min(steps, math.ceil((value - bound) / rate) - 1)
+
+
 class Animal(Entity):
     """
     Class representing a animal entity in the overworld. This class is inherited by specific animal classes.
@@ -45,27 +88,38 @@ class Animal(Entity):
         representation: str representing the animal's representation in the overworld
     """
 
+    # Set from the species catalog, see `ecosphere.entities.catalog`.
+    frequency = 0
+    _property = StatusProperty()
     _cant_go_on_land = False
     _can_eat: List[Type[Food]] = []
+    diet: np.ndarray  # Food kinds eaten, as a mask over the food layer kinds
 
     def __init__(
         self,
         position: Position,
         representation: str,
-        properties: StatusProperty = StatusProperty(),
+        properties: Optional[StatusProperty] = None,
     ):
         super().__init__(position, representation, dynamic=True)
 
+        properties = properties or self._property
         self.perception_radius = properties.perception_radius
         self.properties = properties
 
-        self.state = IdleState()
+        self.state_code = IdleState.code
+        self.state_changes = 0  # Calls to change_state, even to the current state
         self.health = get_rand_prop(80)
         self.hunger = get_rand_prop()
         self.thirst = get_rand_prop()
         self.energy = get_rand_prop(80)
         self.mating_urge = 0
 
+        # Memory of the current state, forgotten when the state changes.
+        self.goal: Optional[Position] = None
+        self.goal_age = 0
+        self.fallback_direction: Optional[Position] = None
+
     def _calculate_position(
         self, overworld: "Overworld", biome_manager: BiomeManager
     ) -> Position:
@@ -74,32 +128,27 @@ class Animal(Entity):
         it should not be occupied and should be within the biome.
         If There is no space in the biome, return same position.
 
+        The neighbourhood is read from the occupancy and biome arrays at once rather
+        than cell by cell.
+
         Attributes:
             overworld: Overworld object representing the overworld
             biome_manager: BiomeManager object representing the biome manager for the overworld
         """
-        _x = [self.position.x + 1, self.position.x - 1, self.position.x]
-        _y = [self.position.y + 1, self.position.y - 1, self.position.y]
-
-        random.shuffle(_x)
-        random.shuffle(_y)
+        x, y = self.position.x, self.position.y
+        x0, y0 = max(0, x - 1), max(0, y - 1)
+        x1, y1 = min(overworld.width, x + 2), min(overworld.height, y + 2)
 
-        current_biome = biome_manager.get_biome_by_coords(
-            self.position.x, self.position.y
+        ids = biome_manager.region((x0, y0, x1, y1))
+        free = (overworld.entities.occupancy[y0:y1, x0:x1] == 0) & (
+            ids == ids[y - y0, x - x0]
         )
+        cells = np.flatnonzero(free)
+        if not len(cells):
+            return self.position
 
-        for x in _x:
-            x = max(0, min(x, overworld.width - 1))
-
-            for y in _y:
-                y = max(0, min(y, overworld.height - 1))
-
-                is_new_biome = biome_manager.get_biome_by_coords(x, y) != current_biome
-                is_occupied = overworld.is_occupied(Position(x=x, y=y))
-                if not is_occupied and not is_new_biome:
-                    return Position(x=x, y=y)
-
-        return self.position
+        cy, cx = divmod(int(rng.stream("animals").choice(cells)), x1 - x0)
+        return Position(x=x0 + cx, y=y0 + cy)
 
     def perceive_environment(
         self, overworld: "Overworld", biome_manager: BiomeManager
@@ -136,7 +185,6 @@ class Animal(Entity):
         )
 
         new_position = Position(x=self.position.x + dx, y=self.position.y + dy)
-        _old_position = self.position
 
         if self._cant_go_on_land:
             biome = biome_manager.get_biome_by_coords(new_position.x, new_position.y)
@@ -147,16 +195,23 @@ class Animal(Entity):
                     biome_manager,
                 )
 
-        self._move(new_position.x, new_position.y, overwrite=True)
+        overworld.movement.request(self, new_position)
 
-        biome = biome_manager.get_biome_by_coords(_old_position.x, _old_position.y)
-        biome_color = biome_manager.get_biome_color(biome)
-        overworld.stdscr.addstr(_old_position.y, _old_position.x, "  ", biome_color)
+    @property
+    def state(self) -> AnimalState:
+        return STATES[self.state_code]
 
     def change_state(self, state: AnimalState):
-        if not isinstance(self.state, state.__class__):
-            logging.debug(f"{self.id} is changing state to {state}.")
-            self.state = state
+        # Counted even when the state stays the same: the state objects are shared,
+        # so this is how a deferred transition knows the animal was sent elsewhere
+        # (or back) since it was deferred.
+        self.state_changes += 1
+        if self.state_code != state.code:
+            if tracer.enabled:
+                tracer.emit(TraceEvent.STATE, self, state.code)
+            self.state_code = state.code
+            self.goal = None
+            self.fallback_direction = None
 
     def update_status(self):
         # Update basic needs
@@ -183,24 +238,89 @@ class Animal(Entity):
 
         self.health = clamp(self.health, 0, 100)
 
+    def advance_status(self, steps: int):
+        """
+        Apply `steps` calls of `update_status` at once.
+
+        Hunger and thirst only grow and energy only falls between updates, so every
+        condition of `update_status` holds for a run of consecutive steps. Counting
+        those steps gives the same needs as updating step by step.
+        """
+        if steps <= 0:
+            return
+
+        properties = self.properties
+        hunger, thirst, energy = self.hunger, self.thirst, self.energy
+        hunger_rate = properties.hunger_increase_rate
+        thirst_rate = properties.thirst_increase_rate
+        energy_rate = properties.energy_decrease_rate
+
+        rested = _steps_above(energy, energy_rate, 50, steps)
+        fed = min(
+            _steps_at_most(hunger, hunger_rate, 20, steps),
+            _steps_at_most(thirst, thirst_rate, 20, steps),
+            rested,
+        )
+        urged = min(
+            _steps_at_most(hunger, hunger_rate, 50, steps),
+            _steps_at_most(thirst, thirst_rate, 50, steps),
+            rested,
+        )
+        critical = steps - min(
+            _steps_below(hunger, hunger_rate, 90, steps),
+            _steps_below(thirst, thirst_rate, 90, steps),
+        )
+        starving = (
+            steps
+            - min(
+                _steps_below(hunger, hunger_rate, 80, steps),
+                _steps_below(thirst, thirst_rate, 80, steps),
+            )
+            - critical
+        )
+
+        self.hunger = clamp(hunger + steps * hunger_rate, 0, 100)
+        self.thirst = clamp(thirst + steps * thirst_rate, 0, 100)
+        self.energy = clamp(energy - steps * energy_rate, 0, 100)
+
+        mating_urge = min(
+            100, self.mating_urge + urged * properties.mating_urge_increase_rate
+        )
+        self.mating_urge = clamp(
+            mating_urge - (steps - urged) * properties.mating_urge_decrease_rate,
+            0,
+            100,
+        )
+
+        health = min(100, self.health + fed * properties.health_increase_rate)
+        health -= starving * properties.health_decrease_rate
+        health -= (
+            critical * properties.health_decrease_rate * properties.health_multiplier
+        )
+        self.health = clamp(health, 0, 100)
+
     async def update(self, overworld: "Overworld", biome_manager: BiomeManager):
-        if isinstance(self.state, DeadState):
+        if self.state_code == DeadState.code:
             return
 
         self.update_status()
 
-        logging.debug(
-            f"{self.id} at {self.position} is {self.state} and has {self.health} health, {self.hunger} hunger, {self.thirst} thirst, {self.energy} energy, and {self.mating_urge} mating urge."
+        if tracer.enabled:
+            tracer.emit(
+                TraceEvent.UPDATE,
+                self,
+                self.health,
+                self.hunger,
+                self.thirst,
+                self.energy,
+                self.mating_urge,
+            )
+        await STATES[self.state_code].handle(
+            self, EnvironmentContext(overworld, biome_manager)
         )
-        await self.state.handle(self, EnvironmentContext(overworld, biome_manager))
 
 
 class Crab(Animal):
-    frequency = 0.01
-    _property = StatusProperty()
-
-    _can_eat = [Seaweed, Mushroom]
-
     def __init__(self, position: Position, representation: str):
         super().__init__(position, representation, self._property)
 
@@ -210,11 +330,6 @@ class Crab(Animal):
 
 
 class Fox(Animal):
-    frequency = 0.01
-    _property = StatusProperty(movement_speed=2)
-
-    _can_eat = [Mushroom, Berry, Wheat]
-
     def __init__(self, position: Position, representation: str):
         super().__init__(position, representation, self._property)
 
@@ -224,15 +339,9 @@ class Fox(Animal):
 
 
 class Fish(Animal):
-    frequency = 0.03
-    _property = StatusProperty()
-    _cant_go_on_land = True
-
-    _can_eat = [Seaweed]
-
     def __init__(self, position: Position, representation: str):
         super().__init__(position, representation, self._property)
 
     @staticmethod
     def get_representation(biome: Biome):
-        return random.choice(["🐟", "🐠", "🐡"])
+        return rng.stream("animals").choice(["🐟", "🐠", "🐡"])
@@ -0,0 +1,190 @@
+import json
+from dataclasses import fields
+from typing import Any, Dict, List, Tuple, Type
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.common.property import FoodProperty, SpawnerProperty, StatusProperty
+from ecosphere.entities.animal import Animal, Crab, Fish, Fox
+from ecosphere.entities.food import Berry, Food, Mushroom, Seaweed, Wheat
+from ecosphere.entities.food_spawner import (
+    Berries,
+    FoodSpawner,
+    Mushrooms,
+    Seaweeds,
+    Wheats,
+)
+from ecosphere.entities.plant import Flower, Plant, Tree
+from ecosphere.world.biome import BIOMES, Biome
+
+# Entity classes with their own code, e.g. for their representation.
+BUILTIN: Dict[str, Type[Entity]] = {
+    entity.__name__: entity
+    for entity in (
+        Crab,
+        Fox,
+        Fish,
+        Tree,
+        Flower,
+        Berry,
+        Mushroom,
+        Seaweed,
+        Wheat,
+        Berries,
+        Mushrooms,
+        Seaweeds,
+        Wheats,
+    )
+}
+
+
+def _entity_class(entry: Dict[str, Any], base: Type[Entity]) -> Type[Entity]:
+    """
+    Return the class of the catalog entry: the built-in class of that name, or a
+    new subclass of the base drawn with the `glyph` of the entry.
+    """
+    name = entry["name"]
+    entity_class = BUILTIN.get(name)
+    if entity_class is not None:
+        if not issubclass(entity_class, base):
+            raise ValueError(f"{name} is not a {base.__name__}")
+        return entity_class
+
+    glyph = entry.get("glyph", " ")
+    return type(
+        name,
+        (base,),
+        {
+            "__module__": __name__,
+            "representations": {biome: (glyph,) for biome in Biome},
+            "get_representation": staticmethod(lambda biome: glyph),
+        },
+    )
+
+
+def _properties(entry: Dict[str, Any], property_class: type):
+    values = entry.get("properties", {})
+    known = {field.name for field in fields(property_class)}
+    unknown = set(values) - known
+    if unknown:
+        raise ValueError(f"Unknown properties of {entry['name']}: {sorted(unknown)}")
+    return property_class(**values)
+
+
+def _spawn_rates(entries: List[Dict[str, Any]]) -> np.ndarray:
+    table = np.zeros((len(entries), max(BIOMES) + 1), dtype=np.float64)
+    for row, entry in enumerate(entries):
+        for biome_name, rate in entry.get("spawn_rates", {}).items():
+            if biome_name not in Biome.__members__:
+                raise ValueError(f"Unknown biome of {entry['name']}: {biome_name}")
+            table[row, Biome[biome_name].value] = rate
+    return table
+
+
+class SpeciesCatalog:
+    """
+    The food, food spawners, plants and animals of the simulation, loaded from a
+    data file and compiled into dense lookup tables.
+
+    Every entry is bound to the entity class of the same name, or to a new subclass
+    drawn with the `glyph` of the entry, so species can be added without code. The
+    frequency, properties and diet of the entry are set on the class, and the spawn
+    rates and diets of all the entries are compiled into arrays indexed by class
+    row, biome value and food kind, so looking them up is array indexing instead of
+    matching class names.
+
+    Attributes:
+        food: list of food classes, in the order of their food kinds
+        spawners: list of food spawner classes
+        plants: list of plant classes
+        animals: list of animal classes, in the order of their species index
+        entities: list of plant then animal classes, the overworld is populated with
+        entity_rates: (entities, biome values) array of spawn rates
+        spawner_rates: (spawners, biome values) array of spawn rates
+        diet: (animals, food kinds + 1) bool array of the food kinds every animal
+            eats, kind 0 being no food
+        status: dict of (animals,) arrays of every StatusProperty field
+    """
+
+    def __init__(self, data: Dict[str, List[Dict[str, Any]]]):
+        food = data.get("food", [])
+        spawners = data.get("spawners", [])
+        plants = data.get("plants", [])
+        animals = data.get("animals", [])
+
+        self.food: List[Type[Food]] = [_entity_class(entry, Food) for entry in food]
+        food_kinds = {food.__name__: kind for kind, food in enumerate(self.food, 1)}
+        for food_class, entry in zip(self.food, food):
+            food_class._property = _properties(entry, FoodProperty)
+
+        self.spawners: List[Type[FoodSpawner]] = []
+        for entry in spawners:
+            spawner = _entity_class(entry, FoodSpawner)
+            if entry["food"] not in food_kinds:
+                raise ValueError(f"Unknown food of {entry['name']}: {entry['food']}")
+            spawner._food = self.food[food_kinds[entry["food"]] - 1]
+            spawner._property = _properties(entry, SpawnerProperty)
+            spawner.frequency = entry.get("frequency", 0)
+            self.spawners.append(spawner)
+
+        self.plants: List[Type[Plant]] = []
+        for entry in plants:
+            plant = _entity_class(entry, Plant)
+            plant.frequency = entry.get("frequency", 0)
+            self.plants.append(plant)
+
+        self.animals: List[Type[Animal]] = []
+        self.diet = np.zeros((len(animals), len(self.food) + 1), dtype=bool)
+        for species, entry in enumerate(animals):
+            animal = _entity_class(entry, Animal)
+            unknown = [name for name in entry.get("diet", []) if name not in food_kinds]
+            if unknown:
+                raise ValueError(f"Unknown food of {entry['name']}: {unknown}")
+
+            self.diet[species, [food_kinds[name] for name in entry.get("diet", [])]] = (
+                True
+            )
+            animal.diet = self.diet[species]
+            animal._can_eat = [
+                self.food[food_kinds[name] - 1] for name in entry.get("diet", [])
+            ]
+            animal._cant_go_on_land = entry.get("aquatic", False)
+            animal._property = _properties(entry, StatusProperty)
+            animal.frequency = entry.get("frequency", 0)
+            self.animals.append(animal)
+
+        self.entities: List[Type[Entity]] = self.plants + self.animals
+        self.entity_rates = _spawn_rates(plants + animals)
+        self.spawner_rates = _spawn_rates(spawners)
+        self.status = {
+            field.name: np.array(
+                [getattr(animal._property, field.name) for animal in self.animals]
+            )
+            for field in fields(StatusProperty)
+        }
+
+        self._rows: Dict[Type[Entity], Tuple[np.ndarray, int]] = {
+            **{
+                entity: (self.entity_rates, row)
+                for row, entity in enumerate(self.entities)
+            },
+            **{
+                spawner: (self.spawner_rates, row)
+                for row, spawner in enumerate(self.spawners)
+            },
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "SpeciesCatalog":
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    def spawn_rate(self, entity_class: Type[Entity], biome: Biome) -> float:
+        """
+        Return the spawn rate of the entity or spawner class in the biome.
+        """
+        rates, row = self._rows.get(entity_class, (None, None))
+        if rates is None:
+            return 0
+        return float(rates[row, biome.value])
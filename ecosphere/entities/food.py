@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Optional
 
 from ecosphere.abc.entity import Entity
 from ecosphere.abc.position import Position
@@ -19,22 +19,22 @@ class Food(Entity):
         representation: str representing the food's representation in the overworld
     """
 
+    _property = FoodProperty()  # Set from the species catalog
+
     def __init__(
         self,
         position: Position,
         representation: str,
-        properties: FoodProperty = FoodProperty(),
+        properties: Optional[FoodProperty] = None,
     ):
         super().__init__(position, representation, dynamic=False)
-        self.properties = properties
+        self.properties = properties or self._property
 
     def update(self, overworld: "Overworld", biome_manager: "BiomeManager"):
         raise NotImplementedError("Food cannot update.")
 
 
 class Berry(Food):
-    _property = FoodProperty(nutrition=10)
-
     def __init__(self, position: Position, representation: Literal["🍇", "🍓"]):
         super().__init__(position, representation, properties=self._property)
 
@@ -47,8 +47,6 @@ class Berry(Food):
 
 
 class Mushroom(Food):
-    _property = FoodProperty(nutrition=20)
-
     def __init__(self, position: Position, representation: Literal["🍄"]):
         super().__init__(position, representation, properties=self._property)
 
@@ -61,8 +59,6 @@ class Mushroom(Food):
 
 
 class Seaweed(Food):
-    _property = FoodProperty(nutrition=15)
-
     def __init__(self, position: Position, representation: Literal["🌿"]):
         super().__init__(position, representation, properties=self._property)
 
@@ -75,8 +71,6 @@ class Seaweed(Food):
 
 
 class Wheat(Food):
-    _property = FoodProperty(nutrition=15)
-
     def __init__(self, position: Position, representation: Literal["🌾"]):
         super().__init__(position, representation, properties=self._property)
 
@@ -1,11 +1,9 @@
-import logging
-import random
-from typing import TYPE_CHECKING, Literal, Type
+from typing import TYPE_CHECKING, Literal, Optional, Type
 
 from ecosphere.abc.entity import Entity
 from ecosphere.abc.position import Position
 from ecosphere.common.property import SpawnerProperty
-from ecosphere.entities.food import Berry, Food, Mushroom, Seaweed, Wheat
+from ecosphere.entities.food import Food
 from ecosphere.world.biome import Biome, BiomeManager
 
 if TYPE_CHECKING:
@@ -13,46 +11,32 @@ if TYPE_CHECKING:
 
 
 class FoodSpawner(Entity):
+    # Set from the species catalog, see `ecosphere.entities.catalog`.
+    frequency = 0
+    _food: Type[Food] = Food
+    _property = SpawnerProperty()
+
     def __init__(
         self,
         position: Position,
         representation: str,
-        food: Type[Food],
-        properties: SpawnerProperty = SpawnerProperty(),
+        food: Optional[Type[Food]] = None,
+        properties: Optional[SpawnerProperty] = None,
     ):
         super().__init__(position, representation, dynamic=False)
-        self.properties = properties
-        self.food = food
+        self.properties = properties or self._property
+        self.food = food or self._food
 
     def move(self, x: int, y: int, overwrite: bool = False):
         raise NotImplementedError("Spawners cannot move.")
 
-    async def update(self, overworld: "Overworld", biome_manager: BiomeManager):
-        if (
-            len(
-                overworld.get_nearby_food(self.position, self.properties.range_capacity)
-            )
-            > self.properties.range_capacity
-        ):
-            return
-
-        for _ in range(self.properties.range_capacity):
-            position = Position.get_random_position_in_radius(
-                self.position, self.properties.dispersal_radius
-            )
-            position.x = max(0, min(position.x, overworld.width - 1))
-            position.y = max(0, min(position.y, overworld.height - 1))
-
-            if not overworld.is_occupied(position):
-                overworld.spawn_food(self.food, position)
+    def update(self, overworld: "Overworld", biome_manager: BiomeManager):
+        raise NotImplementedError("Spawners are updated in batches by the pool.")
 
 
 class Berries(FoodSpawner):
-    frequency = 0.01
-    _property = SpawnerProperty()
-
     def __init__(self, position: Position, representation: Literal["🍇", "🍓"]):
-        super().__init__(position, representation, Berry, properties=self._property)
+        super().__init__(position, representation, self._food, self._property)
 
     @staticmethod
     def get_representation(biome: Biome):
@@ -60,11 +44,8 @@ class Berries(FoodSpawner):
 
 
 class Mushrooms(FoodSpawner):
-    frequency = 0.01
-    _property = SpawnerProperty()
-
     def __init__(self, position: Position, representation: Literal["🍄"]):
-        super().__init__(position, representation, Mushroom, properties=self._property)
+        super().__init__(position, representation, self._food, self._property)
 
     @staticmethod
     def get_representation(biome: Biome):
@@ -72,13 +53,8 @@ class Mushrooms(FoodSpawner):
 
 
 class Seaweeds(FoodSpawner):
-    frequency = 0.01
-    _property = SpawnerProperty(
-        dispersal_speed=0.5, range_capacity=5, dispersal_radius=3
-    )
-
     def __init__(self, position: Position, representation: Literal["🌿"]):
-        super().__init__(position, representation, Seaweed, properties=self._property)
+        super().__init__(position, representation, self._food, self._property)
 
     @staticmethod
     def get_representation(biome: Biome):
@@ -86,11 +62,8 @@ class Seaweeds(FoodSpawner):
 
 
 class Wheats(FoodSpawner):
-    frequency = 0.01
-    _property = SpawnerProperty()
-
     def __init__(self, position: Position, representation: Literal["🌾", "🌱"]):
-        super().__init__(position, representation, Wheat, properties=self._property)
+        super().__init__(position, representation, self._food, self._property)
 
     @staticmethod
     def get_representation(biome: Biome):
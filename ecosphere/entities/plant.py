@@ -1,8 +1,8 @@
-import random
 from typing import TYPE_CHECKING, Literal
 
 from ecosphere.abc.entity import Entity
 from ecosphere.abc.position import Position
+from ecosphere.common.rng import rng
 from ecosphere.world.biome import Biome, BiomeManager
 
 if TYPE_CHECKING:
@@ -18,6 +18,8 @@ class Plant(Entity):
         representation: str representing the plant's representation in the overworld
     """
 
+    frequency = 0  # Set from the species catalog
+
     def __init__(self, position: Position, representation: str):
         super().__init__(position, representation, dynamic=False)
 
@@ -37,7 +39,11 @@ class Tree(Plant):
         representation: str representing the tree's representation in the overworld
     """
 
-    frequency = 0.25
+    representations = {
+        Biome.FOREST: ("🌲", "🌳"),
+        Biome.PLAINS: ("🌲", "🌳"),
+        Biome.DESERT: ("🌴", "🌵"),
+    }
 
     def __init__(
         self, position: Position, representation: Literal["🌲", "🌳", "🌴", "🌵"] = "🌲"
@@ -59,10 +65,8 @@ class Tree(Plant):
         Attributes:
             biome: Biome object representing the biome the tree is in (e.g. forest, plains, desert)
         """
-        if biome in [Biome.FOREST, Biome.PLAINS]:
-            return random.choice(["🌲", "🌳"])
-        elif biome == Biome.DESERT:
-            return random.choice(["🌴", "🌵"])
+        if biome in Tree.representations:
+            return rng.stream("plants").choice(Tree.representations[biome])
         else:
             return " "
 
@@ -76,7 +80,10 @@ class Flower(Plant):
         representation: str representing the flower's representation in the overworld
     """
 
-    frequency = 0.03
+    representations = {
+        Biome.FOREST: ("🌸", "🌼", "🌷", "🌻"),
+        Biome.PLAINS: ("🌸", "🌼", "🌷", "🌻"),
+    }
 
     def __init__(
         self, position: Position, representation: Literal["🌸", "🌼", "🌷", "🌻"] = "🌸"
@@ -85,7 +92,7 @@ class Flower(Plant):
 
     @staticmethod
     def get_representation(biome: Biome):
-        if biome in [Biome.FOREST, Biome.PLAINS]:
-            return random.choice(["🌸", "🌼", "🌷", "🌻"])
+        if biome in Flower.representations:
+            return rng.stream("plants").choice(Flower.representations[biome])
         else:
             return " "
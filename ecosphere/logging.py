@@ -1,8 +1,13 @@
 import logging
 from typing import Literal
 
+LOG_FILE = "ecosphere.log"
+
 
 def set_logging_level(level: Literal["debug", "info", "warning", "error", "critical"]):
+    # Logging to stderr would be drawn over the curses screen.
     logging.basicConfig(
-        level=level.upper(), format="%(asctime)s - %(levelname)s - %(message)s"
+        filename=LOG_FILE,
+        level=level.upper(),
+        format="%(asctime)s - %(levelname)s - %(message)s",
     )
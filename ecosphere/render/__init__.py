@@ -0,0 +1,6 @@
+from .ansi_renderer import AnsiRenderer  # noqa: F401
+from .curses_renderer import CursesRenderer  # noqa: F401
+from .null_renderer import NullRenderer  # noqa: F401
+from .render_thread import RenderThread, Snapshot  # noqa: F401
+from .renderer import Renderer  # noqa: F401
+from .viewport import Viewport  # noqa: F401
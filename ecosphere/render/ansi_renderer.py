@@ -0,0 +1,195 @@
+import os
+import unicodedata
+from array import array
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ecosphere.render.glyphs import VARIATION_SELECTOR, glyph_width
+from ecosphere.render.renderer import Renderer
+
+# Foreground and background of every color pair, matching `main._init_colors`.
+PALETTE = {
+    1: (0, 4),
+    2: (0, 3),
+    3: (0, 2),
+    4: (0, 22),
+    5: (0, 244),
+    6: (0, 7),
+    7: (7, 0),
+}
+
+BLANK = 0
+CONTINUATION = -1  # Right half of a wide glyph
+UNKNOWN = -2  # Nothing known to be on the screen yet
+
+
+class AnsiRenderer(Renderer):
+    """
+    Renderer writing escape sequences straight to the terminal.
+
+    Drawing only updates an in-memory grid of glyph ids and colors. `flush` compares
+    it with what was sent last time and encodes the changed cells into a reusable
+    bytearray, moving the cursor and switching colors only when needed, then sends
+    the whole frame with a single `os.write`.
+
+    Attributes:
+        rows: int representing the height of the screen
+        columns: int representing the width of the screen
+        fd: file descriptor of the terminal
+    """
+
+    def __init__(self, rows: int, columns: int, fd: int = 1):
+        super().__init__()
+        self.rows = rows
+        self.columns = columns
+        self.fd = fd
+
+        self._ids: Dict[str, int] = {" ": BLANK}
+        self._glyphs: List[bytes] = [b" "]
+        self._widths: List[int] = [1]
+
+        cells = rows * columns
+        self._glyph = array("i", bytes(4 * cells))
+        self._color = array("b", bytes(cells))
+        self._glyph_view = np.frombuffer(self._glyph, dtype=np.int32)
+        self._color_view = np.frombuffer(self._color, dtype=np.int8)
+
+        self._front_glyph = np.full(cells, UNKNOWN, dtype=np.int32)
+        self._front_color = np.zeros(cells, dtype=np.int8)
+
+        self._sgr = [b"\x1b[0m"] * (max(PALETTE) + 1)
+        for pair, (foreground, background) in PALETTE.items():
+            self._sgr[pair] = b"\x1b[38;5;%d;48;5;%dm" % (foreground, background)
+
+        self._buffer = bytearray(1 << 16)
+        self._length = 0
+
+        # Disable line wrapping, so writing the last column never scrolls.
+        self._write(b"\x1b[?7l")
+
+    def size(self) -> Tuple[int, int]:
+        return self.rows, self.columns
+
+    def _id(self, glyph: str) -> int:
+        glyph_id = self._ids.get(glyph)
+        if glyph_id is None:
+            glyph_id = self._ids[glyph] = len(self._glyphs)
+            self._glyphs.append(glyph.encode())
+            self._widths.append(glyph_width(glyph))
+        return glyph_id
+
+    def draw_background(self, colors: np.ndarray, x: int = 0, y: int = 0):
+        rows = max(0, min(self.rows - y, colors.shape[0]))
+        columns = max(0, min(self.columns - x, colors.shape[1]))
+
+        glyph = self._glyph_view.reshape(self.rows, self.columns)
+        color = self._color_view.reshape(self.rows, self.columns)
+        glyph[y : y + rows, x : x + columns] = BLANK
+        color[y : y + rows, x : x + columns] = colors[:rows, :columns]
+
+        # Wide glyphs cut in half by the background lose their other half too.
+        if x > 0:
+            edge = glyph[y : y + rows, x - 1]
+            widths = np.array(self._widths, dtype=np.int8)[np.maximum(edge, BLANK)]
+            edge[(edge > BLANK) & (widths == 2)] = BLANK
+        if x + columns < self.columns:
+            edge = glyph[y : y + rows, x + columns]
+            edge[edge == CONTINUATION] = BLANK
+
+    def draw(self, x: int, y: int, glyph: str, color: int):
+        if not (0 <= x < self.columns and 0 <= y < self.rows):
+            return
+
+        glyph_id = self._id(glyph)
+        width = self._widths[glyph_id]
+        if width == 2 and x + 1 >= self.columns:
+            glyph_id, width = BLANK, 1
+
+        cells = self._glyph
+        i = y * self.columns + x
+
+        # Never leave half of a wide glyph on the screen.
+        if cells[i] == CONTINUATION:
+            cells[i - 1] = BLANK
+        elif x + 1 < self.columns and cells[i + 1] == CONTINUATION:
+            cells[i + 1] = BLANK
+
+        if width == 2:
+            following = cells[i + 1]
+            if following > BLANK and self._widths[following] == 2:
+                cells[i + 2] = BLANK
+            cells[i + 1] = CONTINUATION
+            self._color[i + 1] = color
+
+        cells[i] = glyph_id
+        self._color[i] = color
+
+    def draw_text(self, x: int, y: int, text: str, color: int):
+        cluster = ""
+        for char in text:
+            if cluster and (char == VARIATION_SELECTOR or unicodedata.combining(char)):
+                cluster += char
+                continue
+            if cluster:
+                self.draw(x, y, cluster, color)
+                x += glyph_width(cluster)
+            cluster = char
+        if cluster:
+            self.draw(x, y, cluster, color)
+
+    def _write(self, data: bytes):
+        end = self._length + len(data)
+        if end > len(self._buffer):
+            self._buffer.extend(
+                bytes(max(end, 2 * len(self._buffer)) - len(self._buffer))
+            )
+        self._buffer[self._length : end] = data
+        self._length = end
+
+    def _flush(self):
+        glyph, color = self._glyph_view, self._color_view
+
+        changed = (glyph != self._front_glyph) | (color != self._front_color)
+        # A changed right half means its wide glyph has to be sent again.
+        changed[np.flatnonzero(changed & (glyph == CONTINUATION)) - 1] = True
+        indices = np.flatnonzero(changed & (glyph != CONTINUATION))
+
+        write = self._write
+        glyphs, widths, sgr = self._glyphs, self._widths, self._sgr
+        columns = self.columns
+
+        cursor = current = -1
+        for i, glyph_id, pair in zip(
+            indices.tolist(), glyph[indices].tolist(), color[indices].tolist()
+        ):
+            if i != cursor or i % columns == 0:
+                write(b"\x1b[%d;%dH" % (i // columns + 1, i % columns + 1))
+            if pair != current:
+                write(sgr[pair])
+                current = pair
+            write(glyphs[glyph_id])
+            cursor = i + widths[glyph_id]
+
+        self.frame_bytes = self._length
+        self._send()
+
+        self._front_glyph[:] = glyph
+        self._front_color[:] = color
+
+    def invalidate(self):
+        self._front_glyph[:] = UNKNOWN
+
+    def _send(self):
+        view = memoryview(self._buffer)[: self._length]
+        while view:
+            view = view[os.write(self.fd, view) :]
+        del view
+        self._length = 0
+
+    def close(self):
+        """
+        Restore line wrapping and the default colors.
+        """
+        self._write(b"\x1b[0m\x1b[?7h")
+        self._send()
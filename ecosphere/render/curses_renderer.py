@@ -0,0 +1,39 @@
+import curses
+from typing import Any, Tuple
+
+import numpy as np
+
+from ecosphere.render.renderer import Renderer
+
+
+class CursesRenderer(Renderer):
+    """
+    Renderer drawing through a curses window, one `addstr` call per cell.
+    """
+
+    def __init__(self, stdscr: Any):
+        super().__init__()
+        self.stdscr = stdscr
+
+    def size(self) -> Tuple[int, int]:
+        return self.stdscr.getmaxyx()
+
+    def draw_background(self, colors: np.ndarray, x: int = 0, y: int = 0):
+        for row, pairs in enumerate(colors.tolist(), start=y):
+            for column, pair in enumerate(pairs, start=x):
+                try:
+                    self.stdscr.addstr(row, column, " ", curses.color_pair(pair))
+                except curses.error:
+                    pass
+
+    def draw(self, x: int, y: int, glyph: str, color: int):
+        try:
+            self.stdscr.addstr(y, x, glyph, curses.color_pair(color))
+        except curses.error:
+            pass
+
+    def draw_text(self, x: int, y: int, text: str, color: int):
+        self.stdscr.addstr(y, x, text, curses.color_pair(color))
+
+    def _flush(self):
+        self.stdscr.refresh()
@@ -0,0 +1,36 @@
+import unicodedata
+from typing import Dict
+
+# Every glyph drawn by the simulation, measured once at import.
+GLYPHS = "🌲🌳🌴🌵🌸🌼🌷🌻🦀🦊🐟🐠🐡🍇🍓🍄🌿🌾🌱"
+
+VARIATION_SELECTOR = "\ufe0f"
+
+
+def _measure(text: str) -> int:
+    """
+    Return the number of terminal cells taken by the text.
+    """
+    width = 0
+    for char in text:
+        if char == VARIATION_SELECTOR or unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+    # An emoji presentation selector makes a narrow symbol wide, e.g. "🕹️".
+    if VARIATION_SELECTOR in text and width == 1:
+        width = 2
+    return width
+
+
+GLYPH_WIDTHS: Dict[str, int] = {" ": 1, **{glyph: _measure(glyph) for glyph in GLYPHS}}
+
+
+def glyph_width(glyph: str) -> int:
+    """
+    Return the width of the glyph in terminal cells, measuring unknown glyphs once.
+    """
+    width = GLYPH_WIDTHS.get(glyph)
+    if width is None:
+        width = GLYPH_WIDTHS[glyph] = _measure(glyph)
+    return width
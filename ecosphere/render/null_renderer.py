@@ -0,0 +1,35 @@
+from typing import Tuple
+
+import numpy as np
+
+from ecosphere.render.renderer import Renderer
+
+
+class NullRenderer(Renderer):
+    """
+    Renderer drawing nothing, for running the simulation without a terminal.
+
+    Attributes:
+        rows: int representing the height of the screen
+        columns: int representing the width of the screen
+    """
+
+    def __init__(self, rows: int, columns: int):
+        super().__init__()
+        self.rows = rows
+        self.columns = columns
+
+    def size(self) -> Tuple[int, int]:
+        return self.rows, self.columns
+
+    def draw_background(self, colors: np.ndarray, x: int = 0, y: int = 0):
+        pass
+
+    def draw(self, x: int, y: int, glyph: str, color: int):
+        pass
+
+    def draw_text(self, x: int, y: int, text: str, color: int):
+        pass
+
+    def _flush(self):
+        pass
@@ -0,0 +1,137 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ecosphere.render.glyphs import glyph_width
+from ecosphere.render.renderer import Renderer
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    What the viewport shows at a tick boundary. Snapshots are never changed once
+    published, so the render thread can read them while the simulation goes on.
+
+    Attributes:
+        tick: int representing the simulation tick the snapshot was taken at
+        rect: (x0, y0, x1, y1) world rect of the viewport
+        glyph: (rows, columns) array of indices into `glyphs`, 0 for a blank cell
+        color: (rows, columns) array of color pairs
+        glyphs: list of glyphs the indices refer to, only ever appended to
+        overlay: (x, y, lines) of text drawn over the world, if any
+    """
+
+    tick: int
+    rect: Tuple[int, int, int, int]
+    glyph: np.ndarray
+    color: np.ndarray
+    glyphs: List[str]
+    overlay: Optional[Tuple[int, int, List[str]]] = None
+
+
+class RenderThread(threading.Thread):
+    """
+    Draw the published snapshots on a thread of its own, so frames are drawn while
+    the simulation runs instead of pausing it.
+
+    The simulation publishes into a back slot and the thread takes the latest
+    snapshot from it when it is done with the previous frame, so neither waits on
+    the other: snapshots published while a frame is drawn replace each other and
+    only the latest is drawn. Only the cells that differ from the snapshot drawn
+    last are sent to the renderer. Everything drawing on the renderer holds its
+    lock, as terminal libraries can't be used from two threads at once.
+
+    Attributes:
+        renderer: Renderer object the snapshots are drawn with
+        overlay_color: int representing the color pair of the overlay text
+    """
+
+    def __init__(self, renderer: Renderer, overlay_color: int = 7):
+        super().__init__(name="render", daemon=True)
+        self.renderer = renderer
+        self.overlay_color = overlay_color
+
+        self._back: Optional[Snapshot] = None
+        self._front: Optional[Snapshot] = None
+        self._swap = threading.Lock()
+        self._published = threading.Event()
+        self._stopped = False
+
+    def publish(self, snapshot: Snapshot):
+        """
+        Hand a snapshot to the thread, replacing the one not drawn yet, if any.
+        """
+        with self._swap:
+            self._back = snapshot
+        self._published.set()
+
+    def _take(self) -> Optional[Snapshot]:
+        with self._swap:
+            snapshot, self._back = self._back, None
+        return snapshot
+
+    def stop(self):
+        self._stopped = True
+        self._published.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        while True:
+            self._published.wait()
+            self._published.clear()
+            if self._stopped:
+                return
+
+            snapshot = self._take()
+            if snapshot is None:
+                continue
+            try:
+                with self.renderer.lock:
+                    self.renderer.begin_frame()
+                    self._draw(snapshot)
+                    self.renderer.flush()
+            except Exception:
+                logging.exception("Drawing frame of tick %d failed", snapshot.tick)
+            self._front = snapshot
+
+    def _changed(self, snapshot: Snapshot) -> np.ndarray:
+        front = self._front
+        if front is None or front.rect != snapshot.rect:
+            return np.ones(snapshot.glyph.shape, dtype=bool)
+
+        changed = (snapshot.glyph != front.glyph) | (snapshot.color != front.color)
+        if front.overlay and front.overlay != snapshot.overlay:
+            # The cells under a closed or resized overlay are drawn again.
+            x, y, lines = front.overlay
+            width = max(glyph_width(line) for line in lines)
+            changed[y : y + len(lines), x : x + width] = True
+
+        # Wide glyphs spill over the cell to their right, redraw both neighbours.
+        spread = changed.copy()
+        spread[:, 1:] |= changed[:, :-1]
+        spread[:, :-1] |= changed[:, 1:]
+        return spread
+
+    def _draw(self, snapshot: Snapshot):
+        renderer = self.renderer
+        ys, xs = np.nonzero(self._changed(snapshot))
+        glyph_ids = snapshot.glyph[ys, xs].tolist()
+        colors = snapshot.color[ys, xs].tolist()
+        cells = list(zip(xs.tolist(), ys.tolist(), glyph_ids, colors))
+
+        # Blank first, so a glyph isn't cut by the blanking of its right neighbour.
+        for x, y, _, color in cells:
+            renderer.draw(x, y, " ", color)
+        glyphs = snapshot.glyphs
+        for x, y, glyph_id, color in cells:
+            if glyph_id:
+                renderer.draw(x, y, glyphs[glyph_id], color)
+
+        if snapshot.overlay:
+            x, y, lines = snapshot.overlay
+            for row, line in enumerate(lines):
+                renderer.draw_text(x, y + row, line, self.overlay_color)
@@ -0,0 +1,76 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class Renderer(ABC):
+    """
+    Abstract terminal backend the overworld is drawn with.
+
+    Colors are the curses color pair numbers set up in `main._init_colors`.
+    A frame starts with `begin_frame` and ends with `flush`, which also records
+    how long the frame took and, when the backend knows it, how many bytes it sent.
+    Code drawing from more than one thread holds `lock` while doing so.
+    """
+
+    def __init__(self):
+        self.frame_time = 0.0
+        self.frame_bytes: Optional[int] = None
+        self.lock = threading.RLock()
+
+        self._frame_start = time.perf_counter()
+
+    @abstractmethod
+    def size(self) -> Tuple[int, int]:
+        """
+        Return the (rows, columns) of the screen.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw_background(self, colors: np.ndarray, x: int = 0, y: int = 0):
+        """
+        Blank a rectangle of the screen, coloring every cell from the array.
+
+        Attributes:
+            colors: (rows, columns) array of color pairs
+            x: int representing the left column of the rectangle
+            y: int representing the top row of the rectangle
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw(self, x: int, y: int, glyph: str, color: int):
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw_text(self, x: int, y: int, text: str, color: int):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _flush(self):
+        raise NotImplementedError
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def flush(self):
+        """
+        Send everything drawn since the last flush to the terminal.
+        """
+        self._flush()
+        self.frame_time = time.perf_counter() - self._frame_start
+
+    def invalidate(self):
+        """
+        Forget what is on the screen, so the next flush sends every cell again.
+        Needed when something else drew over the renderer's output.
+        """
+
+    def close(self):
+        """
+        Restore the terminal state changed by the backend.
+        """
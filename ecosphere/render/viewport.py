@@ -0,0 +1,52 @@
+from typing import Optional, Tuple
+
+from ecosphere.abc.position import Position
+
+
+class Viewport:
+    """
+    Part of the overworld shown on the screen, with its top-left corner at (x, y).
+
+    Attributes:
+        width: int representing the number of columns shown
+        height: int representing the number of rows shown
+        world_width: int representing the width of the overworld
+        world_height: int representing the height of the overworld
+    """
+
+    def __init__(self, width: int, height: int, world_width: int, world_height: int):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.width = min(width, world_width)
+        self.height = min(height, world_height)
+
+        self.x = 0
+        self.y = 0
+
+    @property
+    def rect(self) -> Tuple[int, int, int, int]:
+        """
+        Return the (x0, y0, x1, y1) world coordinates shown, x1 and y1 excluded.
+        """
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+    def pan(self, dx: int, dy: int):
+        """
+        Move the viewport by the given amount of cells, staying inside the world.
+        """
+        self.x = max(0, min(self.world_width - self.width, self.x + dx))
+        self.y = max(0, min(self.world_height - self.height, self.y + dy))
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        return x - self.x, y - self.y
+
+    def to_world(self, position: Position) -> Optional[Position]:
+        """
+        Translate a screen position to the world, None when it is outside the view.
+        """
+        if not (0 <= position.x < self.width and 0 <= position.y < self.height):
+            return None
+        return Position(position.x + self.x, position.y + self.y)
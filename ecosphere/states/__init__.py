@@ -1,9 +1,12 @@
 from .animal_state import (
+    STATES,
     DeadState,
     ForagingState,
     IdleState,  # noqa: F401
     MatingState,
     SeekingWaterState,
     SleepingState,
+    idle_transitions,
 )
 from .state import AnimalState  # noqa: F401
+from .transitions import Transition, TransitionTable  # noqa: F401
@@ -1,9 +1,10 @@
-import logging
-import random
-from typing import TYPE_CHECKING
+from operator import ge, gt, le, lt
+from typing import TYPE_CHECKING, List
 
 from ecosphere.abc.position import Position
+from ecosphere.common.trace import TraceEvent, tracer
 from ecosphere.states.state import AnimalState
+from ecosphere.states.transitions import Transition, TransitionTable
 from ecosphere.world.biome import Biome
 
 if TYPE_CHECKING:
@@ -18,6 +19,8 @@ class DeadState(AnimalState):
     The animal is dead. It will not do anything anymore.
     """
 
+    code = 0
+
     async def handle(
         self, animal: "Animal", environment_context: "EnvironmentContext"
     ) -> None:
@@ -27,70 +30,68 @@ class DeadState(AnimalState):
 class IdleState(AnimalState):
     """
     The animal is not doing anything in particular. It will decide what to do next based on its current status.
+    The decision is taken by `idle_transitions`, for all the idle animals of a tick at once.
     """
 
+    code = 1
+
     async def handle(
         self, animal: "Animal", environment_context: "EnvironmentContext"
     ) -> None:
-        if animal.health <= 0:
-            if not isinstance(animal.state, DeadState):
-                logging.debug(f"{animal.id} has died.")
-                animal.change_state(DeadState())
-                # bus.emit("entity:dead", self)
-                return
-
-        if animal.energy <= 10:
-            logging.debug(f"{animal.id} is very tired and needs to rest.")
-            animal.change_state(SleepingState())
-        elif animal.thirst >= 50:
-            logging.debug(f"{animal.id} is thirsty and needs water.")
-            animal.change_state(SeekingWaterState())
-        elif animal.hunger >= 50:
-            logging.debug(f"{animal.id} is hungry and needs to eat.")
-            animal.change_state(ForagingState())
-        elif animal.mating_urge >= 80 and animal.energy > 50:
-            logging.debug(f"{animal.id} is in mood and needs to mate.")
-            animal.change_state(MatingState())
-        elif animal.energy < 50:
-            logging.debug(f"{animal.id} is tired and needs to rest.")
-            animal.change_state(SleepingState())
-        else:
-            animal.change_state(MovingState())
+        idle_transitions.defer(animal)
 
 
 class ForagingState(AnimalState):
     """
     The animal is foraging for food. It will look for food in the environment and eat it.
+    The food found is followed until it is gone or it is time to search again. When
+    the overworld has scent fields, the animal follows the scent of its food instead.
     """
 
+    code = 2
+
     async def handle(
         self, animal: "Animal", environment_context: "EnvironmentContext"
     ) -> None:
         if animal.hunger <= 0:
-            logging.debug(f"{animal} is no longer hungry.")
             animal.change_state(IdleState())
             return
 
-        nearest_food = self.find_nearest_food_source(animal, environment_context)
+        overworld = environment_context.overworld
+        if overworld.scent.enabled:
+            await self.follow_scent(animal, environment_context)
+            return
 
-        if nearest_food:
-            logging.debug(
-                f"{animal} found that there is food nearby ({nearest_food}). Moving from {animal.position} towards it (hunger: {animal.hunger})."
-            )
-            if animal.position.is_next_to(nearest_food.position):
-                logging.debug(f"{animal} is eating food.")
-                self.eat(animal, nearest_food, environment_context.overworld)
+        food_position = self.recall_goal(
+            animal, lambda position: overworld.food.holds(position, animal.diet)
+        )
+        if food_position is None:
+            nearest_food = self.find_nearest_food_source(animal, environment_context)
+            if nearest_food:
+                food_position = nearest_food.position
+                self.remember_goal(animal, food_position)
+                if tracer.enabled:
+                    tracer.emit(
+                        TraceEvent.FOOD_FOUND,
+                        animal,
+                        food_position.x,
+                        food_position.y,
+                        animal.hunger,
+                    )
+
+        if food_position:
+            if animal.position.is_next_to(food_position):
+                self.eat(
+                    animal, overworld.get_food_at_position(food_position), overworld
+                )
+                self.remember_goal(animal, None)
             else:
-                logging.debug(f"{animal} is moving towards food.")
                 await animal.move_towards(
-                    nearest_food.position,
+                    food_position,
                     environment_context.overworld,
                     environment_context.biome_manager,
                 )
         else:
-            logging.debug(
-                f"{animal} couldn't find any water nearby. Moving in a random direction."
-            )
             fallback_direction = self.decide_fallback_direction(
                 animal, environment_context.overworld
             )
@@ -100,71 +101,72 @@ class ForagingState(AnimalState):
                 environment_context.biome_manager,
             )
 
+    async def follow_scent(
+        self, animal: "Animal", environment_context: "EnvironmentContext"
+    ) -> None:
+        overworld = environment_context.overworld
+        food_position = overworld.food.nearest(animal.position, 1, animal.diet)
+        if food_position:
+            self.eat(animal, overworld.get_food_at_position(food_position), overworld)
+            return
+
+        next_position = overworld.scent.towards_food(
+            animal.position, animal.diet
+        ) or self.decide_fallback_direction(animal, overworld)
+        await animal.move_towards(
+            next_position, overworld, environment_context.biome_manager
+        )
+
     def eat(self, animal: "Animal", food: "Food", overworld: "Overworld"):
         animal.hunger -= food.properties.nutrition
         overworld.remove(food)
+        if tracer.enabled:
+            tracer.emit(
+                TraceEvent.EAT, animal, food.properties.nutrition, animal.hunger
+            )
 
     def find_nearest_food_source(
         self, animal: "Animal", environment_context: "EnvironmentContext"
-    ) -> None:
-        perception_range = animal.perception_radius
-        current_pos = animal.position
-        nearest_food = None
-        min_distance = float("inf")
-
-        nearest_food = environment_context.overworld.get_nearby_food(
-            current_pos, perception_range, food_type=animal._can_eat
+    ) -> "Food":
+        return environment_context.overworld.get_nearest_food(
+            animal.position, animal.perception_radius, food_type=animal.diet
         )
 
-        for food in nearest_food:
-            distance = current_pos.distance_to(food.position)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_food = food
-
-        return nearest_food
-
 
 class MatingState(AnimalState):
     """
-    The animal is looking for a mate. It will look for potential mates in the
-    environment and move towards them. If it finds a mate, they will reproduce.
+    The animal is looking for a mate. The overworld matchmaker pairs it with a mate
+    nearby, and both move to their meeting point. Once next to each other, they
+    reproduce. Without a mate nearby, the animal follows the scent of the animals
+    of its species ready to mate, if the overworld has scent fields.
     """
 
+    code = 3
+
     async def handle(
         self, animal: "Animal", environment_context: "EnvironmentContext"
     ) -> None:
-        environment = animal.perceive_environment(
-            environment_context.overworld, environment_context.biome_manager
-        )
-        if environment.potential_mates:
-            mate: Animal = min(
-                environment.potential_mates,
-                key=lambda mate: animal.position.distance_to(mate.position),
-            )
-            if animal.position.distance_to(mate.position) <= animal.perception_radius:
-                if not animal.position.is_next_to(mate.position):
-                    await animal.move_towards(
-                        mate.position,
-                        environment_context.overworld,
-                        environment_context.biome_manager,
-                    )
-                else:
-                    self.reproduce(animal, mate, environment_context.overworld)
+        match = environment_context.overworld.matchmaker.partner(animal)
+        if match and match[0].state_code != DeadState.code:
+            mate, meeting_point = match
+            if animal.position.is_next_to(mate.position):
+                self.reproduce(animal, mate, environment_context.overworld)
             else:
-                logging.debug(f"{animal} is moving towards a potential mate.")
                 await animal.move_towards(
-                    mate.position,
+                    meeting_point,
                     environment_context.overworld,
                     environment_context.biome_manager,
                 )
         else:
-            fallback_direction = self.decide_fallback_direction(
-                animal, environment_context.overworld
-            )
+            overworld = environment_context.overworld
+            next_position = None
+            if overworld.scent.enabled:
+                next_position = overworld.scent.towards_mates(
+                    animal.position, type(animal)
+                )
             await animal.move_towards(
-                fallback_direction,
-                environment_context.overworld,
+                next_position or self.decide_fallback_direction(animal, overworld),
+                overworld,
                 environment_context.biome_manager,
             )
 
@@ -185,6 +187,14 @@ class MatingState(AnimalState):
 
         offspring = animal.__class__
         overworld.spawn_entity(offspring, offspring_position)
+        if tracer.enabled:
+            tracer.emit(
+                TraceEvent.REPRODUCE,
+                animal,
+                offspring_position.x,
+                offspring_position.y,
+                mate.key,
+            )
 
         animal.energy -= 50
         mate.energy -= 50
@@ -198,6 +208,8 @@ class MovingState(AnimalState):
     The animal is moving. It will move to a new position in the environment.
     """
 
+    code = 4
+
     async def handle(self, animal: "Animal", environment_context: "EnvironmentContext"):
         new_position = animal._calculate_position(
             environment_context.overworld, environment_context.biome_manager
@@ -210,32 +222,58 @@ class MovingState(AnimalState):
 
 
 class SeekingWaterState(AnimalState):
+    """
+    The animal is thirsty. It will look for water and drink next to it, following
+    the water scent when the overworld has scent fields.
+    """
+
+    code = 5
+
     async def handle(self, animal: "Animal", environment_context: "EnvironmentContext"):
         if animal.thirst <= 0:
-            logging.debug(f"{animal} is no longer thirsty.")
             animal.change_state(IdleState())
             return
 
-        nearest_water = self.find_nearest_water_source(animal, environment_context)
+        biome_manager = environment_context.biome_manager
+        overworld = environment_context.overworld
+        if overworld.scent.enabled:
+            if biome_manager.nearest(animal.position, 1, Biome.WATER):
+                self.drink(animal)
+            else:
+                next_position = overworld.scent.towards_water(
+                    animal.position
+                ) or self.decide_fallback_direction(animal, overworld)
+                await animal.move_towards(next_position, overworld, biome_manager)
+            return
+
+        nearest_water = self.recall_goal(
+            animal,
+            lambda position: biome_manager.get_biome_by_coords(position.x, position.y)
+            == Biome.WATER,
+        )
+        if nearest_water is None:
+            nearest_water = self.find_nearest_water_source(animal, environment_context)
+            self.remember_goal(animal, nearest_water)
+
+            if nearest_water and tracer.enabled:
+                tracer.emit(
+                    TraceEvent.WATER_FOUND,
+                    animal,
+                    nearest_water.x,
+                    nearest_water.y,
+                    animal.thirst,
+                )
 
         if nearest_water:
-            logging.debug(
-                f"{animal} found that there is water nearby ({nearest_water}). Moving from {animal.position} towards it (thirst: {animal.thirst})."
-            )
             if animal.position.is_next_to(nearest_water):
-                logging.debug(f"{animal} is drinking water.")
                 self.drink(animal)
             else:
-                logging.debug(f"{animal} is moving towards water.")
                 await animal.move_towards(
                     nearest_water,
                     environment_context.overworld,
                     environment_context.biome_manager,
                 )
         else:
-            logging.debug(
-                f"{animal} couldn't find any water nearby. Moving in a random direction."
-            )
             fallback_direction = self.decide_fallback_direction(
                 animal, environment_context.overworld
             )
@@ -247,52 +285,50 @@ class SeekingWaterState(AnimalState):
 
     def drink(self, animal: "Animal"):
         animal.thirst -= animal.properties.thirst_decrease_rate
+        if tracer.enabled:
+            tracer.emit(TraceEvent.DRINK, animal, animal.thirst)
         if animal.thirst < 20:
             animal.change_state(IdleState())
 
     def find_nearest_water_source(
         self, animal: "Animal", environment_context: "EnvironmentContext"
     ):
-        perception_range = animal.perception_radius
-        current_pos = animal.position
-        nearest_water_pos = None
-        min_distance = float("inf")
-
-        for x in range(
-            max(0, current_pos.x - perception_range),
-            min(
-                environment_context.overworld.width,
-                current_pos.x + perception_range + 1,
-            ),
-        ):
-            for y in range(
-                max(0, current_pos.y - perception_range),
-                min(
-                    environment_context.overworld.height,
-                    current_pos.y + perception_range + 1,
-                ),
-            ):
-                # Check if the position (x, y) is within a circular area
-                if (x - current_pos.x) ** 2 + (
-                    y - current_pos.y
-                ) ** 2 <= perception_range**2:
-                    if (
-                        environment_context.biome_manager.get_biome_by_coords(x, y)
-                        is Biome.WATER
-                    ):
-                        distance = (
-                            (x - current_pos.x) ** 2 + (y - current_pos.y) ** 2
-                        ) ** 0.5
-                        if distance < min_distance:
-                            nearest_water_pos = Position(x, y)
-                            min_distance = distance
-
-        if nearest_water_pos is not None:
-            return nearest_water_pos
+        return environment_context.biome_manager.nearest(
+            animal.position, animal.perception_radius, Biome.WATER
+        )
 
 
 class SleepingState(AnimalState):
+    code = 6
+
     async def handle(self, animal: "Animal", environment_context: "EnvironmentContext"):
         animal.energy += animal.properties.energy_increase_rate
         if animal.energy >= 100:
-            animal.state = MovingState()
+            animal.change_state(MovingState())
+
+
+# The shared handler of every state, indexed by state code.
+STATES: List[AnimalState] = sorted(
+    (
+        DeadState(),
+        IdleState(),
+        ForagingState(),
+        MatingState(),
+        MovingState(),
+        SeekingWaterState(),
+        SleepingState(),
+    ),
+    key=lambda state: state.code,
+)
+
+idle_transitions = TransitionTable(
+    [
+        Transition((("health", le, 0),), DeadState(), "entity:dead"),
+        Transition((("energy", le, 10),), SleepingState()),
+        Transition((("thirst", ge, 50),), SeekingWaterState()),
+        Transition((("hunger", ge, 50),), ForagingState()),
+        Transition((("mating_urge", ge, 80), ("energy", gt, 50)), MatingState()),
+        Transition((("energy", lt, 50),), SleepingState()),
+        Transition((), MovingState()),
+    ]
+)
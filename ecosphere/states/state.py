@@ -1,9 +1,11 @@
-import random
-from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from abc import ABCMeta, abstractmethod
+from typing import TYPE_CHECKING, Callable, Optional
 
 from ecosphere.abc.position import Position
 from ecosphere.abc.state import State
+from ecosphere.common.rng import rng
+from ecosphere.common.singleton import SingletonMeta
+from ecosphere.common.trace import TraceEvent, tracer
 
 if TYPE_CHECKING:
     from ecosphere.common.environment_context import EnvironmentContext
@@ -11,9 +13,24 @@ if TYPE_CHECKING:
     from ecosphere.world.overworld import Overworld
 
 
-class AnimalState(State, ABC):
-    def __init__(self):
-        self.__fallback_direction = None
+class FlyweightMeta(SingletonMeta, ABCMeta):
+    """
+    Hand out a single instance per class, shared by everyone creating one.
+    """
+
+
+class AnimalState(State, metaclass=FlyweightMeta):
+    """
+    Behaviour of an animal in a state. States are flyweights: `IdleState()` always
+    returns the same object, shared by all the animals in that state, so changing
+    state allocates nothing. What an animal remembers while in a state (its goal and
+    wander direction) is kept on the animal and forgotten when its state changes.
+
+    Animals only store the code of their state, and find its handler in `STATES`.
+    """
+
+    code: int  # Numeric identifier of the state, stored by the animals in it
+    replan_after = 10  # Updates a goal is followed for before searching again
 
     @abstractmethod
     async def handle(
@@ -27,28 +44,46 @@ class AnimalState(State, ABC):
     def __str__(self):
         return self.__class__.__name__.replace("State", "")
 
+    def recall_goal(
+        self, animal: "Animal", is_valid: Callable[[Position], bool]
+    ) -> Optional[Position]:
+        """
+        Return the goal remembered by the animal, unless it failed the cheap check
+        or has been followed for `replan_after` updates, which calls for a new
+        search.
+        """
+        if animal.goal is None:
+            return None
+
+        animal.goal_age += 1
+        if animal.goal_age > self.replan_after or not is_valid(animal.goal):
+            animal.goal = None
+        return animal.goal
+
+    def remember_goal(self, animal: "Animal", goal: Optional[Position]):
+        animal.goal = goal
+        animal.goal_age = 0
+
     def decide_fallback_direction(self, animal: "Animal", overworld: "Overworld"):
-        if self.__fallback_direction is None:
+        if animal.fallback_direction is None:
             directions = [
                 Position(1, 0),
                 Position(-1, 0),
                 Position(0, 1),
                 Position(0, -1),
             ]
-            self.__fallback_direction = random.choice(directions)
+            animal.fallback_direction = rng.stream("states").choice(directions)
 
-        new_x = max(
-            0, min(animal.position.x + self.__fallback_direction.x, overworld.width - 1)
-        )
-        new_y = max(
-            0,
-            min(animal.position.y + self.__fallback_direction.y, overworld.height - 1),
-        )
+        direction = animal.fallback_direction
+        new_x = max(0, min(animal.position.x + direction.x, overworld.width - 1))
+        new_y = max(0, min(animal.position.y + direction.y, overworld.height - 1))
 
         # If we hit the edge of the map, change direction
         if new_y == overworld.height - 1 or new_y == 0:
-            self.__fallback_direction.y *= -1
+            direction.y *= -1
         if new_x == overworld.width - 1 or new_x == 0:
-            self.__fallback_direction.x *= -1
+            direction.x *= -1
 
+        if tracer.enabled:
+            tracer.emit(TraceEvent.WANDER, animal, new_x, new_y)
         return Position(new_x, new_y)
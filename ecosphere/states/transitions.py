@@ -0,0 +1,113 @@
+import operator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecosphere.common.event_bus import bus
+from ecosphere.states.state import AnimalState
+
+if TYPE_CHECKING:
+    from ecosphere.entities.animal import Animal
+
+NEEDS = ("health", "hunger", "thirst", "energy", "mating_urge")
+
+_needs_of = operator.attrgetter(*NEEDS)
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    A row of a transition table: the state to go to once all the conditions hold.
+
+    Attributes:
+        conditions: tuple of (need, comparison, threshold), e.g. ("energy", operator.le, 10)
+        state: AnimalState to change to
+        event: name of the bus event to emit with the animal, if any
+    """
+
+    conditions: Tuple[Tuple[str, Callable, float], ...]
+    state: AnimalState
+    event: Optional[str] = None
+
+
+class TransitionTable:
+    """
+    Transitions out of a state as a table of rules, the first one whose conditions
+    all hold being taken, instead of an if/elif chain run for every animal.
+
+    The state defers its animals with the needs they have at that moment, and
+    `flush` decides for all of them at once: every condition is a comparison over
+    the needs of all the animals, so deciding costs a few array operations per rule
+    whatever the number of animals.
+
+    Attributes:
+        rules: sequence of Transition tried in order
+    """
+
+    def __init__(self, rules: Sequence[Transition]):
+        self.rules = list(rules)
+
+        self._conditions = [
+            [
+                (NEEDS.index(need), compare, threshold)
+                for need, compare, threshold in rule.conditions
+            ]
+            for rule in self.rules
+        ]
+        self._animals: List[Tuple["Animal", int]] = []
+        self._needs: List[Tuple[float, ...]] = []
+        self._keys = set()
+
+    def __len__(self) -> int:
+        return len(self._animals)
+
+    def __contains__(self, animal: "Animal") -> bool:
+        return animal.key in self._keys
+
+    def defer(self, animal: "Animal"):
+        """
+        Queue the animal for the next `flush`, with its current needs.
+        """
+        self._animals.append((animal, animal.state_changes))
+        self._needs.append(_needs_of(animal))
+        self._keys.add(animal.key)
+
+    def decide(self, needs: np.ndarray) -> np.ndarray:
+        """
+        Return the index of the rule taken for every row of the (animals, NEEDS)
+        array, or -1 where no rule applies.
+        """
+        chosen = np.full(len(needs), -1)
+        undecided = np.ones(len(needs), dtype=bool)
+        for row, conditions in enumerate(self._conditions):
+            taken = undecided.copy()
+            for need, compare, threshold in conditions:
+                taken &= compare(needs[:, need], threshold)
+            chosen[taken] = row
+            undecided &= ~taken
+        return chosen
+
+    def flush(self):
+        """
+        Change the state of the deferred animals following the rules, unless their
+        state was changed since they were deferred, even to the same state (e.g. a
+        mate sending an idle animal back to idle): that later change wins, as it
+        would have if the animal had decided when it was deferred.
+        """
+        if not self._animals:
+            return
+
+        animals = self._animals
+        chosen = self.decide(np.array(self._needs, dtype=np.float64))
+        self._animals, self._needs = [], []
+        self._keys.clear()
+
+        for (animal, changes), row in zip(animals, chosen.tolist()):
+            if row < 0 or animal.state_changes != changes:
+                continue
+
+            transition = self.rules[row]
+            animal.change_state(transition.state)
+            if transition.event:
+                bus.emit(transition.event, animal)
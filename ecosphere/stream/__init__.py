@@ -0,0 +1,3 @@
+from .frames import FrameBuilder  # noqa: F401
+from .server import FrameServer  # noqa: F401
+from .shared import SharedWorld, SharedWorldReader, WorldState  # noqa: F401
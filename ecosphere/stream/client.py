@@ -0,0 +1,159 @@
+"""
+Thin viewer of a stream published with `--serve`.
+
+    python -m ecosphere.stream.client unix:/tmp/ecosphere.sock [--fps=5]
+    python -m ecosphere.stream.client tcp:8765 --record=world.stream
+    python -m ecosphere.stream.client --play=world.stream
+"""
+
+import os
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional
+
+import numpy as np
+
+from ecosphere.render import AnsiRenderer
+from ecosphere.stream.protocol import HELLO, KEYFRAME, Message, decode, read_messages
+
+
+class StreamView:
+    """
+    Apply stream messages to a local copy of the frame and draw the changed cells.
+
+    Attributes:
+        renderer: AnsiRenderer the frame is drawn with
+    """
+
+    def __init__(self, renderer: AnsiRenderer):
+        self.renderer = renderer
+
+        self.glyphs: List[str] = []
+        self.glyph: Optional[np.ndarray] = None
+        self.color: Optional[np.ndarray] = None
+
+    def apply(self, message: Message):
+        del self.glyphs[message.first_glyph :]
+        self.glyphs.extend(message.glyphs)
+
+        if message.kind == KEYFRAME:
+            self.glyph = message.glyph.copy()
+            self.color = message.color.copy()
+            cells = np.arange(message.height * message.width)
+        elif self.glyph is None:
+            return  # Joined a recording between keyframes
+        else:
+            cells = message.cells
+            self.glyph[cells] = message.glyph
+            self.color[cells] = message.color
+
+        rows, columns = self.renderer.size()
+        width = message.width
+        for cell, glyph, color in zip(
+            cells.tolist(), self.glyph[cells].tolist(), self.color[cells].tolist()
+        ):
+            y, x = divmod(cell, width)
+            if y < rows and x < columns:
+                self.renderer.draw(x, y, self.glyphs[glyph], color)
+
+        self.renderer.begin_frame()
+        self.renderer.flush()
+
+
+def _connect(address: str) -> socket.socket:
+    scheme, _, target = address.partition(":")
+    if scheme == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target)
+        return sock
+    if scheme == "tcp":
+        return socket.create_connection(("127.0.0.1", int(target)))
+    raise ValueError(f"Unknown stream address: {address}")
+
+
+def watch(
+    stream: BinaryIO, view: StreamView, record: Optional[BinaryIO], realtime: bool
+):
+    """
+    Draw every message of the stream, optionally saving the raw stream to a file.
+    When replaying, `realtime` sleeps between frames as long as they were apart.
+    """
+    first = start = None
+    for header, payload in read_messages(stream):
+        if record is not None:
+            record.write(header)
+            record.write(payload)
+
+        message = decode(header, payload)
+        if realtime:
+            if first is None:
+                first, start = message.time, time.monotonic()
+            delay = (message.time - first) - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        view.apply(message)
+
+
+@dataclass
+class ClientArgs:
+    address: Optional[str] = None
+    fps: float = 0.0
+    record: Optional[str] = None
+    play: Optional[str] = None
+
+
+def _get_args(argv: List[str]) -> ClientArgs:
+    args = ClientArgs()
+
+    for arg in argv[1:]:
+        if arg.startswith("--fps="):
+            args.fps = float(arg.split("=", 1)[1])
+        elif arg.startswith("--record="):
+            args.record = arg.split("=", 1)[1]
+        elif arg.startswith("--play="):
+            args.play = arg.split("=", 1)[1]
+        else:
+            args.address = arg
+
+    return args
+
+
+def main(argv: List[str]) -> int:
+    args = _get_args(argv)
+    if not args.address and not args.play:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    columns, rows = os.get_terminal_size()
+    renderer = AnsiRenderer(rows, columns)
+    view = StreamView(renderer)
+
+    # Clear the screen and hide the cursor.
+    os.write(1, b"\x1b[2J\x1b[?25l")
+    try:
+        if args.play:
+            with open(args.play, "rb") as stream:
+                watch(stream, view, None, realtime=True)
+            return 0
+
+        with _connect(args.address) as sock:
+            sock.sendall(HELLO.pack(args.fps))
+            with sock.makefile("rb") as stream:
+                if args.record:
+                    with open(args.record, "wb") as record:
+                        watch(stream, view, record, realtime=False)
+                else:
+                    watch(stream, view, None, realtime=False)
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        renderer.close()
+        os.write(1, b"\x1b[?25h\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+
+from ecosphere.stream.protocol import GLYPH_DTYPE
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class FrameBuilder:
+    """
+    Capture the viewport as arrays of glyph table indices and color pairs. The
+    system wraps them in a `Snapshot` for the `RenderThread` to draw on the screen,
+    and the frame server streams them to its clients.
+
+    Attributes:
+        overworld: Overworld object to capture
+    """
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+
+        self.glyphs: List[str] = [" "]
+        self._ids: Dict[str, int] = {" ": 0}
+
+        # Food glyphs only depend on the food kind and the biome.
+        self._food = np.array(
+            [[self._id(glyph) for glyph in row] for row in overworld.food._glyphs],
+            dtype=GLYPH_DTYPE,
+        )
+
+    def _id(self, glyph: str) -> int:
+        glyph_id = self._ids.get(glyph)
+        if glyph_id is None:
+            glyph_id = self._ids[glyph] = len(self.glyphs)
+            self.glyphs.append(glyph)
+        return glyph_id
+
+    def capture(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return arrays of the glyph and color pair of every cell in the viewport.
+        """
+        overworld = self.overworld
+        rect = x0, y0, x1, y1 = overworld.viewport.rect
+
+        color = overworld.biome.region(rect, "colors")
+        glyph = np.zeros(color.shape, dtype=GLYPH_DTYPE)
+
+        for x, y, char in overworld.vegetation.glyphs(rect):
+            glyph[y - y0, x - x0] = self._id(char)
+
+        kind = overworld.food.kind[y0:y1, x0:x1]
+        ys, xs = np.nonzero(kind)
+        biome_ids = overworld.biome.region(rect)
+        glyph[ys, xs] = self._food[kind[ys, xs], biome_ids[ys, xs]]
+
+        visible = overworld.entities.in_rect(*rect)
+        for dynamic in (False, True):
+            entities = [entity for entity in visible if entity.dynamic is dynamic]
+            if not entities:
+                continue
+            glyph[
+                [entity.position.y - y0 for entity in entities],
+                [entity.position.x - x0 for entity in entities],
+            ] = [self._id(entity.representation) for entity in entities]
+
+        return glyph, color
@@ -0,0 +1,160 @@
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+KEYFRAME = 1
+DELTA = 2
+
+# kind, frame number, simulation time in seconds, payload length
+HEADER = struct.Struct("<BIdI")
+# frames per second requested by the client, sent once after connecting
+HELLO = struct.Struct("<f")
+# height, width, index of the first new glyph, number of new glyphs
+FRAME = struct.Struct("<HHII")
+
+GLYPH_DTYPE = np.uint16
+COLOR_DTYPE = np.int8
+INDEX_DTYPE = np.uint32
+
+
+@dataclass
+class Message:
+    """
+    Decoded frame of the stream.
+
+    Attributes:
+        kind: KEYFRAME, or DELTA for the changes since the previous frame
+        frame: int representing the frame number
+        time: float representing the time the frame was captured at
+        height: int representing the height of the frame
+        width: int representing the width of the frame
+        first_glyph: index in the glyph table of the first glyph in `glyphs`
+        glyphs: glyphs added to the glyph table
+        cells: flat indices of the cells carried by the message, None for all cells
+        glyph: glyph table indices of the cells
+        color: color pairs of the cells
+    """
+
+    kind: int
+    frame: int
+    time: float
+    height: int
+    width: int
+    first_glyph: int
+    glyphs: List[str]
+    cells: Optional[np.ndarray]
+    glyph: np.ndarray
+    color: np.ndarray
+
+
+def _encode(
+    kind: int,
+    frame: int,
+    time: float,
+    shape: Tuple[int, int],
+    first_glyph: int,
+    glyphs: List[str],
+    arrays: List[np.ndarray],
+) -> bytes:
+    names = "\n".join(glyphs).encode()
+    body = [FRAME.pack(*shape, first_glyph, len(glyphs)), struct.pack("<I", len(names))]
+    body.append(names)
+    body.extend(array.tobytes() for array in arrays)
+
+    payload = zlib.compress(b"".join(body), 1)
+    return HEADER.pack(kind, frame, time, len(payload)) + payload
+
+
+def encode_keyframe(
+    frame: int, time: float, glyph: np.ndarray, color: np.ndarray, glyphs: List[str]
+) -> bytes:
+    """
+    Encode the whole frame with the complete glyph table.
+    """
+    return _encode(
+        KEYFRAME,
+        frame,
+        time,
+        glyph.shape,
+        0,
+        glyphs,
+        [glyph.astype(GLYPH_DTYPE, copy=False), color.astype(COLOR_DTYPE, copy=False)],
+    )
+
+
+def encode_delta(
+    frame: int,
+    time: float,
+    shape: Tuple[int, int],
+    cells: np.ndarray,
+    glyph: np.ndarray,
+    color: np.ndarray,
+    first_glyph: int,
+    glyphs: List[str],
+) -> bytes:
+    """
+    Encode the given cells of the frame along with the glyphs added since the
+    previous message.
+    """
+    return _encode(
+        DELTA,
+        frame,
+        time,
+        shape,
+        first_glyph,
+        glyphs,
+        [
+            np.uint32(len(cells)).reshape(1),
+            cells.astype(INDEX_DTYPE, copy=False),
+            glyph.astype(GLYPH_DTYPE, copy=False),
+            color.astype(COLOR_DTYPE, copy=False),
+        ],
+    )
+
+
+def decode(header: bytes, payload: bytes) -> Message:
+    kind, frame, time, _ = HEADER.unpack(header)
+    body = zlib.decompress(payload)
+
+    height, width, first_glyph, count = FRAME.unpack_from(body)
+    offset = FRAME.size
+    (length,) = struct.unpack_from("<I", body, offset)
+    offset += 4
+    glyphs = body[offset : offset + length].decode().split("\n") if count else []
+    offset += length
+
+    def take(dtype, size: int) -> np.ndarray:
+        nonlocal offset
+        array = np.frombuffer(body, dtype=dtype, count=size, offset=offset)
+        offset += array.nbytes
+        return array
+
+    cells = None
+    size = height * width
+    if kind == DELTA:
+        (size,) = take(INDEX_DTYPE, 1).tolist()
+        cells = take(INDEX_DTYPE, size)
+
+    glyph = take(GLYPH_DTYPE, size)
+    color = take(COLOR_DTYPE, size)
+    return Message(
+        kind, frame, time, height, width, first_glyph, glyphs, cells, glyph, color
+    )
+
+
+def read_messages(stream: BinaryIO) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Yield the raw (header, payload) of every message until the stream ends.
+    """
+    while True:
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        length = HEADER.unpack(header)[3]
+        payload = stream.read(length)
+        if len(payload) < length:
+            return
+        yield header, payload
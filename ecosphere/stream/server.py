@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+from ecosphere.config import STREAM_BACKLOG, STREAM_FPS
+from ecosphere.stream.frames import FrameBuilder
+from ecosphere.stream.protocol import HELLO, encode_delta, encode_keyframe
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter, interval: float):
+        self.writer = writer
+        self.interval = interval
+        self.due = 0.0
+
+        # Last frame sent, None until the first keyframe.
+        self.glyph: Optional[np.ndarray] = None
+        self.color: Optional[np.ndarray] = None
+        self.glyphs_sent = 0
+        self.stale = False
+
+    @property
+    def backlog(self) -> int:
+        return self.writer.transport.get_write_buffer_size()
+
+
+class FrameServer:
+    """
+    Publish the overworld to viewers over a Unix socket or localhost TCP.
+
+    Frames are captured at most `fps` times per second, and only while someone is
+    connected. Every client gets a keyframe first and then the cells that changed
+    since the last frame it was sent, at the rate it asked for. Writes never wait
+    for a client: one with more than `STREAM_BACKLOG` unsent bytes is skipped,
+    and gets a keyframe once it has caught up.
+
+    Attributes:
+        overworld: Overworld object to publish
+        address: "unix:PATH" or "tcp:PORT"
+        fps: highest frame rate sent to clients
+    """
+
+    def __init__(self, overworld: "Overworld", address: str, fps: int = STREAM_FPS):
+        self.overworld = overworld
+        self.address = address
+        self.fps = fps
+
+        self.builder = FrameBuilder(overworld)
+        self.frame = 0
+
+        self._clients: List[_Client] = []
+        self._start = time.monotonic()
+
+    async def _start_server(self) -> asyncio.AbstractServer:
+        scheme, _, target = self.address.partition(":")
+        if scheme == "unix":
+            return await asyncio.start_unix_server(self._connected, path=target)
+        if scheme == "tcp":
+            return await asyncio.start_server(self._connected, "127.0.0.1", int(target))
+        raise ValueError(f"Unknown stream address: {self.address}")
+
+    async def serve(self):
+        server = await self._start_server()
+        logging.info("Streaming frames on %s.", self.address)
+
+        async with server:
+            while True:
+                await asyncio.sleep(1 / self.fps)
+                if self._clients:
+                    self.publish()
+
+    async def _connected(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            (fps,) = HELLO.unpack(await reader.readexactly(HELLO.size))
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+
+        fps = min(fps, self.fps) if fps > 0 else self.fps
+        client = _Client(writer, 1 / fps)
+        self._clients.append(client)
+        logging.info("Stream client connected at %g fps.", fps)
+
+        try:
+            # Clients send nothing else, this returns when they disconnect.
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.remove(client)
+            writer.close()
+            logging.info("Stream client disconnected.")
+
+    def publish(self):
+        """
+        Capture a frame and send it to every client that is due one.
+        """
+        now = time.monotonic()
+        due = [client for client in self._clients if client.due <= now]
+        if not due:
+            return
+
+        glyph, color = self.builder.capture()
+        self.frame += 1
+
+        for client in due:
+            if client.writer.is_closing():
+                continue
+            if client.backlog > STREAM_BACKLOG:
+                client.stale = True
+                continue
+
+            client.writer.write(self._encode(client, glyph, color, now))
+            client.glyph, client.color = glyph, color
+            client.glyphs_sent = len(self.builder.glyphs)
+            client.stale = False
+            client.due = now + client.interval
+
+    def _encode(
+        self, client: _Client, glyph: np.ndarray, color: np.ndarray, now: float
+    ) -> bytes:
+        elapsed = now - self._start
+        glyphs = self.builder.glyphs
+
+        if client.glyph is None or client.stale or client.glyph.shape != glyph.shape:
+            return encode_keyframe(self.frame, elapsed, glyph, color, glyphs)
+
+        cells = np.flatnonzero((glyph != client.glyph) | (color != client.color))
+        # Past a quarter of the screen a keyframe is about as small.
+        if len(cells) > glyph.size // 4:
+            return encode_keyframe(self.frame, elapsed, glyph, color, glyphs)
+
+        return encode_delta(
+            self.frame,
+            elapsed,
+            glyph.shape,
+            cells,
+            glyph.ravel()[cells],
+            color.ravel()[cells],
+            client.glyphs_sent,
+            glyphs[client.glyphs_sent :],
+        )
@@ -0,0 +1,389 @@
+import asyncio
+import json
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ecosphere.config import SHARED_INTERVAL, SPECIES
+from ecosphere.states import AnimalState
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+MAGIC = b"ECOWORLD"
+
+# magic, sequence, tick, width, height, animals, capacity, generation, metadata length
+HEADER = struct.Struct("<8sQQIIIIII")
+HEADER_SIZE = 1 << 16  # bytes of the header block, metadata included
+SEQUENCE_OFFSET = 8
+
+# Columns of the animal table, each stored contiguously for `capacity` rows.
+COLUMNS: List[Tuple[str, type]] = [
+    ("key", np.int64),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("health", np.float32),
+    ("hunger", np.float32),
+    ("thirst", np.float32),
+    ("energy", np.float32),
+    ("mating_urge", np.float32),
+    ("species", np.uint8),
+    ("state", np.uint8),
+]
+NEEDS = ("health", "hunger", "thirst", "energy", "mating_urge")
+
+
+def _column_offsets(capacity: int) -> Tuple[Dict[str, int], int]:
+    offsets, size = {}, 0
+    for name, dtype in COLUMNS:
+        offsets[name] = size
+        size += -(-capacity * np.dtype(dtype).itemsize // 8) * 8
+    return offsets, max(size, 8)
+
+
+def _columns(buffer, capacity: int) -> Dict[str, np.ndarray]:
+    offsets, _ = _column_offsets(capacity)
+    return {
+        name: np.ndarray((capacity,), dtype=dtype, buffer=buffer, offset=offsets[name])
+        for name, dtype in COLUMNS
+    }
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Map an existing block without the resource tracker unlinking it when this
+    process exits, as it belongs to the simulation.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # Left behind by a simulation that did not shut down cleanly.
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+class SharedWorld:
+    """
+    Publish the live world into shared memory blocks, for analysis tools running in
+    other processes to map with `SharedWorldReader`.
+
+    The blocks are named after `name`: `NAME` holds the header and a JSON metadata
+    record (species and state names), `NAME_biome` the biome id of every cell,
+    `NAME_occupancy` the number of entities on every cell, and `NAME_animals_GEN`
+    the live animals as a columnar table of `COLUMNS`. The table is allocated again,
+    twice as large, under the next generation number once the animals outgrow it.
+
+    Updates happen between clock ticks, at most every `SHARED_INTERVAL` seconds,
+    under a seqlock: the sequence number in the header is odd while the blocks are
+    written and increases again once they are consistent, so readers retry when
+    it changed under them.
+
+    Attributes:
+        overworld: Overworld object to publish
+        name: str prefix of the shared memory block names
+        interval: float representing the least seconds between updates
+    """
+
+    def __init__(
+        self,
+        overworld: "Overworld",
+        name: str = "ecosphere",
+        interval: float = SHARED_INTERVAL,
+    ):
+        self.overworld = overworld
+        self.name = name
+        self.interval = interval
+
+        self.species = list(SPECIES.animals)
+        self._species_codes = {species: i for i, species in enumerate(self.species)}
+        states = {state.code: state.__name__ for state in AnimalState.__subclasses__()}
+
+        self._metadata = json.dumps(
+            {
+                "species": [species.__name__ for species in self.species],
+                "states": {str(code): name for code, name in sorted(states.items())},
+                "columns": [[column, np.dtype(dtype).str] for column, dtype in COLUMNS],
+            }
+        ).encode()
+
+        self.sequence = 0
+        self.generation = 0
+        self.capacity = 0
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._animals: Optional[shared_memory.SharedMemory] = None
+        self._last_tick: Optional[int] = None
+
+    def open(self):
+        """
+        Create the blocks and write the biome map, which never changes.
+        """
+        overworld = self.overworld
+        height, width = overworld.height, overworld.width
+
+        self._header = _create(self.name, HEADER_SIZE)
+        self._biome = _create(f"{self.name}_biome", height * width)
+        self._occupancy = _create(f"{self.name}_occupancy", height * width)
+        self._blocks = [self._header, self._biome, self._occupancy]
+
+        biome = np.ndarray((height, width), dtype=np.uint8, buffer=self._biome.buf)
+        biome[:] = overworld.biome.region((0, 0, width, height))
+        self.occupancy = np.ndarray(
+            (height, width), dtype=np.uint8, buffer=self._occupancy.buf
+        )
+        self._grow(max(1024, len(overworld.entities.dynamic)))
+
+        self._header.buf[HEADER.size : HEADER.size + len(self._metadata)] = (
+            self._metadata
+        )
+        self.publish()
+        logging.info("Sharing the world in shared memory blocks named %s.", self.name)
+
+    def _grow(self, capacity: int):
+        if self._animals is not None:
+            self.columns = None
+            self._animals.close()
+            self._animals.unlink()
+
+        self.generation += 1
+        self.capacity = capacity
+        _, size = _column_offsets(capacity)
+        self._animals = _create(f"{self.name}_animals_{self.generation}", size)
+        self.columns = _columns(self._animals.buf, capacity)
+
+    def _write_header(self, count: int):
+        overworld = self.overworld
+        HEADER.pack_into(
+            self._header.buf,
+            0,
+            MAGIC,
+            self.sequence,
+            overworld.clock.tick,
+            overworld.width,
+            overworld.height,
+            count,
+            self.capacity,
+            self.generation,
+            len(self._metadata),
+        )
+
+    def _set_sequence(self, sequence: int):
+        self.sequence = sequence
+        struct.pack_into("<Q", self._header.buf, SEQUENCE_OFFSET, sequence)
+
+    def publish(self):
+        """
+        Write the occupancy and the animal table under the seqlock.
+        """
+        overworld = self.overworld
+        animals = [
+            animal for animal in overworld.entities.dynamic if animal.state_code != 0
+        ]
+        count = len(animals)
+
+        rows = [
+            (
+                animal.key,
+                animal.position.x,
+                animal.position.y,
+                *(getattr(animal, need) for need in NEEDS),
+                self._species_codes.get(type(animal), 255),
+                animal.state_code,
+            )
+            for animal in animals
+        ]
+
+        self._set_sequence(self.sequence + 1)
+        if count > self.capacity:
+            self._grow(max(count, 2 * self.capacity))
+
+        self.occupancy[:] = np.minimum(overworld.entities.occupancy, 255)
+        if rows:
+            for (name, _), values in zip(COLUMNS, zip(*rows)):
+                self.columns[name][:count] = values
+
+        self._write_header(count)
+        self._set_sequence(self.sequence + 1)
+        self._last_tick = overworld.clock.tick
+
+    async def serve(self):
+        """
+        Keep the blocks up to date until cancelled, then remove them.
+        """
+        try:
+            self.open()
+            while True:
+                await asyncio.sleep(self.interval)
+                if self.overworld.clock.tick != self._last_tick:
+                    self.publish()
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Unmap and remove the blocks. Readers mapping them keep their view.
+        """
+        self.columns = None
+        self.occupancy = None
+        blocks = self._blocks + ([self._animals] if self._animals else [])
+        for block in blocks:
+            block.close()
+            block.unlink()
+        self._blocks, self._animals = [], None
+
+
+@dataclass
+class WorldState:
+    """
+    Consistent copy of the shared world.
+
+    Attributes:
+        sequence: int representing the seqlock sequence number of the copy
+        tick: int representing the simulation tick of the copy
+        biome: (height, width) array of biome ids
+        occupancy: (height, width) array of the number of entities on every cell
+        animals: dict of the animal table columns, one array per column
+        species: list of species names, indexed by the species column
+        states: dict of state names by the state column codes
+    """
+
+    sequence: int
+    tick: int
+    biome: np.ndarray
+    occupancy: np.ndarray
+    animals: Dict[str, np.ndarray]
+    species: List[str]
+    states: Dict[int, str]
+
+
+class SharedWorldReader:
+    """
+    Map the blocks published by `SharedWorld` from another process.
+
+    The `biome`, `occupancy` and `animals` attributes are views of the shared
+    memory itself, without copies, which may change while they are read;
+    `snapshot` copies them under the seqlock for a consistent state.
+
+        with SharedWorldReader("ecosphere") as world:
+            state = world.snapshot()
+            foxes = state.animals["species"] == state.species.index("Fox")
+
+    Attributes:
+        name: str prefix of the shared memory block names
+    """
+
+    def __init__(self, name: str = "ecosphere"):
+        self.name = name
+
+        self._header = _attach(name)
+        magic, _, _, width, height, _, _, _, length = HEADER.unpack_from(
+            self._header.buf
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{name} is not a shared EcoSphere world")
+
+        metadata = json.loads(
+            bytes(self._header.buf[HEADER.size : HEADER.size + length])
+        )
+        self.species: List[str] = metadata["species"]
+        self.states = {int(code): state for code, state in metadata["states"].items()}
+        self.width, self.height = width, height
+
+        self._biome = _attach(f"{name}_biome")
+        self._occupancy = _attach(f"{name}_occupancy")
+        self.biome = np.ndarray((height, width), dtype=np.uint8, buffer=self._biome.buf)
+        self.occupancy = np.ndarray(
+            (height, width), dtype=np.uint8, buffer=self._occupancy.buf
+        )
+
+        self.generation = 0
+        self._animals: Optional[shared_memory.SharedMemory] = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __enter__(self) -> "SharedWorldReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_header(self) -> Tuple[int, int, int, int, int]:
+        _, sequence, tick, _, _, count, capacity, generation, _ = HEADER.unpack_from(
+            self._header.buf
+        )
+        return sequence, tick, count, capacity, generation
+
+    @property
+    def sequence(self) -> int:
+        return struct.unpack_from("<Q", self._header.buf, SEQUENCE_OFFSET)[0]
+
+    @property
+    def animals(self) -> Dict[str, np.ndarray]:
+        """
+        Return views of the live rows of the animal table, by column.
+        """
+        _, _, count, capacity, generation = self._read_header()
+        if generation != self.generation:
+            self._remap(capacity, generation)
+        return {name: column[:count] for name, column in self._columns.items()}
+
+    def _remap(self, capacity: int, generation: int):
+        self._columns = {}
+        if self._animals is not None:
+            self._animals.close()
+        self._animals = _attach(f"{self.name}_animals_{generation}")
+        self._columns = _columns(self._animals.buf, capacity)
+        self.generation = generation
+
+    def snapshot(self, timeout: float = 1.0) -> WorldState:
+        """
+        Copy the shared world once no update happened during the copy.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence = self.sequence
+            if sequence % 2 == 0:
+                try:
+                    _, tick, _, _, _ = self._read_header()
+                    animals = {
+                        name: column.copy() for name, column in self.animals.items()
+                    }
+                    biome, occupancy = self.biome.copy(), self.occupancy.copy()
+                except FileNotFoundError:
+                    # The table was replaced by a larger one during the copy.
+                    animals = None
+                if animals is not None and self.sequence == sequence:
+                    return WorldState(
+                        sequence,
+                        tick,
+                        biome,
+                        occupancy,
+                        animals,
+                        self.species,
+                        self.states,
+                    )
+
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{self.name} kept changing for {timeout} s")
+            time.sleep(0.001)
+
+    def close(self):
+        self._columns = {}
+        self.biome = self.occupancy = None
+        for block in (self._header, self._biome, self._occupancy, self._animals):
+            if block is not None:
+                block.close()
@@ -1,2 +1,3 @@
+from .stress import StressHarness  # noqa: F401
 from .system import System  # noqa: F401
 from .systeminfo import SystemInfo  # noqa: F401
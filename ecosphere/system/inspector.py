@@ -0,0 +1,107 @@
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from ecosphere.abc.entity import Entity
+from ecosphere.abc.position import Position
+from ecosphere.entities.food import Food
+from ecosphere.render.glyphs import glyph_width
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class Inspector:
+    """
+    Info window about the entity under the mouse pointer.
+
+    The window is laid over every frame at a fixed place, so its values stay up to
+    date. Its text is taken with the frame snapshot, and the render thread draws the
+    cells it covered again once it closes.
+
+    Attributes:
+        overworld: Overworld object the entities are looked up in
+    """
+
+    x = 1
+    y = 1
+    width = 50
+    height = 11
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+        self.entity: Optional[Entity] = None
+
+    def hover(self, x: int, y: int):
+        """
+        Show the entity under the given screen cell, or close the window.
+        """
+        position = self.overworld.viewport.to_world(Position(x, y))
+        entity = None
+        if position is not None:
+            entity = self.overworld.get_entity_at_position(position)
+            for food_x in (position.x, position.x - 1):
+                if entity is None:
+                    entity = self.overworld.get_food_at_position(
+                        Position(food_x, position.y)
+                    )
+
+        if entity is None:
+            self.close()
+        else:
+            self.entity = entity
+
+    def close(self):
+        if self.entity is None:
+            return
+
+        self.entity = None
+
+    def _is_gone(self) -> bool:
+        entity = self.entity
+        if isinstance(entity, Food):
+            food = self.overworld.food
+            return not food.kind[entity.position.y, entity.position.x]
+        return entity not in self.overworld.entities
+
+    def _lines(self) -> List[str]:
+        entity = self.entity
+        biome = self.overworld.biome.get_biome_by_coords(
+            entity.position.x, entity.position.y
+        )
+
+        def status(name: str) -> str:
+            value = getattr(entity, name, "N/A")
+            return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+        state = getattr(entity, "state", None)
+        return [
+            f"Entity Type: {type(entity).__name__} {entity.get_representation(biome)}",
+            f"ID: {entity.id}",
+            f"Position: ({entity.position.x}, {entity.position.y})",
+            f"State: {type(state).__name__ if state else 'N/A'}",
+            f"Health: {status('health')}",
+            f"Hunger: {status('hunger')}",
+            f"Thirst: {status('thirst')}",
+            f"Energy: {status('energy')}",
+            f"Mating Urge: {status('mating_urge')}",
+        ]
+
+    def overlay(self) -> Optional[Tuple[int, int, List[str]]]:
+        """
+        Return the (x, y, lines) of the window laid over the frame, with the current
+        values, or None once it is closed.
+        """
+        if self.entity is None:
+            return None
+        if self._is_gone():
+            self.close()
+            return None
+
+        inner = self.width - 2
+        lines = self._lines()
+        window = ["┌" + "─" * inner + "┐"]
+        for row in range(1, self.height - 1):
+            line = lines[row - 1][:inner] if row <= len(lines) else ""
+            padding = " " * max(0, inner - glyph_width(line))
+            window.append(f"│{line}{padding}│")
+        window.append("└" + "─" * inner + "┘")
+        return self.x, self.y, window
@@ -0,0 +1,378 @@
+import asyncio
+import csv
+import logging
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ecosphere.common.rng import rng
+from ecosphere.config import (
+    STRESS_DENSITIES,
+    STRESS_SIZES,
+    STRESS_TICKS,
+    TICKS_PER_MINUTE,
+)
+from ecosphere.render import NullRenderer
+from ecosphere.states import idle_transitions
+from ecosphere.world.clock import SimulationClock
+from ecosphere.world.overworld import Overworld
+from ecosphere.world.populator import Populator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Phases of a tick, timed separately. "entities" is the update of the animals
+# themselves, without the phases run from within `Overworld.update_entities`.
+PHASES = ("entities", "transitions", "movement", "matchmaking", "scent", "world")
+
+
+@dataclass(frozen=True)
+class StressPoint:
+    """
+    A synthetic world to measure.
+
+    Attributes:
+        width: int representing the width of the overworld
+        height: int representing the height of the overworld
+        density: float representing the animals per cell
+    """
+
+    width: int
+    height: int
+    density: float
+
+    @property
+    def cells(self) -> int:
+        return self.width * self.height
+
+    @property
+    def animals(self) -> int:
+        return round(self.cells * self.density)
+
+
+@dataclass
+class StressResult:
+    """
+    Measurements of a stress point.
+
+    Attributes:
+        point: StressPoint measured
+        ticks: int representing the clock ticks run
+        animals: int representing the live animals when the ticks started
+        entities: int representing all the entities when the ticks started
+        seconds: float representing the wall time of the ticks
+        phases: dict of the mean seconds per tick spent in every phase of PHASES
+        peak_rss: int representing the peak resident memory in bytes, if known
+        world_bytes: int representing the bytes allocated to build the world
+        tick_bytes: int representing the peak bytes allocated during a tick
+        blocks: int representing the memory blocks the world is made of
+    """
+
+    point: StressPoint
+    ticks: int
+    animals: int
+    entities: int
+    seconds: float
+    phases: Dict[str, float]
+    peak_rss: Optional[int]
+    world_bytes: int
+    tick_bytes: int
+    blocks: int
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.seconds if self.seconds else float("inf")
+
+    def row(self) -> Dict[str, Any]:
+        """
+        Return the result as a flat CSV row.
+        """
+        point = self.point
+        return {
+            "width": point.width,
+            "height": point.height,
+            "cells": point.cells,
+            "density": point.density,
+            "animals": self.animals,
+            "entities": self.entities,
+            "ticks": self.ticks,
+            "ticks_per_s": round(self.ticks_per_second, 3),
+            **{
+                f"{phase}_ms": round(seconds * 1000, 4)
+                for phase, seconds in self.phases.items()
+            },
+            "peak_rss_mb": (
+                round(self.peak_rss / 2**20, 2) if self.peak_rss is not None else ""
+            ),
+            "world_mb": round(self.world_bytes / 2**20, 2),
+            "tick_alloc_kb": round(self.tick_bytes / 2**10, 1),
+            "blocks": self.blocks,
+        }
+
+
+class PhaseTimer:
+    """
+    Time the phases of a tick by wrapping the methods running them, so the
+    simulation itself carries no timing code.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self._wrapped: List[Tuple[Any, str]] = []
+
+    def wrap(self, owner: Any, method: str, phase: str):
+        func = getattr(owner, method)
+        seconds = self.seconds
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[phase] += time.perf_counter() - start
+
+        setattr(owner, method, timed)
+        self._wrapped.append((owner, method))
+
+    def restore(self):
+        for owner, method in self._wrapped:
+            delattr(owner, method)
+        self._wrapped = []
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _build(
+    point: StressPoint,
+    scent: bool,
+    vegetation: bool,
+    lod_rect: Optional[Tuple[int, int, int, int]] = None,
+) -> Overworld:
+    overworld = Overworld(
+        None,
+        point.width,
+        point.height,
+        NullRenderer(point.height, point.width),
+        lod=lod_rect is not None,
+        lod_focus=lod_rect,
+        clock=SimulationClock(speed=None),
+        vegetation=vegetation,
+        scent=scent,
+        # Trimming the world would skew the time and memory measured.
+        memory_budget=sys.maxsize,
+    )
+    overworld.spawn_entities()
+    missing = point.animals - len(overworld.entities.dynamic)
+    if missing > 0:
+        overworld.entities.extend(Populator(overworld).scatter(missing))
+    return overworld
+
+
+async def _run_ticks(overworld: Overworld, ticks: int, timer: PhaseTimer):
+    clock = overworld.clock
+    for _ in range(ticks):
+        tick = await clock.wait()
+        if tick % TICKS_PER_MINUTE == 0:
+            start = time.perf_counter()
+            overworld.update_world(tick // TICKS_PER_MINUTE)
+            timer.seconds["world"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        await overworld.update_entities()
+        timer.seconds["entities"] += time.perf_counter() - start
+
+
+def run_point(
+    point: StressPoint,
+    ticks: int = STRESS_TICKS,
+    seed: Optional[int] = None,
+    scent: bool = False,
+    vegetation: bool = False,
+    lod_rect: Optional[Tuple[int, int, int, int]] = None,
+) -> StressResult:
+    """
+    Build the synthetic world of the point and run it for the given ticks.
+
+    The world is built and run for one tick with allocations traced, for its size
+    and what a tick allocates, then run untraced for the timed ticks. The overworld
+    is a singleton, so every point has to run in a process of its own. With a
+    `lod_rect`, only that rect is simulated in full detail.
+    """
+    rng.seed(seed)
+
+    tracemalloc.start()
+    overworld = _build(point, scent, vegetation, lod_rect)
+    world_bytes, _ = tracemalloc.get_traced_memory()
+    blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+
+    tracemalloc.reset_peak()
+    asyncio.run(_run_ticks(overworld, 1, PhaseTimer()))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    animals = len(overworld.entities.dynamic)
+    entities = len(overworld.entities)
+
+    timer = PhaseTimer()
+    timer.wrap(overworld.matchmaker, "match", "matchmaking")
+    timer.wrap(overworld.scent, "update", "scent")
+    timer.wrap(overworld.movement, "resolve", "movement")
+    timer.wrap(idle_transitions, "flush", "transitions")
+
+    start = time.perf_counter()
+    asyncio.run(_run_ticks(overworld, ticks, timer))
+    seconds = time.perf_counter() - start
+    timer.restore()
+
+    phases = timer.seconds
+    phases["entities"] -= sum(
+        phases[phase] for phase in ("transitions", "movement", "matchmaking", "scent")
+    )
+    return StressResult(
+        point,
+        ticks,
+        animals,
+        entities,
+        seconds,
+        {phase: seconds / ticks for phase, seconds in phases.items()},
+        _peak_rss(),
+        world_bytes,
+        max(0, peak - world_bytes),
+        blocks,
+    )
+
+
+def scaling_exponents(results: Sequence[StressResult]) -> Dict[str, float]:
+    """
+    Return the exponent k of time per tick ~ animals^k for every phase and the
+    whole tick, and of the world memory ~ entities^k, fitted over the results in
+    log-log space. Phases measured at fewer than two points are left out.
+    """
+
+    def fit(x: List[float], y: List[float]) -> Optional[float]:
+        keep = [(a, b) for a, b in zip(x, y) if a > 0 and b > 0]
+        if len({a for a, _ in keep}) < 2:
+            return None
+        xs, ys = np.log([a for a, _ in keep]), np.log([b for _, b in keep])
+        return float(np.polyfit(xs, ys, 1)[0])
+
+    animals = [result.animals for result in results]
+    series = {phase: [result.phases[phase] for result in results] for phase in PHASES}
+    series["tick"] = [1 / result.ticks_per_second for result in results]
+
+    exponents = {name: fit(animals, values) for name, values in series.items()}
+    exponents["memory"] = fit(
+        [result.entities for result in results],
+        [result.world_bytes for result in results],
+    )
+    return {name: k for name, k in exponents.items() if k is not None}
+
+
+class StressHarness:
+    """
+    Measure how the simulation scales: build synthetic worlds of every size and
+    density, without a terminal, and record the tick rate, the time of every phase
+    of a tick, peak memory and allocations at each of them.
+
+    Every point runs in a fresh process, as the overworld is a singleton and peak
+    resident memory only ever grows within a process.
+
+    Attributes:
+        sizes: sequence of (width, height) of the worlds
+        densities: sequence of animals per cell
+        ticks: int representing the clock ticks run at every point
+        seed: int seeding every point alike, if any
+        scent: bool telling whether the scent fields are enabled
+        vegetation: bool telling whether the vegetation layer is enabled
+        lod_rect: (x0, y0, x1, y1) rect simulated in full detail, the rest of the
+            world in less, if any
+    """
+
+    def __init__(
+        self,
+        sizes: Optional[Sequence[Tuple[int, int]]] = None,
+        densities: Optional[Sequence[float]] = None,
+        ticks: int = STRESS_TICKS,
+        seed: Optional[int] = None,
+        scent: bool = False,
+        vegetation: bool = False,
+        lod_rect: Optional[Tuple[int, int, int, int]] = None,
+    ):
+        self.sizes = list(sizes or STRESS_SIZES)
+        self.densities = list(densities or STRESS_DENSITIES)
+        self.ticks = ticks
+        self.seed = seed
+        self.scent = scent
+        self.vegetation = vegetation
+        self.lod_rect = lod_rect
+
+    @property
+    def points(self) -> List[StressPoint]:
+        points = [
+            StressPoint(width, height, density)
+            for width, height in self.sizes
+            for density in self.densities
+        ]
+        return sorted(points, key=lambda point: (point.animals, point.cells))
+
+    def run(self) -> Iterator[StressResult]:
+        context = get_context("spawn")
+        for point in self.points:
+            logging.info("Stress point %s: %d animals", point, point.animals)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                yield pool.submit(
+                    run_point,
+                    point,
+                    self.ticks,
+                    self.seed,
+                    self.scent,
+                    self.vegetation,
+                    self.lod_rect,
+                ).result()
+
+
+def write_csv(path: str, results: Sequence[StressResult]):
+    rows = [result.row() for result in results]
+    if not rows:
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_row(result: StressResult) -> str:
+    point = result.point
+    rss = (
+        f"{result.peak_rss / 2**20:8.1f}" if result.peak_rss is not None else "       -"
+    )
+    phases = " ".join(f"{result.phases[phase] * 1000:11.3f}" for phase in PHASES)
+    return (
+        f"{point.width:>5}x{point.height:<5} {point.density:7.3f} {result.animals:8d}"
+        f" {result.ticks_per_second:9.1f} {phases} {rss}"
+        f" {result.world_bytes / 2**20:8.1f} {result.tick_bytes / 2**10:9.1f}"
+    )
+
+
+def format_header() -> str:
+    phases = " ".join(f"{phase + ' ms':>11}" for phase in PHASES)
+    return (
+        f"{'world':<11} {'density':>7} {'animals':>8} {'ticks/s':>9} {phases}"
+        f" {'rss MB':>8} {'world MB':>8} {'tick KB':>9}"
+    )
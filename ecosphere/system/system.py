@@ -2,144 +2,220 @@ import asyncio
 import curses
 import logging
 import traceback
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from ecosphere.abc.position import Position
 from ecosphere.common.event_bus import bus
 from ecosphere.common.singleton import SingletonMeta
-from ecosphere.config import MINUTE_LENGTH, REFRESH_STATIC_AFTER
+from ecosphere.common.trace import tracer
+from ecosphere.config import (
+    FAST_FRAME_INTERVAL,
+    FAST_SPEED,
+    FRAME_INTERVAL,
+    PAN_STEP,
+)
+from ecosphere.render import RenderThread, Snapshot
+from ecosphere.stream.frames import FrameBuilder
+from ecosphere.system.inspector import Inspector
 from ecosphere.world.overworld import Overworld
 
 if TYPE_CHECKING:
     from ecosphere.abc.entity import Entity
+    from ecosphere.stream import FrameServer, SharedWorld
     from ecosphere.system import SystemInfo
 
+# xterm mouse tracking of every pointer motion, not only of button presses.
+MOUSE_MOTION_ON = "\033[?1003h"
+MOUSE_MOTION_OFF = "\033[?1003l"
 
-class System(metaclass=SingletonMeta):
-    def __init__(self, overworld: Overworld, system_info: "SystemInfo" = None):
-        self.overworld = overworld
-        self.system_info = system_info
-
-        self.info_win = None
-
-        self._running = True
+PAN_KEYS = {
+    curses.KEY_LEFT: (-1, 0),
+    curses.KEY_RIGHT: (1, 0),
+    curses.KEY_UP: (0, -1),
+    curses.KEY_DOWN: (0, 1),
+}
 
-        self._static_update_iter = 0
+# Simulation speed multipliers, None running as fast as possible.
+SPEED_KEYS = {
+    ord("1"): 1,
+    ord("2"): 2,
+    ord("3"): 10,
+    ord("4"): 100,
+    ord("5"): None,
+}
 
-    async def show_entity_info(self, stdscr, entity: "Entity"):
-        info_height = 11
-        info_width = 50
-        start_y, start_x = 1, 1
 
-        info_win = curses.newwin(info_height, info_width, start_y, start_x)
-        info_win.box()
+def enable_mouse_motion():
+    curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
+    curses.mouseinterval(0)
+    print(MOUSE_MOTION_ON, end="", flush=True)
 
-        biome = self.overworld.biome.get_biome_by_coords(
-            entity.position.x, entity.position.y
-        )
 
-        info_lines = [
-            f"Entity Type: {type(entity).__name__} {entity.get_representation(biome)}",
-            f"ID: {entity.id}",
-            f"Position: ({entity.position.x}, {entity.position.y})",
-            f"State: {getattr(entity, 'state', 'N/A')}",
-            f"Health: {getattr(entity, 'health', 'N/A')}",
-            f"Hunger: {getattr(entity, 'hunger', 'N/A')}",
-            f"Thirst: {getattr(entity, 'thirst', 'N/A')}",
-            f"Energy: {getattr(entity, 'energy', 'N/A')}",
-            f"Mating Urge: {getattr(entity, 'mating_urge', 'N/A')}",
-        ]
+def disable_mouse_motion():
+    print(MOUSE_MOTION_OFF, end="", flush=True)
 
-        for i, line in enumerate(info_lines, start=1):
-            info_win.addstr(i, 1, line)
 
-        info_win.refresh()
-        stdscr.refresh()
+class System(metaclass=SingletonMeta):
+    def __init__(
+        self,
+        overworld: Overworld,
+        system_info: "SystemInfo" = None,
+        stream: Optional["FrameServer"] = None,
+        shared: Optional["SharedWorld"] = None,
+    ):
+        self.overworld = overworld
+        self.system_info = system_info
+        self.stream = stream
+        self.shared = shared
 
-        return info_win
+        self.inspector = Inspector(overworld) if system_info else None
+        self.frames = FrameBuilder(overworld)
+        self.render_thread = RenderThread(overworld.renderer)
 
-    async def check_mouse_hover(self):
-        while True:
-            _, mx, my, _, _ = curses.getmouse()
-            entity = self.overworld.get_entity_at_position(Position(mx, my))
-            if entity:
-                if self.info_win:
-                    self.info_win.clear()
-                self.info_win = await self.show_entity_info(
-                    self.overworld.stdscr, entity
-                )
-                self.info_win.refresh()
-            else:
-                if self.info_win:
-                    self.info_win.clear()
-                    self.info_win.refresh()
-                    self.overworld.draw(force_static=True)
-                    self.overworld.stdscr.refresh()
-                    curses.doupdate()
-                    self.info_win = None
-            await asyncio.sleep(0.1)
+        self._running = True
 
     async def key_listeners(self):
+        stdscr = self.overworld.stdscr
+        lock = self.overworld.renderer.lock
         while True:
-            c = self.overworld.stdscr.getch()
-            if c:
+            mouse = None
+            keys = []
+            # Curses is not thread safe, the render thread may be drawing.
+            with lock:
+                c = stdscr.getch()
+                while c != -1:
+                    if c == curses.KEY_MOUSE:
+                        try:
+                            _, mx, my, _, _ = curses.getmouse()
+                            mouse = (mx, my)
+                        except curses.error:
+                            pass
+                    else:
+                        keys.append(c)
+                    c = stdscr.getch()
+
+            for c in keys:
                 if c == ord("q"):
                     self._running = False
-                    break
-            await asyncio.sleep(0.1)
+                    return
+                if c == ord("t"):
+                    self.flush_trace()
+                if c == ord(" "):
+                    self.overworld.clock.toggle_pause()
+                if c == ord("n"):
+                    self.overworld.clock.step()
+                if c == ord("m") and self.system_info:
+                    self.overworld.memory.toggle_reporting()
+                if c in SPEED_KEYS:
+                    self.overworld.clock.set_speed(SPEED_KEYS[c])
+                if c in PAN_KEYS:
+                    dx, dy = PAN_KEYS[c]
+                    self.overworld.viewport.pan(dx * PAN_STEP, dy * PAN_STEP)
+
+            # Only the last pointer position of a burst of events matters.
+            if mouse is not None and self.inspector:
+                self.inspector.hover(*mouse)
+            await asyncio.sleep(0.05)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Capture what the viewport shows now, with the inspector window over it.
+        """
+        glyph, color = self.frames.capture()
+        return Snapshot(
+            self.overworld.clock.tick,
+            self.overworld.viewport.rect,
+            glyph,
+            color,
+            self.frames.glyphs,
+            self.inspector.overlay() if self.inspector else None,
+        )
 
     async def refresh_overworld(self):
+        """
+        Publish a snapshot to the render thread every frame. The simulation only
+        yields between clock ticks, so snapshots are always taken at a tick boundary.
+        """
         while self._running:
-            self.overworld.draw(
-                force_static=self._static_update_iter % REFRESH_STATIC_AFTER == 0
-            )
-            self.overworld.stdscr.refresh()
-
-            await asyncio.sleep(0.1)
+            self.render_thread.publish(self.snapshot())
+            await asyncio.sleep(self.frame_interval())
 
     async def update_system_info(self):
         while self._running:
             await self.system_info.draw()
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(self.frame_interval())
+
+    def frame_interval(self) -> float:
+        """
+        Return the seconds between frames, drawing fewer of them at high speeds so
+        the simulation gets the CPU.
+        """
+        speed = self.overworld.clock.speed
+        if speed is None or speed >= FAST_SPEED:
+            return FAST_FRAME_INTERVAL
+        return FRAME_INTERVAL
 
     async def run(self) -> None:
         tasks = []
         try:
             self.overworld.spawn_entities()
             self.overworld.stdscr.nodelay(True)
+            self.render_thread.start()
 
             key_listener_task = asyncio.create_task(self.key_listeners())
             tasks.append(key_listener_task)
 
             if self.system_info:
-                mouse_hover_task = asyncio.create_task(self.check_mouse_hover())
-                info_task = asyncio.create_task(self.update_system_info())
-                tasks.extend([mouse_hover_task, info_task])
+                tasks.append(asyncio.create_task(self.update_system_info()))
+
+            if self.stream:
+                tasks.append(asyncio.create_task(self.stream.serve()))
+
+            if self.shared:
+                tasks.append(asyncio.create_task(self.shared.serve()))
 
             update_task = asyncio.create_task(self.overworld.update())
             refresh_task = asyncio.create_task(self.refresh_overworld())
             tasks.extend([update_task, refresh_task])
 
-            while self._running:
-                await asyncio.sleep(0.1)
+            # The tasks run until the user quits, which ends the key listener, or
+            # until one of them crashes, which stops the system right away.
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            self._running = False
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    logging.error("Task crashed", exc_info=task.exception())
+                    self.flush_trace()
 
             for task in tasks:
                 task.cancel()
-
             await asyncio.gather(*tasks, return_exceptions=True)
 
         except asyncio.CancelledError:
             logging.info("Tasks were cancelled.")
         except Exception as e:
             logging.error(f"Unhandled exception: {e}")
+            self.flush_trace()
         finally:
             self.shutdown()
 
+    def flush_trace(self):
+        """
+        Write the recorded trace events to the trace file, if tracing is on.
+        """
+        if not tracer.enabled:
+            return
+
+        count = tracer.flush()
+        logging.info("Flushed %d trace records to %s.", count, tracer.path)
+
     def shutdown(self):
+        self.render_thread.stop()
         self.overworld.end()
+        self.overworld.renderer.close()
         self.overworld.stdscr.nodelay(False)
         self.overworld.stdscr.clear()
         self.overworld.stdscr.refresh()
+        disable_mouse_motion()
         curses.endwin()
         bus.emit("system:shutdown")
         logging.info("System shutting down")
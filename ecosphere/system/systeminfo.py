@@ -1,26 +1,36 @@
-import curses
 from collections import Counter
-from typing import Any
 from typing import Counter as CounterType
+from typing import List, Optional, Type
 
 import psutil
 
 from ecosphere.abc.entity import Entity
 from ecosphere.common.singleton import SingletonMeta
+from ecosphere.entities.food import Food
+from ecosphere.render import Renderer
+from ecosphere.world.analytics import PopulationReport
+from ecosphere.world.clock import SimulationClock
+from ecosphere.world.memory import MemoryReport
+
+MEMORY_ITEMS = 4  # largest entity classes and subsystems shown in the memory line
 
 
 class SystemInfo(metaclass=SingletonMeta):
-    def __init__(self, stdscr: Any):
-        self.stdscr = stdscr
+    def __init__(self, renderer: Renderer, clock: Optional[SimulationClock] = None):
+        self.renderer = renderer
+        self.clock = clock
 
-        self.width: int = self.stdscr.getmaxyx()[1]
-        self.height: int = self.stdscr.getmaxyx()[0]
+        self.height, self.width = self.renderer.size()
 
         self.entities: CounterType[Entity] = Counter()
         self._dead_entities: CounterType[Entity] = Counter()
 
         self._time = 0  # Minutes counter
 
+        self.report: Optional[PopulationReport] = None
+        self.memory: Optional[MemoryReport] = None
+        self._memory_drawn = False
+
     @staticmethod
     def entity_created(entity: Entity):
         """
@@ -38,6 +48,31 @@ class SystemInfo(metaclass=SingletonMeta):
         else:
             sysinfo.entities[entity_name] += 1
 
+    @staticmethod
+    def entities_created(entities: List[Entity]):
+        """
+        Add a batch of entities to the system info.
+
+        Attributes:
+            entities: the entities to add to the system info counter
+        """
+        sysinfo = SystemInfo()
+
+        sysinfo.entities.update(entity.__class__.__name__ for entity in entities)
+
+    @staticmethod
+    def food_created(food: Type[Food], count: int):
+        """
+        Add spawned food to the system info.
+
+        Attributes:
+            food: the class of the spawned food
+            count: how many items of it were spawned
+        """
+        sysinfo = SystemInfo()
+
+        sysinfo.entities[food.__name__] += count
+
     @staticmethod
     def entity_dead(entity: Entity):
         """
@@ -55,6 +90,30 @@ class SystemInfo(metaclass=SingletonMeta):
         else:
             sysinfo._dead_entities[entity_name] += 1
 
+    @staticmethod
+    def analytics_updated(report: PopulationReport):
+        """
+        Keep the latest population report for the status bar.
+
+        Attributes:
+            report: the population report of the last simulation minute
+        """
+        sysinfo = SystemInfo()
+
+        sysinfo.report = report
+
+    @staticmethod
+    def memory_sampled(report: Optional[MemoryReport]):
+        """
+        Keep the latest memory report, None once reports are turned off.
+
+        Attributes:
+            report: the memory report of the overworld
+        """
+        sysinfo = SystemInfo()
+
+        sysinfo.memory = report
+
     @staticmethod
     def minute_passed():
         """
@@ -70,7 +129,9 @@ class SystemInfo(metaclass=SingletonMeta):
         """
         overworld_info = "🌎 | System Info: "
 
-        if self.entities:
+        if self.report is not None:
+            overworld_info += "Entities: " + self._get_population_info(self.report)
+        elif self.entities:
             _temp_vals = []
             for entity, count in self.entities.items():
                 dead_count = self._dead_entities.get(entity, 0)
@@ -88,27 +149,97 @@ class SystemInfo(metaclass=SingletonMeta):
             minutes = self._time % 60
             overworld_info += f" | Time: {days}d {hours}h {minutes}m"
 
+        if self.clock is not None:
+            overworld_info += f" | Speed: {self._get_speed_info(self.clock)}"
+
         return overworld_info
 
+    def _get_speed_info(self, clock: SimulationClock) -> str:
+        """
+        Show the requested speed and the speed the simulation actually keeps up.
+        """
+        if clock.paused:
+            return "paused"
+
+        speed = "max" if clock.speed is None else f"{clock.speed:g}×"
+        return f"{speed} ({clock.ratio:.1f}× achieved)"
+
+    def _get_population_info(self, report: PopulationReport) -> str:
+        """
+        Summarise the population report: live animals with their mean health,
+        births and deaths of the last minute, then plant and food counts.
+        """
+        values = []
+        for s, species in enumerate(report.species):
+            alive = int(report.count[s, -1])
+            health = report.mean["health"][s, -1]
+            born, died = int(report.births[s, -1]), int(report.deaths[s, -1])
+            values.append(
+                f"{species} ({alive} alive, health {health:.0f}, +{born} -{died})"
+            )
+        values.extend(f"{name} ({count})" for name, count in report.others.items())
+        return ", ".join(values)
+
     def _get_machine_info(self):
         """
         Get machine info.
         """
         machine_info = "🕹️ | Machine Info: "
 
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory_percent = psutil.virtual_memory().percent
 
         if cpu_percent is not None and cpu_percent > 0.0 and cpu_percent < 100.0:
             machine_info += f"CPU: {int(cpu_percent)}% | MEM: {int(memory_percent)}%"
+
+        frame_bytes = self.renderer.frame_bytes
+        frame_size = "n/a" if frame_bytes is None else f"{frame_bytes / 1024:.1f} KB"
+        machine_info += (
+            f" | Frame: {self.renderer.frame_time * 1000:.1f} ms, {frame_size}"
+        )
         return machine_info
 
+    def _get_memory_info(self, report: MemoryReport) -> str:
+        """
+        Summarise the memory report: resident memory against the budget, then the
+        entity classes and subsystems taking the most.
+        """
+        memory_info = (
+            f"🧠 | Memory: {report.rss / 2**20:.0f} of {report.budget / 2**20:.0f} MB"
+        )
+
+        def largest(items):
+            items = [(name, count, size) for name, (count, size) in items if size]
+            items.sort(key=lambda item: item[2], reverse=True)
+            return ", ".join(
+                f"{name} {count}× {size / 2**10:.0f} KB"
+                for name, count, size in items[:MEMORY_ITEMS]
+            )
+
+        memory_info += f" | Entities: {largest(report.classes.items())}"
+        memory_info += f" | Subsystems: {largest(report.subsystems.items())}"
+        if report.traced:
+            ecosphere = sum(
+                size for name, size in report.traced.items() if name != "other"
+            )
+            memory_info += f" | Traced: {ecosphere / 2**20:.1f} MB"
+        return memory_info
+
     async def draw(self):
         """
         Draw system info to the screen.
         """
         overworld_info = self._get_overworld_info()
         machine_info = self._get_machine_info()
-
-        self.stdscr.addstr(self.height - 3, 0, overworld_info, curses.color_pair(7))
-        self.stdscr.addstr(self.height - 1, 0, machine_info, curses.color_pair(7))
+        memory = self.memory
+
+        with self.renderer.lock:
+            self.renderer.draw_text(0, self.height - 3, overworld_info, 7)
+            if memory is not None:
+                memory_info = self._get_memory_info(memory)
+                self.renderer.draw_text(0, self.height - 2, memory_info, 7)
+                self._memory_drawn = True
+            elif self._memory_drawn:
+                self.renderer.draw_text(0, self.height - 2, " " * (self.width - 1), 7)
+                self._memory_drawn = False
+            self.renderer.draw_text(0, self.height - 1, machine_info, 7)
@@ -1,8 +1,17 @@
-import uuid
+import itertools
+
+_ids = itertools.count(1)
+_keys = itertools.count(1)
 
 
 def generate_id(name: str):
-    return f"{name}_{uuid.uuid4()}"
+    """Return an id unique to the process, numbered in creation order."""
+    return f"{name}_{next(_ids)}"
+
+
+def generate_key() -> int:
+    """Return a process-wide unique integer, cheaper to store than a string id."""
+    return next(_keys)
 
 
 def clamp(value, min_value, max_value):
@@ -0,0 +1,267 @@
+import csv
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ecosphere.common.event_bus import bus
+from ecosphere.config import ENTITIES, SPECIES
+from ecosphere.world.biome import Biome
+
+if TYPE_CHECKING:
+    from ecosphere.abc.entity import Entity
+    from ecosphere.world.overworld import Overworld
+
+NEEDS = ("health", "hunger", "thirst", "energy")
+PERCENTILES = (10, 50, 90)
+
+# State codes of `ecosphere.states`, DeadState being 0.
+STATES = ("dead", "idle", "foraging", "mating", "moving", "seeking_water", "sleeping")
+
+BIOMES = [biome for biome in Biome]
+ALL_BIOMES = len(BIOMES)  # Column holding every biome together
+
+_position_x = attrgetter("position.x")
+_position_y = attrgetter("position.y")
+_state_code = attrgetter("state.code")
+
+
+@dataclass
+class PopulationReport:
+    """
+    Statistics of the live animals at a simulation minute.
+
+    Every array is indexed by species and biome, with an extra last biome column
+    covering all biomes together.
+
+    Attributes:
+        minute: int representing the simulation minute of the report
+        species: names of the animal species, in row order
+        biomes: names of the biomes, in column order
+        count: number of live animals
+        mean: mean of every need
+        percentiles: `PERCENTILES` of every need, along the last axis
+        states: number of animals in every state, along the last axis
+        births: animals born since the previous report
+        deaths: animals dead since the previous report
+        others: number of plants and food of every kind
+    """
+
+    minute: int
+    species: List[str]
+    biomes: List[str]
+    count: np.ndarray
+    mean: Dict[str, np.ndarray]
+    percentiles: Dict[str, np.ndarray]
+    states: np.ndarray
+    births: np.ndarray
+    deaths: np.ndarray
+    others: Dict[str, int] = field(default_factory=dict)
+
+    def rows(self) -> Iterator[Dict[str, object]]:
+        """
+        Yield a flat record for every species and biome with any animals or events.
+        """
+        for s, species in enumerate(self.species):
+            for b, biome in enumerate(self.biomes):
+                if not (self.count[s, b] or self.births[s, b] or self.deaths[s, b]):
+                    continue
+
+                row = {
+                    "minute": self.minute,
+                    "species": species,
+                    "biome": biome,
+                    "count": int(self.count[s, b]),
+                    "births": int(self.births[s, b]),
+                    "deaths": int(self.deaths[s, b]),
+                }
+                for need in NEEDS:
+                    row[f"{need}_mean"] = round(float(self.mean[need][s, b]), 2)
+                    for p, value in zip(PERCENTILES, self.percentiles[need][s, b]):
+                        row[f"{need}_p{p}"] = round(float(value), 2)
+                for state, value in zip(STATES, self.states[s, b]):
+                    row[state] = int(value)
+                yield row
+
+
+def _reduce(
+    groups: np.ndarray, values: Dict[str, np.ndarray], size: int
+) -> Tuple[np.ndarray, Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Count, average and take percentiles of every value array over the groups.
+    """
+    count = np.bincount(groups, minlength=size)
+    nonempty = np.maximum(count, 1)
+    starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+
+    means, percentiles = {}, {}
+    for name, column in values.items():
+        means[name] = np.bincount(groups, weights=column, minlength=size) / nonempty
+
+        # Sort by group, then by value, and pick the ranks inside every group.
+        ordered = column[np.lexsort((column, groups))]
+        ranks = starts[:, None] + np.floor(
+            np.array(PERCENTILES) / 100 * (count[:, None] - 1)
+        ).astype(np.int64)
+        result = np.zeros((size, len(PERCENTILES)))
+        result[count > 0] = ordered[ranks[count > 0]]
+        percentiles[name] = result
+
+    return count, means, percentiles
+
+
+class PopulationAnalytics:
+    """
+    Per-species and per-biome statistics of the live animals, computed once per
+    simulation minute with array reductions over gathered columns.
+
+    Every report is stored in `report` and published as "analytics:updated".
+
+    Attributes:
+        overworld: Overworld object to analyse
+    """
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+
+        self.species = list(SPECIES.animals)
+        self._species_index = {species: i for i, species in enumerate(self.species)}
+        self.report: Optional[PopulationReport] = None
+
+        shape = (len(self.species), ALL_BIOMES + 1)
+        self._births = np.zeros(shape, dtype=np.int64)
+        self._deaths = np.zeros(shape, dtype=np.int64)
+
+        bus.listener("entity:created")(self._entity_created)
+        bus.listener("entity:dead")(self._entity_dead)
+
+    def _count(self, counter: np.ndarray, entity: "Entity"):
+        s = self._species_index.get(type(entity))
+        if s is None:
+            return
+
+        biome = self.overworld.biome.get_biome_by_coords(
+            entity.position.x, entity.position.y
+        )
+        counter[s, BIOMES.index(biome)] += 1
+        counter[s, ALL_BIOMES] += 1
+
+    def _entity_created(self, entity: "Entity"):
+        self._count(self._births, entity)
+
+    def _entity_dead(self, entity: "Entity"):
+        self._count(self._deaths, entity)
+
+    def _live_animals(self) -> List["Entity"]:
+        animals = [
+            animal
+            for animal in self.overworld.entities.dynamic
+            if animal.state_code != 0
+        ]
+        for population in self.overworld.lod.populations.values():
+            for group in population.animals.values():
+                animals.extend(group)
+        return animals
+
+    def update(self, minute: int) -> PopulationReport:
+        animals = self._live_animals()
+        n = len(animals)
+        species_count, biome_count = len(self.species), ALL_BIOMES + 1
+
+        species = np.fromiter(
+            (self._species_index[type(animal)] for animal in animals),
+            dtype=np.int64,
+            count=n,
+        )
+        x = np.fromiter(map(_position_x, animals), dtype=np.int64, count=n)
+        y = np.fromiter(map(_position_y, animals), dtype=np.int64, count=n)
+        biome_values = self.overworld.biome.ids_at(x, y)
+        biome_column = np.zeros(max(biome.value for biome in Biome) + 1, np.int64)
+        biome_column[[biome.value for biome in BIOMES]] = np.arange(ALL_BIOMES)
+        biomes = biome_column[biome_values]
+
+        values = {
+            need: np.fromiter(map(attrgetter(need), animals), dtype=np.float64, count=n)
+            for need in NEEDS
+        }
+        states = np.fromiter(map(_state_code, animals), dtype=np.int64, count=n)
+
+        # Every animal counts in its biome column and in the all biomes column.
+        groups = np.concatenate(
+            (species * biome_count + biomes, species * biome_count + ALL_BIOMES)
+        )
+        size = species_count * biome_count
+        count, mean, percentiles = _reduce(
+            groups,
+            {need: np.concatenate((column, column)) for need, column in values.items()},
+            size,
+        )
+        state_counts = np.bincount(
+            groups * len(STATES) + np.concatenate((states, states)),
+            minlength=size * len(STATES),
+        )
+
+        others = {
+            entity.__name__: len(self.overworld.entities.of_species(entity))
+            for entity in ENTITIES
+            if entity not in self._species_index
+        }
+        for plant, plants in self.overworld.vegetation.counts():
+            others[plant.__name__] += plants
+        others.update(
+            (food.__name__, count) for food, count in self.overworld.food.counts()
+        )
+
+        shape = (species_count, biome_count)
+        self.report = PopulationReport(
+            minute=minute,
+            species=[species.__name__ for species in self.species],
+            biomes=[biome.name for biome in BIOMES] + ["ALL"],
+            count=count.reshape(shape),
+            mean={need: mean[need].reshape(shape) for need in NEEDS},
+            percentiles={
+                need: percentiles[need].reshape(*shape, len(PERCENTILES))
+                for need in NEEDS
+            },
+            states=state_counts.reshape(*shape, len(STATES)),
+            births=self._births.copy(),
+            deaths=self._deaths.copy(),
+            others=others,
+        )
+        self._births[:] = 0
+        self._deaths[:] = 0
+
+        bus.emit("analytics:updated", self.report)
+        return self.report
+
+
+class CsvExporter:
+    """
+    Append every population report to a CSV file, one row per species and biome.
+
+    Attributes:
+        path: file the rows are written to
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = None
+        self._file = None
+
+    def __call__(self, report: PopulationReport):
+        rows = list(report.rows())
+        if not rows:
+            return
+
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]))
+            self._writer.writeheader()
+
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
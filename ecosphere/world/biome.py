@@ -1,11 +1,18 @@
-import curses
-import random
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum, auto
 from functools import lru_cache
-from typing import Any, List, Literal
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
 
+import numpy as np
 from noise import pnoise2
 
+from ecosphere.abc.position import Position
+from ecosphere.common.rng import rng
+
+if TYPE_CHECKING:
+    from ecosphere.render import Renderer
+
 
 class Biome(Enum):
     WATER = auto()
@@ -29,56 +36,224 @@ class BiomeColorPair(Enum):
     MOUNTAINS = 6
 
 
+# Upper noise value bound of every biome, in increasing order.
+BIOME_THRESHOLDS = [
+    (-0.4, Biome.WATER),
+    (-0.2, Biome.DESERT),
+    (0.2, Biome.PLAINS),
+    (0.5, Biome.FOREST),
+    (0.65, Biome.FOOTHILLS),
+    (float("inf"), Biome.MOUNTAINS),
+]
+
+
+BIOMES = {biome.value: biome for biome in Biome}
+
+
+@dataclass
+class Chunk:
+    """
+    Square piece of the biome map, generated on first access.
+
+    Attributes:
+        noise: array of the Perlin noise values
+        ids: array of the biome values
+        colors: array of the color pair numbers
+    """
+
+    noise: np.ndarray
+    ids: np.ndarray
+    colors: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.noise.nbytes + self.ids.nbytes + self.colors.nbytes
+
+
 class BiomeManager:
-    def __init__(self, stdscr: Any, width: int, height: int):
-        self.stdscr = stdscr
+    """
+    Biome map of the overworld, split into chunks of `chunk_size` cells a side.
+
+    Chunks are generated the first time a cell of theirs is accessed. Once they
+    take more than `memory_budget` bytes the least recently used ones are dropped,
+    to be generated again from the noise offsets when they are needed.
+
+    Attributes:
+        renderer: Renderer the biome background is drawn with
+        width: int representing the width of the overworld
+        height: int representing the height of the overworld
+        chunk_size: int representing the side of a chunk in cells
+        memory_budget: int representing the bytes the chunks may take
+    """
+
+    def __init__(
+        self,
+        renderer: "Renderer",
+        width: int,
+        height: int,
+        *,
+        chunk_size: int = 64,
+        memory_budget: int = 64 << 20,
+    ):
+        self.renderer = renderer
         self.width = width
         self.height = height
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
 
-        self.seed = random.randint(0, 100000)
-        self.offset_x = random.randint(0, 100000)
-        self.offset_y = random.randint(0, 100000)
+        stream = rng.stream("biome")
+        self.seed = stream.randint(0, 100000)
+        self.offset_x = stream.randint(0, 100000)
+        self.offset_y = stream.randint(0, 100000)
 
-        self.map: List[List[float]] = self._generate_biome_map()
+        self.chunks: OrderedDict[Tuple[int, int], Chunk] = OrderedDict()
+        self.memory = 0  # Bytes taken by the generated chunks
+        self.generated = 0  # Chunks generated so far, including regenerations
 
-    def _generate_biome_map(self, scale: int = 0.05):
+        self._bounds = [bound for bound, _ in BIOME_THRESHOLDS[:-1]]
+        self._values = np.array(
+            [biome.value for _, biome in BIOME_THRESHOLDS], dtype=np.int8
+        )
+        self._colors = np.zeros(max(BIOMES) + 1, dtype=np.int8)
+        for biome in Biome:
+            self._colors[biome.value] = BiomeColorPair[biome.name].value
+
+    def _generate_chunk(self, cx: int, cy: int, scale: float = 0.05) -> Chunk:
         """
-        Generate a biome map using Perlin noise.
+        Generate the noise of a chunk and classify it into biomes.
         """
-        biome_map = [
+        size = self.chunk_size
+        xs = range(cx * size, min(self.width, (cx + 1) * size))
+        ys = range(cy * size, min(self.height, (cy + 1) * size))
+
+        noise = np.array(
             [
-                pnoise2((x + self.offset_x) * scale, (y + self.offset_y) * scale)
-                for x in range(self.width)
-            ]
-            for y in range(self.height)
-        ]
-        return biome_map
+                [
+                    pnoise2((x + self.offset_x) * scale, (y + self.offset_y) * scale)
+                    for x in xs
+                ]
+                for y in ys
+            ],
+            dtype=np.float64,
+        )
+        ids = self._values[np.digitize(noise, self._bounds)]
+        return Chunk(noise.astype(np.float32), ids, self._colors[ids])
 
-    def draw(self):
+    def chunk(self, cx: int, cy: int) -> Chunk:
         """
-        Color the screen according to the biome map.
+        Return the chunk at the given chunk coordinates, generating it if needed.
         """
-        for y in range(self.height - 1):
-            for x in range(self.width - 1):
-                biome = self.get_biome(self.map[y][x])
-                color = BiomeColorPair[biome.name]
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
 
-                self.stdscr.addstr(
-                    y,
-                    x,
-                    " ",
-                    curses.color_pair(color.value),
-                )
+        chunk = self.chunks[key] = self._generate_chunk(cx, cy)
+        self.memory += chunk.nbytes
+        self.generated += 1
 
-    @lru_cache
-    def get_biome_color(self, biome: Biome):
+        while self.memory > self.memory_budget and len(self.chunks) > 1:
+            _, evicted = self.chunks.popitem(last=False)
+            self.memory -= evicted.nbytes
+        return chunk
+
+    def clear_cache(self) -> int:
         """
-        Get the color pair for a given biome.
+        Drop every generated chunk and cached biome lookup, to be generated again
+        when needed. Returns the number of chunks dropped.
         """
-        color = BiomeColorPair[biome.name]
-        return curses.color_pair(color.value)
+        chunks = len(self.chunks)
+        self.chunks.clear()
+        self.memory = 0
+        BiomeManager.get_biome.cache_clear()
+        return chunks
+
+    def region(self, rect: Tuple[int, int, int, int], field: str = "ids") -> np.ndarray:
+        """
+        Return an array of a chunk field (noise, ids or colors) over the
+        (x0, y0, x1, y1) rect, clipped to the overworld.
+        """
+        x0, y0 = max(0, rect[0]), max(0, rect[1])
+        x1, y1 = min(self.width, rect[2]), min(self.height, rect[3])
+        dtype = np.float32 if field == "noise" else np.int8
+        region = np.empty((max(0, y1 - y0), max(0, x1 - x0)), dtype=dtype)
+
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1 if y1 > y0 else 0):
+            for cx in range(x0 // size, (x1 - 1) // size + 1 if x1 > x0 else 0):
+                values = getattr(self.chunk(cx, cy), field)
+                top, left = cy * size, cx * size
+                a, b = max(y0, top), min(y1, top + size)
+                c, d = max(x0, left), min(x1, left + size)
+                region[a - y0 : b - y0, c - x0 : d - x0] = values[
+                    a - top : b - top, c - left : d - left
+                ]
+        return region
+
+    def ids_at(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Return the biome values of the given cells, visiting every chunk once.
+        """
+        x = np.asarray(x, dtype=np.intp)
+        y = np.asarray(y, dtype=np.intp)
+        ids = np.empty(len(x), dtype=np.int8)
+
+        size = self.chunk_size
+        keys = (y // size) * ((self.width + size - 1) // size) + x // size
+        order = np.argsort(keys, kind="stable")
+        starts = np.flatnonzero(np.diff(keys[order], prepend=-1))
+        for cells in np.split(order, starts[1:]):
+            if not len(cells):
+                continue
+            chunk = self.chunk(int(x[cells[0]]) // size, int(y[cells[0]]) // size)
+            ids[cells] = chunk.ids[y[cells] % size, x[cells] % size]
+        return ids
+
+    def nearest(
+        self, position: Position, radius: int, biome: Biome
+    ) -> Optional[Position]:
+        """
+        Find the closest cell of the given biome within a circle around the position.
+        """
+        x0, y0 = max(0, position.x - radius), max(0, position.y - radius)
+        ids = self.region((x0, y0, position.x + radius + 1, position.y + radius + 1))
+
+        # Scan column by column, so ties go to the smallest x like before.
+        xs, ys = np.nonzero(ids.T == biome.value)
+        distance = (xs + x0 - position.x) ** 2 + (ys + y0 - position.y) ** 2
+        inside = distance <= radius**2
+        if not inside.any():
+            return None
+
+        i = int(np.flatnonzero(inside)[np.argmin(distance[inside])])
+        return Position(int(xs[i]) + x0, int(ys[i]) + y0)
+
+    def draw(self, rect: Tuple[int, int, int, int], x: int = 0, y: int = 0):
+        """
+        Color the screen according to the biome map within the (x0, y0, x1, y1) rect,
+        starting at the (x, y) screen cell.
+        """
+        self.renderer.draw_background(self.region(rect, "colors"), x, y)
+
+    def get_biome_color(self, biome: Biome) -> int:
+        """
+        Get the color pair number for a given biome.
+        """
+        return int(self._colors[biome.value])
+
+    def _clip(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Clip the coordinates to the overworld, so cells off the map take the biome
+        of the nearest edge instead of generating chunks outside of it.
+        """
+        return min(max(x, 0), self.width - 1), min(max(y, 0), self.height - 1)
+
+    def color_at(self, x: int, y: int) -> int:
+        x, y = self._clip(x, y)
+        size = self.chunk_size
+        return int(self.chunk(x // size, y // size).colors[y % size, x % size])
 
-    @lru_cache
     def get_biome_by_coords(self, x: int, y: int) -> Literal[
         Biome.WATER,
         Biome.PLAINS,
@@ -88,10 +263,11 @@ class BiomeManager:
         Biome.MOUNTAINS,
     ]:
         """
-        Get the biome for a given set of coordinates.
+        Get the biome for a given set of coordinates, clipped to the overworld.
         """
-        value = self.map[y][x]
-        return self.get_biome(value)
+        x, y = self._clip(x, y)
+        size = self.chunk_size
+        return BIOMES[int(self.chunk(x // size, y // size).ids[y % size, x % size])]
 
     @lru_cache
     def get_biome(self, value: float) -> Literal[
@@ -105,15 +281,7 @@ class BiomeManager:
         """
         Get the biome for a given value.
         """
-        if value < -0.4:
-            return Biome.WATER
-        elif value < -0.2:
-            return Biome.DESERT
-        elif value < 0.2:
-            return Biome.PLAINS
-        elif value < 0.5:
-            return Biome.FOREST
-        elif value < 0.65:
-            return Biome.FOOTHILLS
-        else:
-            return Biome.MOUNTAINS
+        for bound, biome in BIOME_THRESHOLDS:
+            if value < bound:
+                return biome
+        return Biome.MOUNTAINS
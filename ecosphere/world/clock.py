@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from ecosphere.config import MINUTE_LENGTH, TICKS_PER_MINUTE
+
+
+class SimulationClock:
+    """
+    Simulation time, counted in ticks of `1 / TICKS_PER_MINUTE` simulation minutes
+    and paced against the wall clock by a speed multiplier.
+
+    The clock can be paused, stepped one tick at a time while paused, or run as
+    fast as the simulation allows with a speed of None. When a tick takes longer
+    than its wall time the clock falls behind instead of bursting to catch up.
+
+    Attributes:
+        tick_length: float representing the wall seconds of a tick at 1× speed
+        speed: float representing the speed multiplier, None for as fast as possible
+    """
+
+    RATIO_WINDOW = 2.0  # seconds the achieved ratio is measured over
+
+    def __init__(
+        self,
+        tick_length: float = MINUTE_LENGTH / TICKS_PER_MINUTE,
+        speed: Optional[float] = 1,
+    ):
+        self.tick_length = tick_length
+        self.speed = speed
+        self.paused = False
+        self.tick = 0
+
+        self._steps = 0
+        self._due: Optional[float] = None  # Wall time the next tick is due at
+        self._wakeup = asyncio.Event()
+        self._samples: Deque[Tuple[float, int]] = deque()
+
+    @property
+    def minute(self) -> int:
+        return self.tick // TICKS_PER_MINUTE
+
+    @property
+    def ratio(self) -> float:
+        """
+        Simulation seconds per wall second over the last `RATIO_WINDOW` seconds.
+        """
+        self._trim(time.perf_counter())
+        if self.paused or len(self._samples) < 2:
+            return 0.0
+
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        if end <= start:
+            return 0.0
+        return (last - first) * self.tick_length / (end - start)
+
+    def set_speed(self, speed: Optional[float]):
+        self.speed = speed
+        self._due = None
+        self.resume()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self._due = None
+        self._samples.clear()
+        self._wakeup.set()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self):
+        """
+        Pause the clock and let exactly one more tick run.
+        """
+        self.pause()
+        self._steps += 1
+        self._wakeup.set()
+
+    def _trim(self, now: float):
+        while self._samples and now - self._samples[0][0] > self.RATIO_WINDOW:
+            self._samples.popleft()
+
+    async def wait(self) -> int:
+        """
+        Wait until the next tick is due and return its number.
+        """
+        while True:
+            if self._steps:
+                self._steps -= 1
+                break
+            if self.paused:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if self.speed is None:
+                # Still yield, so input and drawing are not starved.
+                await asyncio.sleep(0)
+                break
+
+            now = time.perf_counter()
+            interval = self.tick_length / self.speed
+            if self._due is None or now - self._due > interval:
+                self._due = now
+            if self._due > now:
+                # Sleep in place, then check again for a pause or speed change.
+                await asyncio.sleep(self._due - now)
+                continue
+            self._due += interval
+            break
+
+        tick = self.tick
+        self.tick += 1
+
+        now = time.perf_counter()
+        self._samples.append((now, self.tick))
+        self._trim(now)
+        return tick
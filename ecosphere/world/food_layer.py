@@ -0,0 +1,223 @@
+from typing import Iterator, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from ecosphere.abc.position import Position
+from ecosphere.entities.food import Food
+from ecosphere.world.biome import Biome
+
+EMPTY = 0
+
+
+class FoodLayer:
+    """
+    Food of the overworld stored as dense per-cell arrays instead of entities.
+
+    Every cell holds the kind of food lying on it (0 for no food), its nutrition and
+    the simulation minute it was placed at, for stale food to be expired. Food
+    objects are only materialised when something asks for a specific item, e.g. an
+    animal about to eat it or the hover inspector.
+
+    Attributes:
+        width: int representing the width of the overworld
+        height: int representing the height of the overworld
+        food_types: list of food classes that can be stored in the layer
+    """
+
+    def __init__(self, width: int, height: int, food_types: Sequence[Type[Food]]):
+        self.width = width
+        self.height = height
+        self.food_types: List[Type[Food]] = list(food_types)
+
+        self.kind = np.zeros((height, width), dtype=np.int8)
+        self.nutrition = np.zeros((height, width), dtype=np.float32)
+        self.placed = np.zeros((height, width), dtype=np.int32)
+        self.minute = 0  # Current simulation minute, set by the overworld
+        # Cells holding every kind of food, kept up to date by spawn and consume.
+        self._counts = np.zeros(len(self.food_types) + 1, dtype=np.int64)
+
+        self._nutrition = np.array(
+            [0] + [food._property.nutrition for food in self.food_types],
+            dtype=np.float32,
+        )
+        # Food representation only depends on the food kind and the biome.
+        self._glyphs = [
+            [" "] * (max(biome.value for biome in Biome) + 1)
+            for _ in range(len(self.food_types) + 1)
+        ]
+        for kind, food in enumerate(self.food_types, start=1):
+            for biome in Biome:
+                self._glyphs[kind][biome.value] = food.get_representation(biome)
+
+    def __len__(self) -> int:
+        return int(self._counts[1:].sum())
+
+    @property
+    def occupied(self) -> np.ndarray:
+        return self.kind != EMPTY
+
+    def kind_of(self, food: Type[Food]) -> int:
+        return self.food_types.index(food) + 1
+
+    def _kinds_mask(self, food_type: Optional[Sequence[Type[Food]]]) -> np.ndarray:
+        if isinstance(food_type, np.ndarray):
+            # Already a mask over the kinds, like the compiled animal diets.
+            return food_type
+
+        mask = np.zeros(len(self.food_types) + 1, dtype=bool)
+        if food_type:
+            mask[[self.kind_of(food) for food in food_type]] = True
+        else:
+            mask[1:] = True
+        return mask
+
+    def counts(self) -> Iterator[Tuple[Type[Food], int]]:
+        """
+        Yield every food class with the amount of it lying in the overworld.
+        """
+        for kind, food in enumerate(self.food_types, start=1):
+            yield food, int(self._counts[kind])
+
+    def spawn(self, kinds: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Place food on the given cells, skipping cells that already hold some.
+        Returns a mask of the food that was placed.
+
+        Attributes:
+            kinds: array of food kinds (see `kind_of`) to place
+            x: array of x coordinates
+            y: array of y coordinates
+        """
+        kinds = np.asarray(kinds, dtype=np.int8)
+        x = np.asarray(x, dtype=np.intp)
+        y = np.asarray(y, dtype=np.intp)
+
+        placed = self.kind[y, x] == EMPTY
+        _, first = np.unique(y * self.width + x, return_index=True)
+        unique = np.zeros(len(kinds), dtype=bool)
+        unique[first] = True
+        placed &= unique
+
+        self.kind[y[placed], x[placed]] = kinds[placed]
+        self._counts += np.bincount(kinds[placed], minlength=len(self._counts))
+        self.nutrition[y[placed], x[placed]] = self._nutrition[kinds[placed]]
+        self.placed[y[placed], x[placed]] = self.minute
+        return placed
+
+    def consume(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Remove the food lying on the given cells and return its nutrition.
+
+        Attributes:
+            x: array of x coordinates
+            y: array of y coordinates
+        """
+        x = np.asarray(x, dtype=np.intp)
+        y = np.asarray(y, dtype=np.intp)
+
+        nutrition = self.nutrition[y, x].copy()
+        cells = np.unique(y * self.width + x)
+        self._counts -= np.bincount(
+            self.kind.ravel()[cells], minlength=len(self._counts)
+        )
+        self.kind[y, x] = EMPTY
+        self.nutrition[y, x] = 0
+        return nutrition
+
+    def stale(self, age: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (x, y) coordinates of the food placed at least `age` minutes ago.
+        """
+        ys, xs = np.nonzero((self.kind != EMPTY) & (self.placed <= self.minute - age))
+        return xs, ys
+
+    def _window(self, position: Position, radius: int) -> Tuple[int, int, int, int]:
+        return (
+            max(0, position.x - radius),
+            max(0, position.y - radius),
+            min(self.width, position.x + radius + 1),
+            min(self.height, position.y + radius + 1),
+        )
+
+    def count_in_range(self, position: Position, radius: int) -> int:
+        x0, y0, x1, y1 = self._window(position, radius)
+        return int(np.count_nonzero(self.kind[y0:y1, x0:x1]))
+
+    def nearest(
+        self,
+        position: Position,
+        radius: int,
+        food_type: Optional[Sequence[Type[Food]]] = None,
+    ) -> Optional[Position]:
+        """
+        Find the closest cell holding food of the given types within the radius.
+
+        Attributes:
+            position: Position to search around
+            radius: int representing the search radius
+            food_type: optional list of food classes to look for, all food if empty
+        """
+        x0, y0, x1, y1 = self._window(position, radius)
+        window = self.kind[y0:y1, x0:x1]
+
+        ys, xs = np.nonzero(self._kinds_mask(food_type)[window] & (window != EMPTY))
+        if not len(xs):
+            return None
+
+        distance = (xs + x0 - position.x) ** 2 + (ys + y0 - position.y) ** 2
+        i = int(np.argmin(distance))
+        return Position(int(xs[i]) + x0, int(ys[i]) + y0)
+
+    def holds(
+        self, position: Position, food_type: Optional[Sequence[Type[Food]]] = None
+    ) -> bool:
+        """
+        Tell whether the cell holds food of the given types, all food if empty.
+        """
+        kind = self.kind[position.y, position.x]
+        return kind != EMPTY and bool(self._kinds_mask(food_type)[kind])
+
+    def in_range(
+        self,
+        position: Position,
+        radius: int,
+        food_type: Optional[Sequence[Type[Food]]] = None,
+    ) -> List[Position]:
+        x0, y0, x1, y1 = self._window(position, radius)
+        window = self.kind[y0:y1, x0:x1]
+
+        ys, xs = np.nonzero(self._kinds_mask(food_type)[window] & (window != EMPTY))
+        return [Position(int(x) + x0, int(y) + y0) for x, y in zip(xs, ys)]
+
+    def materialise(self, position: Position, biome: Biome) -> Optional[Food]:
+        """
+        Build a Food object for the food lying on the given cell, if any.
+        """
+        kind = int(self.kind[position.y, position.x])
+        if kind == EMPTY:
+            return None
+
+        return self.food_types[kind - 1].create(Position(position.x, position.y), biome)
+
+    def glyphs(
+        self,
+        biome_ids: np.ndarray,
+        rect: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (x, y, representation) for every cell holding food.
+
+        Attributes:
+            biome_ids: array of biome values of the cells in the rect
+            rect: optional (x0, y0, x1, y1) to only yield the food inside of
+        """
+        x0, y0, x1, y1 = rect or (0, 0, self.width, self.height)
+        window = self.kind[y0:y1, x0:x1]
+
+        ys, xs = np.nonzero(window)
+        kinds = window[ys, xs].tolist()
+        biomes = biome_ids[ys, xs].tolist()
+        for x, y, kind, biome in zip(
+            (xs + x0).tolist(), (ys + y0).tolist(), kinds, biomes
+        ):
+            yield x, y, self._glyphs[kind][biome]
@@ -0,0 +1,225 @@
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Type
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.abc.position import Position
+from ecosphere.common.event_bus import bus
+from ecosphere.common.rng import rng
+from ecosphere.config import (
+    CHUNK_SIZE,
+    LOD_AGGREGATE_AFTER,
+    LOD_BIRTH_RATE,
+    LOD_DEATH_RATE,
+    LOD_FACTOR,
+    LOD_MARGIN,
+)
+from ecosphere.states import DeadState
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+@dataclass
+class RegionPopulation:
+    """
+    Animals of an aggregated region, taken out of the overworld.
+
+    Attributes:
+        animals: the animals of every species
+        capacity: population around which every species settles
+    """
+
+    animals: Dict[Type[Entity], List[Entity]] = field(default_factory=dict)
+    capacity: Dict[Type[Entity], int] = field(default_factory=dict)
+
+
+class LevelOfDetail:
+    """
+    Simulate the overworld away from the viewport in less detail.
+
+    The viewport can be replaced by a fixed focus rect, for runs without a
+    terminal, whose viewport shows the whole world.
+
+    The world is split into regions of `CHUNK_SIZE` cells a side. Regions within
+    `LOD_MARGIN` cells of the viewport are active. Animals elsewhere are updated
+    `LOD_FACTOR` times less often, with their needs advanced over the skipped
+    updates by `Animal.advance_status`.
+
+    Regions inactive for `LOD_AGGREGATE_AFTER` minutes are aggregated: their animals
+    leave the overworld and only per-species counts change, with random births and
+    deaths. The animals are put back when the region becomes active again.
+
+    Attributes:
+        overworld: Overworld object to simulate
+        enabled: whether inactive regions are simulated in less detail
+        focus: (x0, y0, x1, y1) world rect simulated in full detail instead of the
+            viewport, if any
+    """
+
+    def __init__(
+        self,
+        overworld: "Overworld",
+        enabled: bool = False,
+        focus: Optional[Tuple[int, int, int, int]] = None,
+    ):
+        self.overworld = overworld
+        self.enabled = enabled
+        self.focus = focus
+
+        self.region_size = CHUNK_SIZE
+        self.factor = LOD_FACTOR
+
+        rows = -(-overworld.height // self.region_size)
+        columns = -(-overworld.width // self.region_size)
+        self.last_active = np.zeros((rows, columns), dtype=np.int64)
+        self.populations: Dict[Tuple[int, int], RegionPopulation] = {}
+
+        self._rng = rng.generator("lod")
+
+    def active_rect(self) -> Tuple[int, int, int, int]:
+        x0, y0, x1, y1 = self.focus or self.overworld.viewport.rect
+        return x0 - LOD_MARGIN, y0 - LOD_MARGIN, x1 + LOD_MARGIN, y1 + LOD_MARGIN
+
+    def is_active(self, position: Position) -> bool:
+        if not self.enabled:
+            return True
+
+        x0, y0, x1, y1 = self.active_rect()
+        return x0 <= position.x < x1 and y0 <= position.y < y1
+
+    def update(self, tick: int):
+        """
+        Track the active regions, aggregating and restoring regions as needed.
+        """
+        if not self.enabled:
+            return
+
+        size = self.region_size
+        x0, y0, x1, y1 = self.active_rect()
+        rows = slice(max(0, y0 // size), max(0, (y1 - 1) // size + 1))
+        columns = slice(max(0, x0 // size), max(0, (x1 - 1) // size + 1))
+        self.last_active[rows, columns] = tick
+
+        for key in list(self.populations):
+            rx, ry = key
+            if self.last_active[ry, rx] == tick:
+                self._restore(key)
+
+        if tick % self.factor:
+            return
+
+        stale = {
+            (int(rx), int(ry))
+            for ry, rx in np.argwhere(tick - self.last_active >= LOD_AGGREGATE_AFTER)
+        }
+        stale.difference_update(self.populations)
+        if stale:
+            self._aggregate(stale)
+        self._breed(self.factor)
+
+    def _aggregate(self, regions: Set[Tuple[int, int]]):
+        for key in regions:
+            self.populations[key] = RegionPopulation()
+
+        size = self.region_size
+        count = 0
+        for animal in list(self.overworld.entities.dynamic):
+            key = (animal.position.x // size, animal.position.y // size)
+            if key not in regions or animal.state_code == DeadState.code:
+                continue
+
+            self.overworld.entities.remove(animal)
+            self.populations[key].animals.setdefault(type(animal), []).append(animal)
+            count += 1
+
+        # Births balance deaths at about the aggregated population.
+        headroom = max(1e-3, 1 - LOD_DEATH_RATE / LOD_BIRTH_RATE)
+        for key in regions:
+            population = self.populations[key]
+            for species, animals in population.animals.items():
+                population.capacity[species] = max(2, round(len(animals) / headroom))
+
+        logging.debug("Aggregated %d animals in %d regions.", count, len(regions))
+
+    def _breed(self, minutes: int):
+        """
+        Apply random births and deaths to the aggregated populations.
+        """
+        groups = [
+            (population, species, animals)
+            for population in self.populations.values()
+            for species, animals in population.animals.items()
+            if animals
+        ]
+        if not groups:
+            return
+
+        counts = np.array([len(animals) for _, _, animals in groups])
+        capacity = np.array(
+            [population.capacity[species] for population, species, _ in groups]
+        )
+        birth_rate = np.clip(LOD_BIRTH_RATE * minutes * (1 - counts / capacity), 0, 1)
+        births = self._rng.binomial(counts, birth_rate)
+        deaths = self._rng.binomial(counts, min(1.0, LOD_DEATH_RATE * minutes))
+
+        biome = self.overworld.biome
+        for (_, species, animals), born, died in zip(
+            groups, births.tolist(), deaths.tolist()
+        ):
+            for _ in range(born):
+                parent = animals[self._rng.integers(len(animals))]
+                position = Position(parent.position.x, parent.position.y)
+                child = species.create(
+                    position, biome.get_biome_by_coords(position.x, position.y)
+                )
+                animals.append(child)
+                bus.emit("entity:created", child)
+
+            for _ in range(died):
+                animal = animals.pop(self._rng.integers(len(animals)))
+                animal.change_state(DeadState())
+                bus.emit("entity:dead", animal)
+
+    def _restore(self, key: Tuple[int, int]):
+        """
+        Put the animals of an aggregated region back into free cells of the region,
+        keeping each one in the biome it was in.
+        """
+        population = self.populations.pop(key)
+        animals = [
+            animal for animals in population.animals.values() for animal in animals
+        ]
+        if not animals:
+            return
+
+        overworld = self.overworld
+        size = self.region_size
+        x0, y0 = key[0] * size, key[1] * size
+        x1, y1 = min(overworld.width, x0 + size), min(overworld.height, y0 + size)
+
+        free = (overworld.food.kind[y0:y1, x0:x1] == 0) & (
+            overworld.entities.occupancy[y0:y1, x0:x1] == 0
+        )
+        ids = overworld.biome.region((x0, y0, x1, y1))
+        width = x1 - x0
+
+        placed = []
+        for animal in animals:
+            x, y = animal.position.x - x0, animal.position.y - y0
+            if not free[y, x]:
+                cells = np.flatnonzero(free & (ids == ids[y, x]))
+                if not len(cells):
+                    animal.change_state(DeadState())
+                    bus.emit("entity:dead", animal)
+                    continue
+                y, x = divmod(int(self._rng.choice(cells)), width)
+
+            free[y, x] = False
+            animal._move(x + x0, y + y0, overwrite=True)
+            placed.append(animal)
+
+        overworld.entities.extend(placed)
+        logging.debug("Restored %d animals in region %s.", len(placed), key)
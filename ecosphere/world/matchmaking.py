@@ -0,0 +1,110 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from ecosphere.abc.position import Position
+from ecosphere.states import DeadState, MatingState
+
+if TYPE_CHECKING:
+    from ecosphere.entities.animal import Animal
+    from ecosphere.world.overworld import Overworld
+
+MATING_URGE = 80  # Mating urge from which an animal accepts a mate
+
+
+class Matchmaker:
+    """
+    Pair the animals ready to mate once per clock tick, instead of every animal in
+    heat scanning the overworld for mates on its own.
+
+    Animals with a mating urge of at least `MATING_URGE` are bucketed by species
+    and by cells as wide as their perception radius, so only animals in
+    neighbouring cells are compared. Candidate pairs in perception range, with at
+    least one animal in the mating state, are then taken greedily from the closest
+    one, which gives every animal at most one mate. Both animals head for a
+    meeting point: the midpoint of the pair when both are mating, otherwise the
+    position of the one not looking for a mate.
+
+    Attributes:
+        overworld: Overworld object whose animals are paired
+    """
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+
+        self._matches: Dict[int, Tuple["Animal", Position]] = {}
+
+    def __len__(self) -> int:
+        return len(self._matches) // 2
+
+    def partner(self, animal: "Animal") -> Optional[Tuple["Animal", Position]]:
+        """
+        Return the mate of the animal and their meeting point, if it has one.
+        """
+        return self._matches.get(animal.key)
+
+    def match(self):
+        """
+        Pair the animals ready to mate, forgetting the pairs of the previous tick.
+        """
+        self._matches.clear()
+
+        groups: Dict[Type["Animal"], List["Animal"]] = {}
+        seeking = set()
+        for animal in self.overworld.entities.dynamic:
+            if animal.mating_urge < MATING_URGE or animal.state_code == DeadState.code:
+                continue
+
+            groups.setdefault(type(animal), []).append(animal)
+            if animal.state_code == MatingState.code:
+                seeking.add(type(animal))
+
+        for species in seeking:
+            self._match_species(groups[species])
+
+    def _match_species(self, animals: List["Animal"]):
+        radius = max(1, animals[0].perception_radius)
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, animal in enumerate(animals):
+            cell = (animal.position.x // radius, animal.position.y // radius)
+            buckets.setdefault(cell, []).append(i)
+
+        mating = [animal.state_code == MatingState.code for animal in animals]
+
+        candidates = []
+        for (cx, cy), members in buckets.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for i in members:
+                        for j in buckets.get((cx + dx, cy + dy), ()):
+                            if j <= i or not (mating[i] or mating[j]):
+                                continue
+
+                            a, b = animals[i].position, animals[j].position
+                            if not a.is_within_range(b, radius):
+                                continue
+
+                            distance = (a.x - b.x) ** 2 + (a.y - b.y) ** 2
+                            keys = sorted((animals[i].key, animals[j].key))
+                            candidates.append((distance, keys, i, j))
+
+        # Closest pairs first, ties going to the oldest animals.
+        candidates.sort()
+        paired = set()
+        for _, _, i, j in candidates:
+            if i in paired or j in paired:
+                continue
+            paired.update((i, j))
+
+            first, second = animals[i], animals[j]
+            if mating[i] and mating[j]:
+                meeting_point = Position(
+                    (first.position.x + second.position.x) // 2,
+                    (first.position.y + second.position.y) // 2,
+                )
+            elif mating[i]:
+                meeting_point = second.position
+            else:
+                meeting_point = first.position
+
+            self._matches[first.key] = (second, meeting_point)
+            self._matches[second.key] = (first, meeting_point)
@@ -0,0 +1,291 @@
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import psutil
+
+from ecosphere.common.event_bus import bus
+from ecosphere.common.trace import tracer
+from ecosphere.config import (
+    FOOD_STALE_AFTER,
+    MEMORY_BUDGET,
+    MEMORY_CHECK_EVERY,
+    MEMORY_LOW_WATER,
+    MEMORY_SAMPLE_INTERVAL,
+)
+from ecosphere.world.biome import BiomeManager
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+SAMPLED_OBJECTS = 32  # objects of every class sized for the per-object estimate
+
+_CONTAINERS = (list, dict, set, tuple, str)
+
+
+def footprint(obj: Any, depth: int = 2, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the bytes held by the attributes of a subsystem object: the buffers of
+    its arrays, the size of its containers (not of what they point to) and the
+    footprint of the objects it holds, `depth` levels down.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes if obj.base is None else 0
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, _CONTAINERS):
+        return sys.getsizeof(obj)
+    if depth <= 0 or not hasattr(obj, "__dict__"):
+        return 0
+
+    return sys.getsizeof(obj) + sum(
+        footprint(value, depth - 1, seen) for value in vars(obj).values()
+    )
+
+
+def _object_sizes(objects: Iterable[Any]) -> float:
+    """
+    Return the mean bytes of one of the objects, with the attribute values it
+    doesn't share with the other sampled objects (e.g. its position, but not the
+    properties or the state flyweight of its class).
+    """
+    sample = list(objects)
+    owners = Counter(id(value) for obj in sample for value in vars(obj).values())
+    sizes = [
+        sys.getsizeof(obj)
+        + sys.getsizeof(vars(obj))
+        + sum(
+            sys.getsizeof(value)
+            for value in vars(obj).values()
+            if owners[id(value)] == 1 or len(sample) == 1
+        )
+        for obj in sample
+    ]
+    return sum(sizes) / len(sizes) if sizes else 0.0
+
+
+@dataclass
+class MemoryReport:
+    """
+    Memory taken by the simulation at some point.
+
+    Attributes:
+        rss: int representing the resident bytes of the process
+        budget: int representing the resident bytes the process may take
+        classes: dict of (count, estimated bytes) by entity class name, bytes being
+            None for food and plants stored in dense layers
+        subsystems: dict of (items, estimated bytes) by subsystem name
+        traced: dict of bytes allocated by every package, when tracemalloc traces
+    """
+
+    rss: int
+    budget: int
+    classes: Dict[str, Tuple[int, Optional[int]]] = field(default_factory=dict)
+    subsystems: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    traced: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.rss > self.budget
+
+
+class MemoryAccountant:
+    """
+    Account for the memory of the overworld by entity class and subsystem, and keep
+    the process under a memory budget.
+
+    The sizes are estimates: every entity class is counted and a sample of its
+    objects sized, and every subsystem (registry, food, spawners, caches, the event
+    bus...) is sized from its arrays and containers. When the process is started
+    with `python -X tracemalloc`, the traced allocations of every package are
+    reported too.
+
+    Every `MEMORY_CHECK_EVERY` minutes the resident memory of the process is
+    compared with the budget. Over it, the overworld is trimmed down to a low-water
+    mark below the budget: dead animals are reaped, food lying for
+    `FOOD_STALE_AFTER` minutes is removed and the caches are emptied, to be filled
+    again on demand (see `trim`).
+
+    Reports are published as "memory:sampled" on demand, see `toggle_reporting`.
+
+    Attributes:
+        overworld: Overworld object to account for
+        budget: int representing the resident bytes the process may take
+    """
+
+    def __init__(self, overworld: "Overworld", budget: int = MEMORY_BUDGET):
+        self.overworld = overworld
+        self.budget = budget
+
+        self.reporting = False
+        self.report: Optional[MemoryReport] = None
+        self.trims = 0  # Times the budget was exceeded
+        self._fruitless = False  # Whether the last trim freed nothing
+
+        self._process = psutil.Process(os.getpid())
+        self._sampled_at = 0.0
+
+    def rss(self) -> int:
+        return self._process.memory_info().rss
+
+    def sample(self) -> MemoryReport:
+        """
+        Measure the memory of the overworld now.
+        """
+        overworld = self.overworld
+        report = MemoryReport(self.rss(), self.budget)
+
+        objects = defaultdict(list)
+        for entity in list(overworld.entities) + list(overworld.spawners):
+            objects[type(entity).__name__].append(entity)
+        for name, entities in objects.items():
+            estimate = _object_sizes(entities[:SAMPLED_OBJECTS]) * len(entities)
+            report.classes[name] = (len(entities), round(estimate))
+
+        for food, count in overworld.food.counts():
+            report.classes[food.__name__] = (count, None)
+        for plant, count in overworld.vegetation.counts():
+            plants, estimate = report.classes.get(plant.__name__, (0, None))
+            report.classes[plant.__name__] = (plants + count, estimate)
+
+        # Subsystems point back to the overworld, which is not theirs to count.
+        seen = {id(overworld)}
+
+        def size(obj: Any) -> int:
+            return footprint(obj, seen=seen)
+
+        vegetation = sum(count for _, count in overworld.vegetation.counts())
+        scent = len(getattr(overworld.scent, "fields", ()))
+        biome = overworld.biome
+        cached = len(biome.chunks) + BiomeManager.get_biome.cache_info().currsize
+        listeners = bus.listeners
+        report.subsystems = {
+            "registry": (len(overworld.entities), size(overworld.entities)),
+            "food": (len(overworld.food), size(overworld.food)),
+            "spawners": (len(overworld.spawners), size(overworld.spawners)),
+            "vegetation": (vegetation, size(overworld.vegetation)),
+            "scent": (scent, size(overworld.scent)),
+            "lod": (len(overworld.lod.populations), size(overworld.lod)),
+            "analytics": (len(overworld.analytics.species), size(overworld.analytics)),
+            "biome cache": (cached, biome.memory),
+            "progress": (len(overworld._progress), size(overworld._progress)),
+            "event bus": (
+                sum(len(funcs) for funcs in listeners.values()),
+                size(listeners) + sum(size(funcs) for funcs in listeners.values()),
+            ),
+            "tracer": (tracer.capacity if tracer.enabled else 0, size(tracer)),
+        }
+
+        if tracemalloc.is_tracing():
+            report.traced = self._traced()
+        return report
+
+    @staticmethod
+    def _traced() -> Dict[str, int]:
+        """
+        Return the traced bytes of every ecosphere package, and of everything else.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        traced: Dict[str, int] = Counter()
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            filename = stat.traceback[0].filename
+            if filename.startswith(root):
+                package = os.path.relpath(os.path.dirname(filename), root)
+                if package == os.curdir:
+                    traced["ecosphere"] += stat.size
+                else:
+                    traced["ecosphere." + package.replace(os.sep, ".")] += stat.size
+            else:
+                traced["other"] += stat.size
+        return dict(traced.most_common())
+
+    def toggle_reporting(self):
+        """
+        Start or stop publishing reports, at most every `MEMORY_SAMPLE_INTERVAL`
+        seconds. A None report is published when reporting stops.
+        """
+        self.reporting = not self.reporting
+        self._sampled_at = 0.0
+        if self.reporting:
+            self._publish()
+        else:
+            self.report = None
+            bus.emit("memory:sampled", None)
+
+    def _publish(self):
+        self.report = self.sample()
+        self._sampled_at = time.monotonic()
+        bus.emit("memory:sampled", self.report)
+
+    def update(self, minute: int):
+        """
+        Check the budget every `MEMORY_CHECK_EVERY` minutes, and publish a report
+        if they are asked for and the last one is old enough.
+        """
+        if minute % MEMORY_CHECK_EVERY == 0:
+            rss = self.rss()
+            if rss > self.budget:
+                self.trim(rss)
+
+        if (
+            self.reporting
+            and time.monotonic() - self._sampled_at >= MEMORY_SAMPLE_INTERVAL
+        ):
+            self._publish()
+
+    def trim(self, rss: Optional[int] = None):
+        """
+        Free what the overworld can do without until the process is under the
+        low-water mark, `MEMORY_LOW_WATER` of the budget: dead animals first, then
+        stale food, then the caches.
+
+        The caches are filled again as soon as they are used, so they are left alone
+        once a trim freed nothing and stayed over the mark, until a later trim frees
+        something again. Only the first of such fruitless trims is logged.
+        """
+        overworld = self.overworld
+        low_water = self.budget * MEMORY_LOW_WATER
+        self.trims += 1
+
+        def over() -> bool:
+            gc.collect()
+            return self.rss() > low_water
+
+        dead = overworld.reap_dead()
+        overworld.forget_removed()
+        food = chunks = 0
+        if over():
+            food = overworld.expire_food(FOOD_STALE_AFTER)
+        if over() and not self._fruitless:
+            chunks = overworld.biome.clear_cache()
+
+        fruitless = not (dead or food) and over()
+        if not self._fruitless:
+            logging.warning(
+                "Memory over budget (%d of %d MB): reaped %d dead animals, %d stale "
+                "food and %d biome chunks.%s",
+                (rss or self.rss()) >> 20,
+                self.budget >> 20,
+                dead,
+                food,
+                chunks,
+                (
+                    " Nothing more to free, caches are kept until something is."
+                    if fruitless
+                    else ""
+                ),
+            )
+        self._fruitless = fruitless
+        bus.emit("memory:trimmed", self)
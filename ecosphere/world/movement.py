@@ -0,0 +1,85 @@
+from typing import TYPE_CHECKING, Dict, Tuple
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.abc.position import Position
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class MovementPhase:
+    """
+    Moves requested during a clock tick, resolved and applied together at its end.
+
+    Animals only ask to step into a cell. When the tick ends every request is checked
+    against the occupancy at the start of the phase: cells outside the overworld or
+    taken by another animal are refused, and when several animals want the same cell
+    the one with the lowest key, i.e. the oldest, gets it. The others stay where
+    they are. Cells vacated by the phase only become free for the next one, so the
+    outcome does not depend on the order the requests came in. Plants don't block
+    the way, as animals have always walked over them.
+
+    Attributes:
+        overworld: Overworld object the entities move in
+    """
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+
+        self._requests: Dict[int, Tuple[Entity, int, int]] = {}
+
+        self.moved = 0  # Moves applied by the last phase
+        self.refused = 0  # Moves refused by the last phase
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def request(self, entity: Entity, position: Position):
+        """
+        Ask to move the entity to the given position at the end of the tick,
+        replacing any move it asked for earlier in the tick.
+        """
+        if position == entity.position:
+            self._requests.pop(entity.key, None)
+            return
+
+        self._requests[entity.key] = (entity, position.x, position.y)
+
+    def resolve(self) -> int:
+        """
+        Apply the requested moves that win their cell and return how many did.
+        """
+        registry = self.overworld.entities
+        requests = [
+            request for request in self._requests.values() if request[0] in registry
+        ]
+        self._requests.clear()
+
+        n = len(requests)
+        if not n:
+            self.moved = self.refused = 0
+            return 0
+
+        keys = np.fromiter((request[0].key for request in requests), np.int64, n)
+        x = np.fromiter((request[1] for request in requests), np.int64, n)
+        y = np.fromiter((request[2] for request in requests), np.int64, n)
+
+        width, height = self.overworld.width, self.overworld.height
+        free = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        free[free] = registry.dynamic_occupancy[y[free], x[free]] == 0
+
+        # Order the candidates by cell, then by key, and keep the first of every cell.
+        candidates = np.flatnonzero(free)
+        cells = y[candidates] * width + x[candidates]
+        order = np.lexsort((keys[candidates], cells))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = cells[order][1:] != cells[order][:-1]
+        winners = candidates[order[first]]
+
+        entities = [requests[i][0] for i in winners.tolist()]
+        registry.move_many(entities, x[winners], y[winners])
+
+        self.moved, self.refused = len(winners), n - len(winners)
+        return self.moved
@@ -1,51 +1,96 @@
-import asyncio
-import curses
-import itertools
 import logging
-import random
-from typing import Any, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
 
 from ecosphere.abc.entity import Entity
 from ecosphere.abc.position import Position
 from ecosphere.common.event_bus import bus
 from ecosphere.common.onetime_caller import OneTimeCaller
+from ecosphere.common.rng import rng
 from ecosphere.common.singleton import SingletonMeta
 from ecosphere.config import (
-    ENTITIES,
-    ENTITY_BIOME_SPAWN_RATES,
-    FOOD_BIOME_SPAWN_RATES,
-    MINUTE_LENGTH,
-    SPAWNERS,
+    BIOME_MEMORY_BUDGET,
+    CHUNK_SIZE,
+    FOOD,
+    MEMORY_BUDGET,
+    REAP_DEAD_AFTER,
+    SPECIES,
+    TICKS_PER_MINUTE,
 )
 from ecosphere.entities.food import Food
 from ecosphere.entities.food_spawner import FoodSpawner
-from ecosphere.states import DeadState
+from ecosphere.render import CursesRenderer, Renderer, Viewport
+from ecosphere.states import DeadState, idle_transitions
+from ecosphere.world.analytics import PopulationAnalytics
 from ecosphere.world.biome import Biome, BiomeManager
+from ecosphere.world.clock import SimulationClock
+from ecosphere.world.food_layer import FoodLayer
+from ecosphere.world.lod import LevelOfDetail
+from ecosphere.world.matchmaking import Matchmaker
+from ecosphere.world.memory import MemoryAccountant
+from ecosphere.world.movement import MovementPhase
+from ecosphere.world.populator import Populator
+from ecosphere.world.registry import EntityRegistry
+from ecosphere.world.scent import ScentFields
+from ecosphere.world.spawner_pool import SpawnerPool
+from ecosphere.world.vegetation import VegetationLayer
 
 
 class Overworld(metaclass=SingletonMeta):
-    def __init__(self, stdscr: Any, width: int, height: int):
+    def __init__(
+        self,
+        stdscr: Any,
+        width: int,
+        height: int,
+        renderer: Optional[Renderer] = None,
+        viewport: Optional[Viewport] = None,
+        lod: bool = False,
+        lod_focus: Optional[Tuple[int, int, int, int]] = None,
+        clock: Optional[SimulationClock] = None,
+        vegetation: bool = False,
+        scent: bool = False,
+        memory_budget: int = MEMORY_BUDGET,
+    ):
         self.stdscr = stdscr
+        self.renderer = renderer or CursesRenderer(stdscr)
 
         self.width = width
         self.height = height
 
-        self.entities: List[Entity] = []
-        self.spawners: List[FoodSpawner] = []
-        self.food: List[Food] = []
-
-        self.biome = BiomeManager(stdscr, self.width, self.height)
-
-        self._static_drawn = False
+        self.viewport = viewport or Viewport(width, height, width, height)
+
+        self.entities = EntityRegistry(self.width, self.height)
+        self.food = FoodLayer(self.width, self.height, FOOD)
+        self.spawners = SpawnerPool(self.food)
+
+        self.biome = BiomeManager(
+            self.renderer,
+            self.width,
+            self.height,
+            chunk_size=CHUNK_SIZE,
+            memory_budget=BIOME_MEMORY_BUDGET,
+        )
+
+        self.vegetation = VegetationLayer(self, enabled=vegetation)
+        self.scent = ScentFields(self, enabled=scent)
+        self.lod = LevelOfDetail(self, enabled=lod, focus=lod_focus)
+        self.movement = MovementPhase(self)
+        self.matchmaker = Matchmaker(self)
+        self.analytics = PopulationAnalytics(self)
+        self.memory = MemoryAccountant(self, budget=memory_budget)
+        self.clock = clock or SimulationClock()
+        self._progress: Dict[int, float] = {}  # Updates owed to every entity
 
     def _calculate_entity_cap(self, frequency: float = 0.25):
         return self.width * self.height * frequency
 
     def _calculate_position(self):  # UNSAFE TODO
+        stream = rng.stream("overworld")
         occupied = True
         while occupied:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
+            x = stream.randint(0, self.width - 1)
+            y = stream.randint(0, self.height - 1)
             position = Position(x=x, y=y)
 
             if not self.is_occupied(position):
@@ -54,49 +99,7 @@ class Overworld(metaclass=SingletonMeta):
         return position
 
     def _get_spawn_rate(self, entity: Entity, biome: Biome, *, spawner: bool = False):
-        rates = FOOD_BIOME_SPAWN_RATES if spawner else ENTITY_BIOME_SPAWN_RATES
-
-        for entity_biome_spawn_rate in rates:
-            entity_name = (
-                entity_biome_spawn_rate.food_name
-                if spawner
-                else entity_biome_spawn_rate.entity_name
-            )
-            if entity_name == entity.__name__:
-                return getattr(entity_biome_spawn_rate.spawn_rates, biome.name, 0)
-        return 0
-
-    def _draw_entity(self, entity: Entity, position: Position):
-        biome = self.biome.get_biome_by_coords(position.x, position.y)
-        biome_color = self.biome.get_biome_color(biome)
-
-        char = entity.representation
-
-        try:
-            self.stdscr.addstr(position.y, position.x, char, biome_color)
-        except curses.error:
-            pass
-
-    def draw(self, force_static: bool = False):
-        """
-        Draw all the existing entities on the board.
-        """
-        logging.debug("Drawing entities in the overworld.")
-        if not self._static_drawn or force_static:
-            self.biome.draw()
-
-            static_entities = [entity for entity in self.entities if not entity.dynamic]
-            for entity in static_entities:
-                self._draw_entity(entity, entity.position)
-            self._static_drawn = True
-
-        entities = [entity for entity in self.entities if entity.dynamic]
-
-        dynamic_entities = itertools.chain(entities, self.food)
-
-        for entity in dynamic_entities:
-            self._draw_entity(entity, entity.position)
-        logging.debug("Entities drawn.")
+        return SPECIES.spawn_rate(entity, biome)
 
     def end(self):
         """
@@ -106,24 +109,26 @@ class Overworld(metaclass=SingletonMeta):
         self.stdscr.clear()
 
     def get_entity_at_position(
-        self, position: Position, dynamic_only: bool = True, range: int = 2
-    ):
-        entities = [
-            entity for entity in self.entities if not dynamic_only or entity.dynamic
-        ]
-        for entity in entities:
-            if entity.position.is_within_range(position, range):
-                return entity
+        self, position: Position, dynamic_only: bool = True
+    ) -> Optional[Entity]:
+        """
+        Return the entity drawn on the cell. Glyphs are two cells wide, so the
+        cell to the left is checked too.
+        """
+        for x in (position.x, position.x - 1):
+            for entity in self.entities.at(Position(x, position.y)):
+                if not dynamic_only or entity.dynamic:
+                    return entity
         return None
 
     def get_nearby_entities(
         self, entity: Entity, perception_range: int
     ) -> List[Entity]:
-        nearby_entities = []
-        for other_entity in itertools.filterfalse(lambda e: e == entity, self.entities):
-            if entity.position.is_within_range(other_entity.position, perception_range):
-                nearby_entities.append(entity)
-        return nearby_entities
+        return [
+            other_entity
+            for other_entity in self.entities.near(entity.position, perception_range)
+            if other_entity is not entity
+        ]
 
     def get_nearby_food(
         self,
@@ -132,63 +137,128 @@ class Overworld(metaclass=SingletonMeta):
         *,
         food_type: List[Type[Food]] = None,
     ) -> List[Food]:
-        nearby_food = []
+        return [
+            self.get_food_at_position(food_position)
+            for food_position in self.food.in_range(
+                position, perception_range, food_type
+            )
+        ]
 
-        if food_type:
-            food_list = [
-                food for food in self.food if isinstance(food, tuple(food_type))
-            ]
-        else:
-            food_list = self.food
+    def get_nearest_food(
+        self,
+        position: Position,
+        perception_range: int,
+        *,
+        food_type: List[Type[Food]] = None,
+    ) -> Food:
+        """
+        Return the food closest to the given position within the perception range.
+        """
+        food_position = self.food.nearest(position, perception_range, food_type)
+        if food_position is None:
+            return None
+        return self.get_food_at_position(food_position)
 
-        for food in food_list:
-            if position.is_within_range(food.position, perception_range):
-                nearby_food.append(food)
-        return nearby_food
+    def get_food_at_position(self, position: Position) -> Food:
+        if not (0 <= position.x < self.width and 0 <= position.y < self.height):
+            return None
+
+        biome = self.biome.get_biome_by_coords(position.x, position.y)
+        return self.food.materialise(position, biome)
 
     def is_occupied(self, position: Position) -> bool:
-        return position in [entity.position for entity in self.entities]
+        return self.entities.is_occupied(position)
 
-    async def update_entity(self, entity: Entity):
-        while not isinstance(entity.state, DeadState):
-            await entity.update(self, self.biome)
-            await asyncio.sleep(MINUTE_LENGTH / entity.properties.movement_speed)
+    def occupied_cells(self) -> np.ndarray:
+        """
+        Return a (height, width) mask of the cells taken by an entity, a plant or
+        food.
+        """
+        occupied = self.food.occupied | (self.entities.occupancy > 0)
+        if self.vegetation.enabled:
+            occupied |= self.vegetation.kind != 0
+        return occupied
 
-    async def update_spawner(self, spawner: FoodSpawner):
-        while True:
-            await spawner.update(self, self.biome)
-            await asyncio.sleep(MINUTE_LENGTH / spawner.properties.dispersal_speed)
+    async def update_entities(self):
+        """
+        Run one clock tick of the dynamic entities.
 
-    async def update(self):
+        Every entity accumulates its movement speed in updates per minute and is
+        updated once per whole update owed, so faster animals act more often. Mates
+        are paired and the scents spread before the updates. Idle entities decide
+        what to do next together, and the moves the entities ask for are applied
+        together, once all of them are updated.
+        """
+        self.matchmaker.match()
+        self.scent.update()
+
+        is_active = self.lod.is_active
+        stream = rng.stream("overworld")
+        for entity in list(self.entities.dynamic):
+            if entity not in self.entities or entity.state_code == DeadState.code:
+                continue
+
+            # Start at a random phase, so entities don't all act on the same tick.
+            progress = self._progress.get(entity.key)
+            if progress is None:
+                progress = stream.random()
+            progress += entity.properties.movement_speed / TICKS_PER_MINUTE
+
+            # Away from the viewport, skip updates and catch up on the needs.
+            steps = 1 if is_active(entity.position) else self.lod.factor
+            while progress >= steps and entity.state_code != DeadState.code:
+                if entity in idle_transitions:
+                    # Updated again within the tick, it has to decide first.
+                    idle_transitions.flush()
+                    continue
+                progress -= steps
+                await entity.update(self, self.biome)
+                entity.advance_status(steps - 1)
+
+            self._progress[entity.key] = progress
+
+        idle_transitions.flush()
+        self.movement.resolve()
+
+    def update_world(self, minute: int):
         """
-        Update overworld.
+        Run the world-wide updates of a simulation minute: food spawning, reaping,
+        population analytics and the memory budget.
+        """
+        self.food.minute = minute
+        self.spawners.update(self, minute)
+        self.vegetation.update(minute)
+        self.lod.update(minute)
+        if minute % REAP_DEAD_AFTER == 0:
+            self.reap_dead()
+
+        self.analytics.update(minute)
+        self.memory.update(minute)
+        bus.emit("minute:passed")
+
+    async def update(self, minutes: Optional[int] = None):
+        """
+        Update overworld, one simulation clock tick at a time, forever or for the
+        given number of simulation minutes.
         """
         logging.info("Updating overworld.")
-        update_tasks = [
-            (
-                asyncio.create_task(self.update_spawner(entity))
-                if isinstance(entity, FoodSpawner)
-                else asyncio.create_task(self.update_entity(entity))
-            )
-            for entity in itertools.chain(
-                [e for e in self.entities if e.dynamic], self.spawners
-            )
-        ]
-
-        await asyncio.gather(*update_tasks)
-
-        logging.info("Overworld updated.")
+        while minutes is None or self.clock.tick < minutes * TICKS_PER_MINUTE:
+            tick = await self.clock.wait()
+            if tick % TICKS_PER_MINUTE == 0:
+                self.update_world(tick // TICKS_PER_MINUTE)
+            await self.update_entities()
 
     def _spawn_entities(self):
-        for entity_class in ENTITIES:
-            cap = self._calculate_entity_cap(entity_class.frequency)
-            for _ in range(round(cap)):
-                self.spawn_entity(entity_class, spawner=False)
+        entities, spawners = Populator(self).populate()
+        entities = self.vegetation.plant(entities)
 
-        for spawner_class in SPAWNERS:
-            cap = self._calculate_entity_cap(spawner_class.frequency)
-            for _ in range(round(cap)):
-                self.spawn_entity(spawner_class, spawner=True)
+        self.entities.extend(entities)
+        self.spawners.extend(spawners)
+
+        bus.emit("entities:created", entities + spawners)
+        logging.debug(
+            "%d entities and %d spawners spawned.", len(entities), len(spawners)
+        )
 
     def spawn_entities(self):
         """
@@ -203,28 +273,84 @@ class Overworld(metaclass=SingletonMeta):
         """
         Remove entity from the overworld.
         """
-        mapper = None
         if isinstance(entity, Food):
-            mapper = self.food
+            x, y = [entity.position.x], [entity.position.y]
+            self.food.consume(x, y)
+            self.spawners.food_removed(x, y)
         elif isinstance(entity, FoodSpawner):
-            mapper = self.spawners
+            self.spawners.remove(entity)
         else:
-            mapper = self.entities
+            self.entities.remove(entity)
 
-        mapper.remove(entity)
         bus.emit("entity:removed", entity)
-        logging.info(f"{entity} removed from the overworld.")
+        logging.debug("%s removed from the overworld.", entity)
 
-    def spawn_food(self, food: Food, position: Position):
+    def reap_dead(self) -> int:
         """
-        Spawn food at the given position.
+        Remove dead animals from the overworld, so they stop being scanned and drawn.
+        Returns the number of animals removed.
         """
-        biome = self.biome.get_biome_by_coords(position.x, position.y)
-        food = food.create(position, biome)
+        dead = [
+            entity
+            for entity in self.entities.dynamic
+            if entity.state_code == DeadState.code
+        ]
+        for entity in dead:
+            self.entities.remove(entity)
+            self._progress.pop(entity.key, None)
+            bus.emit("entity:removed", entity)
 
-        self.food.append(food)
-        bus.emit("entity:created", food)
-        logging.debug(f"{food} spawned at {position}.")
+        if dead:
+            logging.debug("Reaped %d dead animals.", len(dead))
+        return len(dead)
+
+    def expire_food(self, age: int) -> int:
+        """
+        Remove the food lying for at least `age` minutes. Returns the number of
+        food items removed.
+        """
+        x, y = self.food.stale(age)
+        if len(x):
+            self.food.consume(x, y)
+            self.spawners.food_removed(x, y)
+            logging.debug("%d stale food removed.", len(x))
+        return len(x)
+
+    def forget_removed(self):
+        """
+        Drop the update progress of the animals no longer in the overworld.
+        """
+        keys = {entity.key for entity in self.entities.dynamic}
+        self._progress = {
+            key: progress for key, progress in self._progress.items() if key in keys
+        }
+
+    def move_entity(self, entity: Entity, position: Position):
+        """
+        Move entity to the given position.
+        """
+        self.entities.move(entity, position)
+
+    def _add_food(self, kinds: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        placed = self.food.spawn(kinds, x, y)
+
+        spawned = np.bincount(
+            np.asarray(kinds)[placed], minlength=len(self.food.food_types) + 1
+        )
+        for food in self.food.food_types:
+            count = int(spawned[self.food.kind_of(food)])
+            if count:
+                bus.emit("food:created", food, count)
+                logging.debug("%d %s spawned.", count, food.__name__)
+        return placed
+
+    def spawn_food(self, food: Type[Food], position: Position):
+        """
+        Spawn food at the given position.
+        """
+        x, y = [position.x], [position.y]
+        if self._add_food([self.food.kind_of(food)], x, y).all():
+            self.spawners.food_added(x, y)
 
     def spawn_entity(
         self, entity: Entity, position: Position = None, *, spawner: bool = False
@@ -244,7 +370,7 @@ class Overworld(metaclass=SingletonMeta):
 
         spawn_rate = self._get_spawn_rate(entity, biome, spawner=spawner)
 
-        if random.random() < spawn_rate:
+        if rng.stream("overworld").random() < spawn_rate:
             entity = entity.create(position, biome)
 
             if spawner:
@@ -253,4 +379,4 @@ class Overworld(metaclass=SingletonMeta):
                 self.entities.append(entity)
 
             bus.emit("entity:created", entity)
-            logging.debug(f"{entity} spawned at {position}.")
+            logging.debug("%s spawned at %s.", entity, position)
@@ -0,0 +1,114 @@
+from typing import TYPE_CHECKING, List, Sequence, Tuple, Type
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.abc.position import Position
+from ecosphere.common.rng import rng
+from ecosphere.config import SPECIES
+from ecosphere.world.biome import BIOMES
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class Populator:
+    """
+    Draw the initial population of the overworld in a few vectorized passes.
+
+    For every class, `width * height * frequency` free cells are drawn at once and
+    each one is kept with the spawn rate of its biome. Kept cells are marked as
+    occupied before the next class is drawn, so entities never collide.
+
+    Attributes:
+        overworld: Overworld object to populate
+    """
+
+    def __init__(self, overworld: "Overworld"):
+        self.overworld = overworld
+        self._rng = rng.generator("populator")
+
+    def _draw(
+        self,
+        classes: Sequence[Type[Entity]],
+        rates: np.ndarray,
+        occupied: np.ndarray,
+        *,
+        block: bool,
+    ) -> List[Entity]:
+        width = self.overworld.width
+
+        entities = []
+        for row, entity_class in enumerate(classes):
+            free = np.flatnonzero(~occupied.ravel())
+            cap = min(
+                round(self.overworld._calculate_entity_cap(entity_class.frequency)),
+                len(free),
+            )
+            cells = self._rng.choice(free, size=cap, replace=False)
+
+            biome_ids = self.overworld.biome.ids_at(cells % width, cells // width)
+            keep = self._rng.random(cap) < rates[row, biome_ids]
+            cells, biome_ids = cells[keep], biome_ids[keep]
+            if block:
+                occupied.ravel()[cells] = True
+
+            entities.extend(
+                entity_class.create(Position(x, y), BIOMES[biome])
+                for x, y, biome in zip(
+                    (cells % width).tolist(),
+                    (cells // width).tolist(),
+                    biome_ids.tolist(),
+                )
+            )
+        return entities
+
+    def populate(self) -> Tuple[List[Entity], List[Entity]]:
+        """
+        Create the initial entities and food spawners, without adding them.
+        """
+        occupied = self.overworld.occupied_cells()
+
+        entities = self._draw(
+            SPECIES.entities, SPECIES.entity_rates, occupied, block=True
+        )
+        # Spawners do not take up their cell, like in `Overworld.spawn_entity`.
+        spawners = self._draw(
+            SPECIES.spawners, SPECIES.spawner_rates, occupied, block=False
+        )
+        return entities, spawners
+
+    def scatter(self, count: int) -> List[Entity]:
+        """
+        Create about `count` animals, split evenly between the species, on free
+        cells of the biomes every species spawns in, without adding them. Used to
+        build worlds of a given density, whatever the spawn rates.
+        """
+        overworld = self.overworld
+        width = overworld.width
+        occupied = overworld.occupied_cells()
+
+        free = np.flatnonzero(~occupied.ravel())
+        biome_ids = overworld.biome.ids_at(free % width, free // width)
+
+        animals = []
+        species = SPECIES.animals
+        for row, animal_class in enumerate(species):
+            share = count // len(species) + (row < count % len(species))
+            rates = SPECIES.entity_rates[SPECIES.entities.index(animal_class)]
+            habitat = np.flatnonzero((rates[biome_ids] > 0) & ~occupied.ravel()[free])
+            chosen = self._rng.choice(
+                habitat, size=min(share, len(habitat)), replace=False
+            )
+            cells = free[chosen]
+            occupied.ravel()[cells] = True
+
+            animals.extend(
+                animal_class.create(Position(x, y), BIOMES[biome])
+                for x, y, biome in zip(
+                    (cells % width).tolist(),
+                    (cells // width).tolist(),
+                    biome_ids[chosen].tolist(),
+                )
+            )
+        return animals
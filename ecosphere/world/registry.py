@@ -0,0 +1,213 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Type
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.abc.position import Position
+
+
+class _View:
+    """
+    List of the registry entities matching a predicate, with their index in it.
+    """
+
+    def __init__(self, predicate: Callable[[Entity], bool], entities: List[Entity]):
+        self.predicate = predicate
+        self.items = [entity for entity in entities if predicate(entity)]
+        self.index = {entity.id: i for i, entity in enumerate(self.items)}
+
+    def add(self, entity: Entity):
+        if self.predicate(entity):
+            self.index[entity.id] = len(self.items)
+            self.items.append(entity)
+
+    def discard(self, entity: Entity):
+        i = self.index.pop(entity.id, None)
+        if i is None:
+            return
+
+        last = self.items.pop()
+        if last is not entity:
+            self.items[i] = last
+            self.index[last.id] = i
+
+
+class EntityRegistry:
+    """
+    Entities of the overworld keyed by id and stored in dense slots.
+
+    Removing an entity moves the last one into its slot, so adding and removing are
+    O(1). Entity coordinates are mirrored in arrays and in per-cell occupancy
+    counts, of all entities and of the dynamic ones, which answer occupancy and area
+    queries without scanning the entities.
+    Lists of dynamic, static and per-species entities are built on first use and
+    kept up to date in place with the same swap removal, so they never need a scan
+    of the whole registry again.
+
+    Attributes:
+        width: int representing the width of the overworld
+        height: int representing the height of the overworld
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+        self._entities: List[Entity] = []
+        self._slots: Dict[str, int] = {}
+
+        self.x = np.zeros(64, dtype=np.int32)
+        self.y = np.zeros(64, dtype=np.int32)
+        self.occupancy = np.zeros((height, width), dtype=np.int16)
+        self.dynamic_occupancy = np.zeros((height, width), dtype=np.int16)
+
+        self._views: Dict[object, _View] = {}
+
+    def __iter__(self) -> Iterator[Entity]:
+        return iter(self._entities)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity.id in self._slots
+
+    def __getitem__(self, entity_id: str) -> Entity:
+        return self._entities[self._slots[entity_id]]
+
+    def _reserve(self, size: int):
+        if size <= len(self.x):
+            return
+
+        capacity = max(size, 2 * len(self.x))
+        self.x = np.resize(self.x, capacity)
+        self.y = np.resize(self.y, capacity)
+
+    def append(self, entity: Entity):
+        self.extend([entity])
+
+    def extend(self, entities: Iterable[Entity]):
+        entities = list(entities)
+        if not entities:
+            return
+
+        start = len(self._entities)
+        self._reserve(start + len(entities))
+
+        x = np.array([entity.position.x for entity in entities], dtype=np.int32)
+        y = np.array([entity.position.y for entity in entities], dtype=np.int32)
+        self.x[start : start + len(entities)] = x
+        self.y[start : start + len(entities)] = y
+        np.add.at(self.occupancy, (y, x), 1)
+        dynamic = np.array([entity.dynamic for entity in entities], dtype=bool)
+        np.add.at(self.dynamic_occupancy, (y[dynamic], x[dynamic]), 1)
+
+        for slot, entity in enumerate(entities, start=start):
+            self._slots[entity.id] = slot
+        self._entities.extend(entities)
+        for view in self._views.values():
+            for entity in entities:
+                view.add(entity)
+
+    def remove(self, entity: Entity):
+        slot = self._slots.pop(entity.id)
+        self.occupancy[self.y[slot], self.x[slot]] -= 1
+        if entity.dynamic:
+            self.dynamic_occupancy[self.y[slot], self.x[slot]] -= 1
+
+        last = len(self._entities) - 1
+        if slot != last:
+            moved = self._entities[last]
+            self._entities[slot] = moved
+            self._slots[moved.id] = slot
+            self.x[slot] = self.x[last]
+            self.y[slot] = self.y[last]
+
+        self._entities.pop()
+        for view in self._views.values():
+            view.discard(entity)
+
+    def move(self, entity: Entity, position: Position):
+        """
+        Move the entity to the given position, keeping the occupancy up to date.
+        """
+        slot = self._slots[entity.id]
+        self.occupancy[self.y[slot], self.x[slot]] -= 1
+        self.occupancy[position.y, position.x] += 1
+        if entity.dynamic:
+            self.dynamic_occupancy[self.y[slot], self.x[slot]] -= 1
+            self.dynamic_occupancy[position.y, position.x] += 1
+        self.x[slot] = position.x
+        self.y[slot] = position.y
+
+        entity._move(position.x, position.y, overwrite=True)
+
+    def move_many(self, entities: List[Entity], x: np.ndarray, y: np.ndarray):
+        """
+        Move every entity to its (x, y) cell, updating the arrays in one go.
+        """
+        slots = np.array([self._slots[entity.id] for entity in entities], np.intp)
+        np.subtract.at(self.occupancy, (self.y[slots], self.x[slots]), 1)
+        np.add.at(self.occupancy, (y, x), 1)
+
+        dynamic = np.array([entity.dynamic for entity in entities], dtype=bool)
+        old = (self.y[slots[dynamic]], self.x[slots[dynamic]])
+        np.subtract.at(self.dynamic_occupancy, old, 1)
+        np.add.at(self.dynamic_occupancy, (y[dynamic], x[dynamic]), 1)
+        self.x[slots] = x
+        self.y[slots] = y
+
+        for entity, new_x, new_y in zip(entities, x.tolist(), y.tolist()):
+            entity._move(new_x, new_y, overwrite=True)
+
+    def is_occupied(self, position: Position) -> bool:
+        return self.occupancy[position.y, position.x] > 0
+
+    def at(self, position: Position) -> List[Entity]:
+        """
+        Return the entities on the given cell, scanning only when it is occupied.
+        """
+        x, y = position.x, position.y
+        if (
+            not (0 <= x < self.width and 0 <= y < self.height)
+            or not self.occupancy[y, x]
+        ):
+            return []
+        return self.in_rect(x, y, x + 1, y + 1)
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[Entity]:
+        """
+        Return the entities with x0 <= x < x1 and y0 <= y < y1.
+        """
+        count = len(self._entities)
+        x, y = self.x[:count], self.y[:count]
+        slots = np.flatnonzero((x >= x0) & (x < x1) & (y >= y0) & (y < y1))
+        return [self._entities[slot] for slot in slots.tolist()]
+
+    def near(self, position: Position, radius: int) -> List[Entity]:
+        """
+        Return the entities within `radius` cells of the position on both axes.
+        """
+        return self.in_rect(
+            position.x - radius,
+            position.y - radius,
+            position.x + radius + 1,
+            position.y + radius + 1,
+        )
+
+    def _view(self, key: object, predicate: Callable[[Entity], bool]) -> List[Entity]:
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = _View(predicate, self._entities)
+        return view.items
+
+    @property
+    def dynamic(self) -> List[Entity]:
+        return self._view("dynamic", lambda entity: entity.dynamic)
+
+    @property
+    def static(self) -> List[Entity]:
+        return self._view("static", lambda entity: not entity.dynamic)
+
+    def of_species(self, species: Type[Entity]) -> List[Entity]:
+        return self._view(species, lambda entity: type(entity) is species)
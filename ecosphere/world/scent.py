@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING, List, Optional, Sequence, Type
+
+import numpy as np
+
+from ecosphere.abc.position import Position
+from ecosphere.config import SCENT_DECAY, SCENT_DIFFUSION, SCENT_THRESHOLD, SPECIES
+from ecosphere.entities.animal import Animal
+from ecosphere.entities.food import Food
+from ecosphere.states import DeadState, MatingState
+from ecosphere.world.biome import Biome
+from ecosphere.world.matchmaking import MATING_URGE
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+SOURCE = 1.0  # Field value on the cells giving off a scent
+
+
+class ScentFields:
+    """
+    Scalar fields the animals perceive the overworld through, instead of searching
+    their perception radius for food, water and mates.
+
+    Every food kind, water and the mates of every animal species have a float field
+    over the overworld. On every clock tick each field spreads towards the 4
+    neighbours of every cell at the `SCENT_DIFFUSION` rate and fades by
+    `SCENT_DECAY`, then the cells holding the source (food of the kind, water,
+    animals of the species) are set to full strength again. Only animals ready to
+    mate but not looking for a mate themselves give off the scent of their species,
+    like the matchmaker only sends mates to them, so animals looking for a mate
+    don't follow their own trail. The update is a handful of array operations over
+    all the fields at once, however many sources there are. Following a scent is
+    then a lookup of the 8 cells around an animal, for the one the scent is
+    strongest on, so perception costs the same at any radius or density.
+
+    The water field needs the biome of every cell, so enabling the fields
+    generates the whole biome map once.
+
+    Attributes:
+        overworld: Overworld object the scents spread over
+        enabled: bool telling whether the animals follow the scents
+    """
+
+    def __init__(self, overworld: "Overworld", enabled: bool = False):
+        self.overworld = overworld
+        self.enabled = enabled
+
+        self.species: List[Type[Animal]] = list(SPECIES.animals)
+
+        if not enabled:
+            return
+
+        height, width = overworld.height, overworld.width
+        food_kinds = len(overworld.food.food_types)
+        self._water_layer = food_kinds
+        self._species_layers = {
+            species: food_kinds + 1 + i for i, species in enumerate(self.species)
+        }
+
+        layers = food_kinds + 1 + len(self.species)
+        self.fields = np.zeros((layers, height, width), dtype=np.float32)
+        self._spread = np.empty_like(self.fields)
+
+        biomes = overworld.biome.region((0, 0, width, height))
+        self._water = np.flatnonzero(biomes == Biome.WATER.value)
+
+    def update(self):
+        """
+        Spread and fade every field by one tick, then renew their sources.
+        """
+        if not self.enabled:
+            return
+
+        fields, spread = self.fields, self._spread
+
+        # Mean of the 4 neighbours, the cells beyond the edges having no scent.
+        spread.fill(0)
+        spread[:, 1:, :] += fields[:, :-1, :]
+        spread[:, :-1, :] += fields[:, 1:, :]
+        spread[:, :, 1:] += fields[:, :, :-1]
+        spread[:, :, :-1] += fields[:, :, 1:]
+        spread *= 0.25
+
+        spread -= fields
+        spread *= SCENT_DIFFUSION
+        spread += fields
+        spread *= SCENT_DECAY
+        self.fields, self._spread = spread, fields
+
+        self._renew_sources()
+
+    def _renew_sources(self):
+        fields = self.fields
+
+        kind = self.overworld.food.kind
+        ys, xs = np.nonzero(kind)
+        fields[kind[ys, xs].astype(np.intp) - 1, ys, xs] = SOURCE
+
+        fields[self._water_layer].ravel()[self._water] = SOURCE
+
+        layers, xs, ys = [], [], []
+        for animal in self.overworld.entities.dynamic:
+            if animal.mating_urge < MATING_URGE or animal.state_code in (
+                DeadState.code,
+                MatingState.code,
+            ):
+                continue
+            layers.append(self._species_layers[type(animal)])
+            xs.append(animal.position.x)
+            ys.append(animal.position.y)
+        fields[layers, ys, xs] = SOURCE
+
+    def _climb(self, layers: Sequence[int], position: Position) -> Optional[Position]:
+        """
+        Return the cell around the position the given fields are strongest on
+        together, or None if none of them can be smelled there.
+        """
+        x, y = position.x, position.y
+        x0, y0 = max(0, x - 1), max(0, y - 1)
+        window = self.fields[:, y0 : y + 2, x0 : x + 2][list(layers)].sum(axis=0)
+        window[y - y0, x - x0] = -1
+
+        best = int(np.argmax(window))
+        dy, dx = divmod(best, window.shape[1])
+        if window[dy, dx] <= SCENT_THRESHOLD:
+            return None
+        return Position(x0 + dx, y0 + dy)
+
+    def towards_food(
+        self, position: Position, food_type: Sequence[Type[Food]]
+    ) -> Optional[Position]:
+        """
+        Return the next cell on the way to the food of the given types, or of the
+        kinds of a diet mask.
+        """
+        if isinstance(food_type, np.ndarray):
+            return self._climb(np.flatnonzero(food_type[1:]), position)
+
+        food = self.overworld.food
+        return self._climb([food.kind_of(kind) - 1 for kind in food_type], position)
+
+    def towards_water(self, position: Position) -> Optional[Position]:
+        """
+        Return the next cell on the way to water.
+        """
+        return self._climb([self._water_layer], position)
+
+    def towards_mates(
+        self, position: Position, species: Type[Animal]
+    ) -> Optional[Position]:
+        """
+        Return the next cell on the way to the animals of the species ready to mate.
+        """
+        return self._climb([self._species_layers[species]], position)
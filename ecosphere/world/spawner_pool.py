@@ -0,0 +1,162 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, List
+
+import numpy as np
+
+from ecosphere.common.rng import rng
+from ecosphere.entities.food_spawner import FoodSpawner
+from ecosphere.world.food_layer import FoodLayer
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+
+class SpawnerPool:
+    """
+    All the food spawners of the overworld, processed together once per tick.
+
+    Spawner positions and properties are kept as arrays, together with a count of
+    live food in range of every spawner. The count is updated whenever food is
+    spawned or eaten, so saturated spawners are skipped without looking at the food.
+
+    Attributes:
+        food_layer: FoodLayer the spawners drop their food into
+    """
+
+    _COLUMNS = (
+        "x",
+        "y",
+        "kind",
+        "range",
+        "radius",
+        "capacity",
+        "period",
+        "next_due",
+        "count",
+    )
+
+    def __init__(self, food_layer: FoodLayer):
+        self.food_layer = food_layer
+        self.width = food_layer.width
+        self.height = food_layer.height
+
+        self.spawners: List[FoodSpawner] = []
+
+        self.x = np.empty(0, dtype=np.int32)
+        self.y = np.empty(0, dtype=np.int32)
+        self.kind = np.empty(0, dtype=np.int8)
+        self.range = np.empty(0, dtype=np.int32)
+        self.radius = np.empty(0, dtype=np.int32)
+        self.capacity = np.empty(0, dtype=np.int32)
+        self.period = np.empty(0, dtype=np.int32)
+        self.next_due = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int32)
+
+        self._rng = rng.generator("spawners")
+
+    def __iter__(self) -> Iterator[FoodSpawner]:
+        return iter(self.spawners)
+
+    def __len__(self) -> int:
+        return len(self.spawners)
+
+    def append(self, spawner: FoodSpawner):
+        self.extend([spawner])
+
+    def extend(self, spawners: Iterable[FoodSpawner]):
+        spawners = list(spawners)
+        if not spawners:
+            return
+
+        properties = [spawner.properties for spawner in spawners]
+        columns = {
+            "x": [spawner.position.x for spawner in spawners],
+            "y": [spawner.position.y for spawner in spawners],
+            "kind": [self.food_layer.kind_of(spawner.food) for spawner in spawners],
+            "range": [p.range_capacity for p in properties],
+            "radius": [p.dispersal_radius for p in properties],
+            "capacity": [p.range_capacity for p in properties],
+            "period": [max(1, round(1 / p.dispersal_speed)) for p in properties],
+            "next_due": [0] * len(spawners),
+            "count": [
+                self.food_layer.count_in_range(spawner.position, p.range_capacity)
+                for spawner, p in zip(spawners, properties)
+            ],
+        }
+
+        self.spawners.extend(spawners)
+        for name, values in columns.items():
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, values]).astype(column.dtype))
+
+    def remove(self, spawner: FoodSpawner):
+        index = self.spawners.index(spawner)
+        del self.spawners[index]
+
+        for name in self._COLUMNS:
+            setattr(self, name, np.delete(getattr(self, name), index))
+
+    def food_added(self, x: np.ndarray, y: np.ndarray):
+        """
+        Count newly spawned food in every spawner that has it in range.
+
+        Attributes:
+            x: array of x coordinates of the new food
+            y: array of y coordinates of the new food
+        """
+        self._update_counts(x, y, 1)
+
+    def food_removed(self, x: np.ndarray, y: np.ndarray):
+        """
+        Forget eaten or removed food in every spawner that had it in range.
+
+        Attributes:
+            x: array of x coordinates of the removed food
+            y: array of y coordinates of the removed food
+        """
+        self._update_counts(x, y, -1)
+
+    def _update_counts(self, x: np.ndarray, y: np.ndarray, delta: int):
+        if not len(self.spawners):
+            return
+
+        x = np.asarray(x, dtype=np.int32)
+        y = np.asarray(y, dtype=np.int32)
+
+        # Chunk the food so the (food x spawners) masks stay small on big maps.
+        step = max(1, 2**20 // len(self.spawners))
+        for start in range(0, len(x), step):
+            fx = x[start : start + step, None]
+            fy = y[start : start + step, None]
+            in_range = (np.abs(self.x - fx) <= self.range) & (
+                np.abs(self.y - fy) <= self.range
+            )
+            self.count += delta * in_range.sum(axis=0, dtype=np.int32)
+
+    def update(self, overworld: "Overworld", tick: int):
+        """
+        Let every due spawner that is not saturated drop food around itself.
+
+        Attributes:
+            overworld: Overworld object the food is spawned into
+            tick: int representing the current tick
+        """
+        active = np.flatnonzero((self.next_due <= tick) & (self.count < self.capacity))
+        if not len(active):
+            return
+
+        self.next_due[active] = tick + self.period[active]
+
+        need = self.capacity[active] - self.count[active]
+        owner = np.repeat(active, need)
+
+        radius = self.radius[owner]
+        x = self.x[owner] + self._rng.integers(-radius, radius + 1)
+        y = self.y[owner] + self._rng.integers(-radius, radius + 1)
+        np.clip(x, 0, self.width - 1, out=x)
+        np.clip(y, 0, self.height - 1, out=y)
+
+        free = ~overworld.occupied_cells()[y, x]
+        x, y, owner = x[free], y[free], owner[free]
+
+        placed = overworld._add_food(self.kind[owner], x, y)
+        self.food_added(x[placed], y[placed])
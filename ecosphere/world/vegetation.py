@@ -0,0 +1,193 @@
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+
+from ecosphere.abc.entity import Entity
+from ecosphere.common.rng import rng
+from ecosphere.config import (
+    SPECIES,
+    VEGETATION_CROWDED,
+    VEGETATION_MATURE,
+    VEGETATION_RULES,
+    VEGETATION_STEP,
+)
+from ecosphere.entities.plant import Plant
+from ecosphere.world.biome import Biome
+
+if TYPE_CHECKING:
+    from ecosphere.world.overworld import Overworld
+
+EMPTY = 0
+SEEDLING = "🌱"
+
+
+def _neighbours(mask: np.ndarray) -> np.ndarray:
+    """
+    Count the set cells among the 8 neighbours of every cell.
+    """
+    height, width = mask.shape
+    padded = np.pad(mask.astype(np.int8), 1)
+    count = np.zeros(mask.shape, dtype=np.int8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy != 1 or dx != 1:
+                count += padded[dy : dy + height, dx : dx + width]
+    return count
+
+
+class VegetationLayer:
+    """
+    Plants of the overworld as a cellular automaton over per-cell arrays, instead of
+    static entities.
+
+    Every cell holds a plant kind (0 for none), a growth stage, an age in steps and
+    the variant of its glyph. Every `VEGETATION_STEP` minutes all plants grow, each
+    free cell may be seeded by the grown plants around it and plants die off, at
+    the rates of `VEGETATION_RULES` for the biome of the cell. Neighbourhoods are
+    counted by summing shifted arrays, so a step costs a few array operations
+    however many plants there are.
+
+    The layer needs the biome of every cell, so enabling it generates the whole
+    biome map once.
+
+    Attributes:
+        overworld: Overworld object the plants grow in
+        enabled: bool telling whether plants live in the layer rather than the registry
+    """
+
+    def __init__(self, overworld: "Overworld", enabled: bool = False):
+        self.overworld = overworld
+        self.enabled = enabled
+
+        self.plants: List[Type[Plant]] = list(SPECIES.plants)
+        self._counts = np.zeros(len(self.plants) + 1, dtype=np.int64)
+
+        if not enabled:
+            return
+
+        height, width = overworld.height, overworld.width
+        self.kind = np.zeros((height, width), dtype=np.int8)
+        self.stage = np.zeros((height, width), dtype=np.int8)
+        self.age = np.zeros((height, width), dtype=np.int16)
+        self.variant = np.zeros((height, width), dtype=np.int8)
+        self.biomes = overworld.biome.region((0, 0, width, height))
+
+        self._rng = rng.generator("vegetation")
+
+        biome_count = max(biome.value for biome in Biome) + 1
+        kinds = len(self.plants) + 1
+        self._spread = np.zeros((kinds, biome_count, 9), dtype=np.float32)
+        self._death = np.zeros((kinds, biome_count), dtype=np.float32)
+        self._max_age = np.full((kinds, biome_count), np.iinfo(np.int16).max)
+        for rule in VEGETATION_RULES:
+            kind = self.kind_of(rule.plant_name)
+            for biome in Biome:
+                spread = getattr(rule.spread_rates, biome.name)
+                # Chance of being seeded by any of 0 to 8 grown neighbours.
+                self._spread[kind, biome.value] = 1 - (1 - spread) ** np.arange(9)
+                self._death[kind, biome.value] = getattr(rule.death_rates, biome.name)
+                self._max_age[kind, biome.value] = rule.max_age
+
+        self._glyphs = [
+            [
+                getattr(plant, "representations", {}).get(biome, (" ",))
+                for biome in sorted(Biome, key=lambda biome: biome.value)
+            ]
+            for plant in self.plants
+        ]
+
+    def kind_of(self, plant_name: str) -> int:
+        return [plant.__name__ for plant in self.plants].index(plant_name) + 1
+
+    def counts(self) -> Iterator[Tuple[Type[Plant], int]]:
+        """
+        Yield every plant class with the number of its plants in the layer.
+        """
+        for kind, plant in enumerate(self.plants, start=1):
+            yield plant, int(self._counts[kind])
+
+    def plant(self, entities: List[Entity]) -> List[Entity]:
+        """
+        Take the plants out of the entities into the layer, already grown and of
+        random ages. Returns the other entities.
+        """
+        if not self.enabled:
+            return entities
+
+        plants = [entity for entity in entities if type(entity) in self.plants]
+        if plants:
+            x = np.array([plant.position.x for plant in plants])
+            y = np.array([plant.position.y for plant in plants])
+            kinds = np.array([self.plants.index(type(plant)) + 1 for plant in plants])
+
+            self.kind[y, x] = kinds
+            self.stage[y, x] = VEGETATION_MATURE
+            max_age = self._max_age[kinds, self.biomes[y, x]]
+            self.age[y, x] = self._rng.integers(0, max_age)
+            self.variant[y, x] = self._rng.integers(0, 120, len(plants))
+            self._counts = np.bincount(self.kind.ravel(), minlength=len(self._counts))
+
+        return [entity for entity in entities if type(entity) not in self.plants]
+
+    def update(self, minute: int):
+        if self.enabled and minute % VEGETATION_STEP == 0:
+            self.step()
+
+    def step(self):
+        """
+        Grow, spread and kill the plants by one step.
+        """
+        kind, stage, age, biomes = self.kind, self.stage, self.age, self.biomes
+
+        alive = kind != EMPTY
+        age[alive] += 1
+        np.minimum(stage + alive, VEGETATION_MATURE, out=stage)
+
+        # Plants only sprout on cells free of food and entities, and not too crowded.
+        free = ~alive & ~self.overworld.occupied_cells()
+        free &= _neighbours(alive) <= VEGETATION_CROWDED
+        grown = alive & (stage >= VEGETATION_MATURE)
+        for plant_kind in range(1, len(self.plants) + 1):
+            count = _neighbours(grown & (kind == plant_kind))
+            chance = self._spread[plant_kind][biomes, count]
+            seeded = free & (self._rng.random(kind.shape, dtype=np.float32) < chance)
+
+            kind[seeded] = plant_kind
+            stage[seeded] = 0
+            age[seeded] = 0
+            self.variant[seeded] = self._rng.integers(0, 120, int(seeded.sum()))
+            free &= ~seeded
+
+        dying = alive & (
+            (self._rng.random(kind.shape, dtype=np.float32) < self._death[kind, biomes])
+            | (age >= self._max_age[kind, biomes])
+        )
+        kind[dying] = EMPTY
+
+        self._counts = np.bincount(kind.ravel(), minlength=len(self._counts))
+
+    def glyph(self, x: int, y: int) -> Optional[str]:
+        kind = int(self.kind[y, x])
+        if kind == EMPTY:
+            return None
+        if self.stage[y, x] < VEGETATION_MATURE:
+            return SEEDLING
+
+        variants = self._glyphs[kind - 1][int(self.biomes[y, x]) - 1]
+        return variants[int(self.variant[y, x]) % len(variants)]
+
+    def glyphs(
+        self, rect: Optional[Tuple[int, int, int, int]] = None
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (x, y, representation) for every plant, within the (x0, y0, x1, y1)
+        rect if given.
+        """
+        if not self.enabled:
+            return
+
+        x0, y0, x1, y1 = rect or (0, 0, self.overworld.width, self.overworld.height)
+        x0, y0 = max(0, x0), max(0, y0)
+        ys, xs = np.nonzero(self.kind[y0:y1, x0:x1])
+        for x, y in zip((xs + x0).tolist(), (ys + y0).tolist()):
+            yield x, y, self.glyph(x, y)
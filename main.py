@@ -1,13 +1,28 @@
 import asyncio
 import curses
+import hashlib
 import logging
 import sys
-from dataclasses import dataclass
-from typing import List, Literal
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional, Tuple
 
 from ecosphere.common.event_bus import bus
+from ecosphere.common.rng import rng
+from ecosphere.common.trace import tracer
+from ecosphere.config import MEMORY_BUDGET, STRESS_TICKS
 from ecosphere.logging import set_logging_level
-from ecosphere.system import System, SystemInfo
+from ecosphere.render import AnsiRenderer, CursesRenderer, NullRenderer, Viewport
+from ecosphere.stream import FrameServer, SharedWorld
+from ecosphere.system import StressHarness, System, SystemInfo
+from ecosphere.system.stress import (
+    format_header,
+    format_row,
+    scaling_exponents,
+    write_csv,
+)
+from ecosphere.system.system import enable_mouse_motion
+from ecosphere.world.analytics import CsvExporter
+from ecosphere.world.clock import SimulationClock
 from ecosphere.world.overworld import Overworld
 
 
@@ -38,7 +53,7 @@ def setup_stdscr():
     curses.noecho()
     curses.cbreak()
     stdscr.keypad(True)
-    curses.mousemask(1)
+    enable_mouse_motion()
     curses.curs_set(0)
 
     _init_colors()
@@ -50,13 +65,55 @@ def setup_stdscr():
 class SystemArgs:
     loglevel: Literal["debug", "info", "warning", "error", "critical"] = "info"
     sysinfo: bool = False
+    trace: bool = False
+    trace_species: List[str] = field(default_factory=list)
+    trace_every: int = 1
+    renderer: Literal["curses", "ansi"] = "curses"
+    serve: Optional[str] = None
+    share: Optional[str] = None
+    world: Optional[Tuple[int, int]] = None
+    lod: bool = False
+    lod_rect: Optional[Tuple[int, int, int, int]] = None
+    stats: Optional[str] = None
+    seed: Optional[int] = None
+    headless: bool = False
+    minutes: int = 1440
+    vegetation: bool = False
+    scent: bool = False
+    memory_budget: int = MEMORY_BUDGET
+    stress: bool = False
+    stress_csv: Optional[str] = None
+    stress_sizes: List[Tuple[int, int]] = field(default_factory=list)
+    stress_densities: List[float] = field(default_factory=list)
+    stress_ticks: int = STRESS_TICKS
 
 
 def _get_args(argv: List[str]) -> SystemArgs:
     sysinfo = False
     loglevel = "info"
+    trace = False
+    trace_species = []
+    trace_every = 1
+    renderer = "curses"
+    serve = None
+    share = None
+    world = None
+    lod = False
+    lod_rect = None
+    stats = None
+    seed = None
+    headless = False
+    minutes = 1440
+    vegetation = False
+    scent = False
+    memory_budget = MEMORY_BUDGET
+    stress = False
+    stress_csv = None
+    stress_sizes = []
+    stress_densities = []
+    stress_ticks = STRESS_TICKS
 
-    for arg in argv:
+    for i, arg in enumerate(argv):
         if arg == "--sysinfo" or arg == "-s":
             sysinfo = True
 
@@ -65,13 +122,104 @@ def _get_args(argv: List[str]) -> SystemArgs:
         if arg == "--debug" or arg == "-d":
             loglevel = "debug"
 
-    return SystemArgs(loglevel, sysinfo)
+        if arg == "--trace" or arg == "-t":
+            trace = True
+        if arg.startswith("--trace-species="):
+            trace = True
+            trace_species = arg.split("=", 1)[1].split(",")
+        if arg.startswith("--trace-every="):
+            trace = True
+            trace_every = int(arg.split("=", 1)[1])
+
+        if arg.startswith("--renderer="):
+            renderer = arg.split("=", 1)[1]
+
+        if arg.startswith("--serve="):
+            serve = arg.split("=", 1)[1]
+
+        if arg == "--share" or arg.startswith("--share="):
+            share = arg.split("=", 1)[1] if "=" in arg else "ecosphere"
+
+        if arg.startswith("--world=") or (arg == "--world" and i + 1 < len(argv)):
+            size = arg.split("=", 1)[1] if "=" in arg else argv[i + 1]
+            world_width, world_height = size.lower().split("x")
+            world = (int(world_width), int(world_height))
+
+        if arg == "--lod":
+            lod = True
+        if arg.startswith("--lod-rect="):
+            lod = True
+            x0, y0, x1, y1 = arg.split("=", 1)[1].split(",")
+            lod_rect = (int(x0), int(y0), int(x1), int(y1))
+
+        if arg == "--vegetation":
+            vegetation = True
+
+        if arg == "--scent":
+            scent = True
+
+        if arg.startswith("--memory-budget="):
+            memory_budget = int(arg.split("=", 1)[1]) << 20
+
+        if arg.startswith("--stats="):
+            stats = arg.split("=", 1)[1]
+
+        if arg.startswith("--seed="):
+            seed = int(arg.split("=", 1)[1])
+
+        if arg == "--headless":
+            headless = True
+        if arg.startswith("--minutes="):
+            minutes = int(arg.split("=", 1)[1])
+
+        if arg == "--stress" or arg.startswith("--stress="):
+            stress = True
+            stress_csv = arg.split("=", 1)[1] if "=" in arg else None
+        if arg.startswith("--stress-sizes="):
+            stress_sizes = [
+                tuple(int(n) for n in size.lower().split("x"))
+                for size in arg.split("=", 1)[1].split(",")
+            ]
+        if arg.startswith("--stress-densities="):
+            stress_densities = [float(d) for d in arg.split("=", 1)[1].split(",")]
+        if arg.startswith("--stress-ticks="):
+            stress_ticks = int(arg.split("=", 1)[1])
+
+    return SystemArgs(
+        loglevel,
+        sysinfo,
+        trace,
+        trace_species,
+        trace_every,
+        renderer,
+        serve,
+        share,
+        world,
+        lod,
+        lod_rect,
+        stats,
+        seed,
+        headless,
+        minutes,
+        vegetation,
+        scent,
+        memory_budget,
+        stress,
+        stress_csv,
+        stress_sizes,
+        stress_densities,
+        stress_ticks,
+    )
 
 
 def register_listeners(sysinfo: SystemInfo):
     bus.listener("minute:passed")(sysinfo.minute_passed)
     bus.listener("entity:dead")(sysinfo.entity_dead)
     bus.listener("entity:created")(sysinfo.entity_created)
+    bus.listener("entities:created")(sysinfo.entities_created)
+    bus.listener("food:created")(sysinfo.food_created)
+    bus.listener("analytics:updated")(sysinfo.analytics_updated)
+    bus.listener("memory:sampled")(sysinfo.memory_sampled)
 
 
 def main(stdscr) -> None:
@@ -82,24 +230,161 @@ def main(stdscr) -> None:
 
     args = _get_args(sys.argv)
 
+    rng.seed(args.seed)
+
+    if args.renderer == "ansi":
+        renderer = AnsiRenderer(height, width)
+    else:
+        renderer = CursesRenderer(win)
+
+    clock = SimulationClock()
+
     sysinfo = None
     if args.sysinfo:
-        sysinfo = SystemInfo(win)
+        sysinfo = SystemInfo(renderer, clock)
         register_listeners(sysinfo)
 
     set_logging_level(args.loglevel)
 
+    if args.trace:
+        tracer.enable(species=args.trace_species, every=args.trace_every)
+
+    if args.stats:
+        exporter = CsvExporter(args.stats)
+        bus.listener("analytics:updated")(exporter)
+        bus.listener("system:shutdown")(exporter.close)
+
     if sysinfo is not None:
         width = width
         height = height - 3
 
-    ov = Overworld(win, width, height)
-    system = System(ov, sysinfo)
+    world_width, world_height = args.world or (width, height)
+    viewport = Viewport(width, height, world_width, world_height)
+
+    ov = Overworld(
+        win,
+        world_width,
+        world_height,
+        renderer,
+        viewport,
+        lod=args.lod,
+        lod_focus=args.lod_rect,
+        clock=clock,
+        vegetation=args.vegetation,
+        scent=args.scent,
+        memory_budget=args.memory_budget,
+    )
+    stream = FrameServer(ov, args.serve) if args.serve else None
+    shared = SharedWorld(ov, args.share) if args.share else None
+    system = System(ov, sysinfo, stream, shared)
 
-    logging.info("Starting system")
+    logging.info("Starting system with seed %d", rng.value)
     return asyncio.run(system.run())
 
 
+def _digest(overworld: Overworld) -> str:
+    """
+    Hash the entities, their needs and the food layer, to compare runs.
+    """
+    state = hashlib.sha256()
+    for entity in overworld.entities:
+        needs = [getattr(entity, need, 0) for need in ("health", "hunger", "thirst")]
+        state.update(f"{entity.id},{entity.position},{needs}".encode())
+    state.update(overworld.food.kind.tobytes())
+    return state.hexdigest()[:16]
+
+
+def _check_lod(args: SystemArgs):
+    """
+    Without a terminal the whole world is in view, so the level of detail needs a
+    rect to simulate in full detail.
+    """
+    if args.lod and args.lod_rect is None:
+        sys.exit("--lod needs --lod-rect=X0,Y0,X1,Y1 without a terminal")
+
+
+def run_headless(args: SystemArgs) -> None:
+    """
+    Run the simulation without a terminal, as fast as possible, for the given
+    number of simulation minutes. Runs with the same seed and options end alike.
+    """
+    _check_lod(args)
+    rng.seed(args.seed)
+    set_logging_level(args.loglevel)
+
+    if args.trace:
+        tracer.enable(species=args.trace_species, every=args.trace_every)
+
+    if args.stats:
+        exporter = CsvExporter(args.stats)
+        bus.listener("analytics:updated")(exporter)
+
+    world_width, world_height = args.world or (200, 50)
+    ov = Overworld(
+        None,
+        world_width,
+        world_height,
+        NullRenderer(world_height, world_width),
+        lod=args.lod,
+        lod_focus=args.lod_rect,
+        clock=SimulationClock(speed=None),
+        vegetation=args.vegetation,
+        scent=args.scent,
+        memory_budget=args.memory_budget,
+    )
+    ov.spawn_entities()
+    asyncio.run(ov.update(minutes=args.minutes))
+
+    if args.stats:
+        exporter.close()
+    if args.trace:
+        count = tracer.flush()
+        logging.info("Flushed %d trace records to %s.", count, tracer.path)
+
+    report = ov.analytics.report
+    print(f"seed {rng.value}, {args.minutes} minutes, state {_digest(ov)}")
+    for s, species in enumerate(report.species):
+        print(f"{species}: {int(report.count[s, -1])} alive")
+
+
+def run_stress(args: SystemArgs) -> None:
+    """
+    Measure the simulation on synthetic worlds of increasing size and density,
+    print a table of the measurements and the scaling exponent of every phase,
+    and write them as CSV if a file is given.
+    """
+    _check_lod(args)
+    set_logging_level(args.loglevel)
+
+    harness = StressHarness(
+        args.stress_sizes,
+        args.stress_densities,
+        args.stress_ticks,
+        args.seed,
+        scent=args.scent,
+        vegetation=args.vegetation,
+        lod_rect=args.lod_rect,
+    )
+    print(format_header(), flush=True)
+    results = []
+    for result in harness.run():
+        results.append(result)
+        print(format_row(result), flush=True)
+
+    print("\nscaling exponents (time per tick ~ animals^k, memory ~ entities^k):")
+    for name, exponent in scaling_exponents(results).items():
+        print(f"  {name:<12} {exponent:6.2f}")
+
+    if args.stress_csv:
+        write_csv(args.stress_csv, results)
+
+
 if __name__ == "__main__":
-    stdscr = setup_stdscr()
-    main(stdscr)
+    args = _get_args(sys.argv)
+    if args.stress:
+        run_stress(args)
+    elif args.headless:
+        run_headless(args)
+    else:
+        stdscr = setup_stdscr()
+        main(stdscr)